@@ -16,19 +16,15 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
-from lib.system  import system
 from lib         import properties
+from lib         import ephemeris
 
 # Import required Kivy modules
-from kivy.logger import Logger
-from kivy.clock  import Clock
 from kivy.app    import App
 
 # Import required modules
 from datetime import datetime, timedelta, time
-import ephem
 import pytz
-import math
 
 
 class astro():
@@ -39,23 +35,10 @@ class astro():
         self.app = App.get_running_app()
         self.astro_data = properties.Astro()
 
-        # Define observer properties
-        self.observer          = ephem.Observer()
-        self.observer.lat      = str(self.app.config['Station']['Latitude'])
-        self.observer.lon      = str(self.app.config['Station']['Longitude'])
-
-        # Define body properties
-        self.sun  = ephem.Sun()
-        self.moon = ephem.Moon()
-
     def reset_astro(self):
 
         ''' Reset the Astro data when the station ID changes
         '''
-        # Cancel sun_transit and moon_phase schedules
-        self.app.Sched.sun_transit.cancel()
-        self.app.Sched.moon_phase.cancel()
-
         # Reset the astro data and generate new sunrise/sunset and
         # moonrise/moonset times
         self.astro_data = properties.Astro()
@@ -63,11 +46,10 @@ class astro():
         self.sunrise_sunset()
         self.moonrise_moonset()
 
-        # Force update sun_transit to correct sunrise/sunset times and then
-        # reschedule sun_transit and moon_phase
-        self.sun_transit()
-        self.app.Sched.sun_transit = Clock.schedule_interval(self.sun_transit, 1)
-        self.app.Sched.moon_phase  = Clock.schedule_interval(self.moon_phase,  1)
+        # Force update sun_transit to correct sunrise/sunset times and
+        # moon_phase to correct moon phase
+        self.app.scheduler.run('sun_transit')
+        self.app.scheduler.run('moon_phase')
 
     def sunrise_sunset(self):
 
@@ -82,55 +64,23 @@ class astro():
             self.astro_data           Dictionary holding sunrise and sunset data
         """
 
-        # Get station timezone
-        Tz = pytz.timezone(self.app.config['Station']['Timezone'])
-
-        # Set pressure to 0 to match the United States Naval Observatory Astronomical
-        # Almanac
-        self.observer.pressure = 0
-
-        # The code is initialising. Calculate sunset/sunrise times for current day
-        # starting at midnight today in UTC
+        # The code is initialising. Get sunset/sunrise times for current day in
+        # station timezone
         if self.astro_data['Sunset'][0] == '-':
+            date = ephemeris.station_date(self.app.config)
 
-            # Set Observer time to midnight today in UTC
-            UTC = datetime.now(pytz.utc)
-            Midnight = datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0)
-            self.observer.date = Midnight.strftime('%Y/%m/%d %H:%M:%S')
-
-        # Dusk has passed. Calculate sunset/sunrise times for tomorrow starting at
-        # time of last Dusk in UTC
+        # Dusk has passed. Get sunset/sunrise times for the day after the
+        # current sunrise
         else:
+            date = self.astro_data['Sunrise'][0].date() + timedelta(days=1)
 
-            # Set Observer time to last Sunset time in UTC
-            Dusk = self.astro_data['Dusk'][0].astimezone(pytz.utc) + timedelta(minutes=1)
-            self.observer.date = Dusk.strftime('%Y/%m/%d %H:%M:%S')
-
-        # Calculate Dawn time in UTC
-        self.observer.horizon = '-6'
-        Dawn = self.observer.next_rising(self.sun, use_center=True)
-        Dawn = pytz.utc.localize(Dawn.datetime().replace(second=0, microsecond=0))
-
-        # Calculate Sunrise time in UTC
-        self.observer.horizon = '-0:34'
-        Sunrise = self.observer.next_rising(self.sun)
-        Sunrise = pytz.utc.localize(Sunrise.datetime().replace(second=0, microsecond=0))
-
-        # Calculate Sunset time in UTC
-        self.observer.horizon = '-0:34'
-        Sunset = self.observer.next_setting(self.sun)
-        Sunset = pytz.utc.localize(Sunset.datetime().replace(second=0, microsecond=0))
-
-        # Calculate Dusk time in UTC
-        self.observer.horizon = '-6'
-        Dusk = self.observer.next_setting(self.sun, use_center=True)
-        Dusk = pytz.utc.localize(Dusk.datetime().replace(second=0, microsecond=0))
-
-        # Define Dawn/Dusk and Sunrise/Sunset times in Station timezone
-        self.astro_data['Dawn'][0]    = Dawn.astimezone(Tz)
-        self.astro_data['Sunrise'][0] = Sunrise.astimezone(Tz)
-        self.astro_data['Sunset'][0]  = Sunset.astimezone(Tz)
-        self.astro_data['Dusk'][0]    = Dusk.astimezone(Tz)
+        # Get Dawn/Dusk and Sunrise/Sunset times in Station timezone from the
+        # shared solar ephemeris cache
+        sun_events = ephemeris.sun_events(self.app.config, date)
+        self.astro_data['Dawn'][0]    = sun_events['Dawn']
+        self.astro_data['Sunrise'][0] = sun_events['Sunrise']
+        self.astro_data['Sunset'][0]  = sun_events['Sunset']
+        self.astro_data['Dusk'][0]    = sun_events['Dusk']
 
         # Calculate length and position of the dawn/dusk and sunrise/sunset
         # lines on the day/night bar
@@ -159,56 +109,31 @@ class astro():
             self.astro_data           Dictionary holding moonrise and moonset data
         """
 
-        # Define Moonrise/Moonset location properties
-        Tz = pytz.timezone(self.app.config['Station']['Timezone'])
-
-        # Define Moonrise/Moonset location properties
-        self.observer.horizon = '0'
-        self.observer.pressure = 1010
+        # Define station timezone and midnight today in UTC
+        Tz       = pytz.timezone(self.app.config['Station']['Timezone'])
+        UTC      = datetime.now(pytz.utc)
+        Midnight = pytz.utc.localize(datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0))
 
         # The code is initialising. Calculate moonrise time for current day
         # starting at midnight today in UTC
         if self.astro_data['Moonrise'][0] == '-':
-
-            # Set Observer time to midnight today in UTC
-            UTC = datetime.now(pytz.utc)
-            Midnight = datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0)
-            self.observer.date = Midnight.strftime('%Y/%m/%d %H:%M:%S')
+            start = Midnight
 
         # Moonset has passed. Calculate time of next moonrise starting at
         # time of last Moonset in UTC
         else:
+            start = self.astro_data['Moonset'][0].astimezone(pytz.utc) + timedelta(minutes=1)
 
-            # Set Observer time to last Moonset time in UTC
-            Moonset = self.astro_data['Moonset'][0].astimezone(pytz.utc) + timedelta(minutes=1)
-            self.observer.date = Moonset.strftime('%Y/%m/%d %H:%M:%S')
-
-        # Calculate Moonrise time in UTC
-        Moonrise = self.observer.next_rising(self.moon)
-        Moonrise = pytz.utc.localize(Moonrise.datetime().replace(second=0, microsecond=0))
-
-        # Define Moonrise time in Station timezone
-        self.astro_data['Moonrise'][0] = Moonrise.astimezone(Tz)
-
-        # Convert Moonrise time in Station timezone to Moonrise time in UTC
-        Moonrise = self.astro_data['Moonrise'][0].astimezone(pytz.utc)
-        self.observer.date = Moonrise.strftime('%Y/%m/%d %H:%M:%S')
+            # Resample moon phase curve for the current station day
+            ephemeris.moon_phase_curve(self.app.config, refresh=True)
 
-        # Calculate time of next Moonset starting at time of last Moonrise in UTC
-        Moonset = self.observer.next_setting(self.moon)
-        Moonset = pytz.utc.localize(Moonset.datetime().replace(second=0, microsecond=0))
-
-        # Define Moonset time in Station timezone
-        self.astro_data['Moonset'][0] = Moonset.astimezone(Tz)
-
-        # Calculate date of next full moon in UTC
-        self.observer.date = datetime.now(pytz.utc).strftime('%Y/%m/%d')
-        FullMoon = ephem.next_full_moon(self.observer.date)
-        FullMoon = pytz.utc.localize(FullMoon.datetime())
-
-        # Calculate date of next new moon in UTC
-        NewMoon = ephem.next_new_moon(self.observer.date)
-        NewMoon = pytz.utc.localize(NewMoon.datetime())
+        # Get Moonrise and Moonset times in Station timezone and dates of next
+        # full moon and new moon in UTC from the yearly ephemeris table
+        moon_events = ephemeris.moon_events(self.app.config, start, Midnight)
+        self.astro_data['Moonrise'][0] = moon_events['Moonrise']
+        self.astro_data['Moonset'][0]  = moon_events['Moonset']
+        FullMoon = moon_events['FullMoon']
+        NewMoon  = moon_events['NewMoon']
 
         # Define next new/full moon in station time zone
         self.astro_data['FullMoon'] = [FullMoon.astimezone(Tz).strftime('%b %d'), FullMoon]
@@ -285,7 +210,12 @@ class astro():
             # Define Kivy Label binds
             self.astro_data['sunEvent'] = ['[color=00A4B4FF]Nightfall[/color]', '{:02.0f}'.format(hours), '{:02.0f}'.format(minutes), 'Dusk']
             self.astro_data['sunIcon']  = ['-', 1, sunPosition]
-            self.update_display()
+
+        # Update sun and moon position
+        self.sun_moon_position(Now)
+
+        # Update display with new sun transit
+        self.update_display()
 
         # Once dusk has passed calculate new sunrise/sunset times
         if Now.replace(microsecond=0) >= self.astro_data['Dusk'][0]:
@@ -300,6 +230,41 @@ class astro():
             self.format_labels('sun')
             self.format_labels('moon')
 
+    def sun_moon_position(self, Now):
+
+        """ Calculate the current sun and moon elevation and azimuth, and the
+        direction of shadows cast by the sun. Values are rounded to the
+        precision they are displayed at so that unchanged values are not pushed
+        to the display every second
+
+        INPUTS:
+            Now                 Current time in station timezone
+
+        OUTPUT:
+            self.astro_data           Dictionary holding sun and moon position
+        """
+
+        # Interpolate sun and moon position from the shared position curve for
+        # the station day
+        position = ephemeris.position_at(self.app.config, Now.timestamp())
+
+        # Define cardinal directions
+        direction = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW', 'N']
+
+        # Define Kivy labels for sun and moon elevation and azimuth
+        for body in ['sun', 'moon']:
+            alt = round(position[body + '_alt'], 1)
+            az  = round(position[body + '_az']) % 360
+            self.astro_data[body + 'Position'] = ['{:.1f}°'.format(alt), '{:.0f}° {}'.format(az, direction[int(round(az / 22.5))]), alt, az]
+
+        # Define Kivy labels for shadow direction. Shadows are only cast while
+        # the sun is above the horizon
+        if position['sun_alt'] > 0:
+            shadow = round(position['sun_az'] + 180) % 360
+            self.astro_data['sunShadow'] = [direction[int(round(shadow / 22.5))], shadow]
+        else:
+            self.astro_data['sunShadow'] = ['-', 0]
+
     def moon_phase(self, *largs):
 
         """ Calculate the moon phase for the current time in station timezone
@@ -322,15 +287,16 @@ class astro():
         # Get date of next new moon in station time zone
         new_moon = self.astro_data['NewMoon'][1].astimezone(Tz)
 
-        # Calculate phase of moon
-        self.moon.compute(UTC.strftime('%Y/%m/%d %H:%M:%S'))
+        # Interpolate phase of moon and angle of illuminated moon face from the
+        # shared moon phase curve for the station day
+        phase, angle = ephemeris.moon_phase_at(self.app.config, UTC.timestamp())
 
         # Define Moon phase icon and tilt_sign
         if full_moon < new_moon:
-            phase_icon = 'Waxing_' + '{:.0f}'.format(self.moon.phase)
+            phase_icon = 'Waxing_' + '{:.0f}'.format(phase)
             tilt_sign  = +1
         elif new_moon < full_moon:
-            phase_icon = 'Waning_' + '{:.0f}'.format(self.moon.phase)
+            phase_icon = 'Waning_' + '{:.0f}'.format(phase)
             tilt_sign  = -1
 
         # Define Moon phase text
@@ -338,30 +304,24 @@ class astro():
             phase_text = 'New Moon'
         elif self.astro_data['FullMoon'] == '[color=ff8837ff]Today[/color]':
             phase_text = 'Full Moon'
-        elif full_moon < new_moon and self.moon.phase < 49:
+        elif full_moon < new_moon and phase < 49:
             phase_text = 'Waxing crescent'
-        elif full_moon < new_moon and 49 <= self.moon.phase <= 51:
+        elif full_moon < new_moon and 49 <= phase <= 51:
             phase_text = 'First Quarter'
-        elif full_moon < new_moon and self.moon.phase > 51:
+        elif full_moon < new_moon and phase > 51:
             phase_text = 'Waxing gibbous'
-        elif new_moon < full_moon and self.moon.phase > 51:
+        elif new_moon < full_moon and phase > 51:
             phase_text = 'Waning gibbous'
-        elif new_moon < full_moon and 49 <= self.moon.phase <= 51:
+        elif new_moon < full_moon and 49 <= phase <= 51:
             phase_text = 'Last Quarter'
-        elif new_moon < full_moon and self.moon.phase < 49:
+        elif new_moon < full_moon and phase < 49:
             phase_text = 'Waning crescent'
 
         # Define Moon phase illumination
-        illumination = '{:.0f}'.format(self.moon.phase)
+        illumination = '{:.0f}'.format(phase)
 
         # Calculate tilt of illuminated moon face
-        self.observer.date = UTC.strftime('%Y/%m/%d %H:%M:%S')
-        self.moon.compute(self.observer)
-        self.sun.compute(self.observer)
-        dLon = self.sun.az - self.moon.az
-        y = math.sin(dLon) * math.cos(self.sun.alt)
-        x = math.cos(self.moon.alt) * math.sin(self.sun.alt) - math.sin(self.moon.alt) * math.cos(self.sun.alt) * math.cos(dLon)
-        tilt = tilt_sign * 90 - math.degrees(math.atan2(y, x))
+        tilt = tilt_sign * 90 - angle
 
         # Define Kivy labels
         self.astro_data['Phase'] = [phase_icon, phase_text, illumination, tilt]
@@ -438,16 +398,8 @@ class astro():
 
     def update_display(self):
 
-        """ Update display with new astro variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Update display with new astro variables
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.astro_data.items()):
-            try:
-                self.app.CurrentConditions.Astro[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'astro: {system().log_time()} - Reference error')
-                    reference_error = True
+        # Push changed display values to update bus
+        self.app.update_bus.push('astro', 'Astro', self.astro_data, changed_only=True)
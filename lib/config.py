@@ -15,6 +15,9 @@ You should have received a copy of the GNU General Public License along with
 this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
+# Import required library modules
+from lib.request_api import http_cache
+
 # Import required modules
 from kivy.logger    import Logger
 from packaging      import version
@@ -22,6 +25,7 @@ from tzlocal        import get_localzone
 import configparser
 import collections
 import subprocess
+import functools
 import requests
 import platform
 import sys
@@ -40,6 +44,7 @@ CONNECTION    = None
 UNITS         = None
 idx           = None
 MAXRETRIES    = 3
+TIMEOUT       = 20
 
 # Determine current system
 if os.path.exists('/proc/device-tree/model'):
@@ -208,11 +213,13 @@ def update():
 
     """ Updates an existing user configuration file by comparing it against the
         default configuration dictionary. Saves the updated user configuration
-        file to wfpiconsole.ini
+        file to wfpiconsole.ini. Station details in an existing configuration
+        are verified by the console in the background once it has started
     """
 
-    # Fetch latest version number
-    latest_version = default_config_file()['System']['Version']['value']
+    # Load default configuration dictionary and fetch latest version number
+    default_config = default_config_file()
+    latest_version = default_config['System']['Version']['value']
 
     # Load current user configuration file
     current_config = configparser.ConfigParser(allow_no_value=True)
@@ -240,23 +247,23 @@ def update():
 
         # Loop through all sections in default configuration dictionary. Take
         # existing key values from current configuration file
-        for section in default_config_file():
+        for section in default_config:
             changes = False
             new_config.add_section(section)
-            for key in default_config_file()[section]:
+            for key in default_config[section]:
                 if key == 'description':
-                    print(default_config_file()[section][key]  , flush=True)
+                    print(default_config[section][key]  , flush=True)
                     print('  ---------------------------------', flush=True)
                 else:
                     if current_config.has_option(section, key):
                         if update_required(key, current_version):
                             changes = True
-                            write_config_key(new_config, section, key, default_config_file()[section][key])
+                            write_config_key(new_config, section, key, default_config[section][key])
                         else:
-                            copy_config_key(new_config, current_config, section, key, default_config_file()[section][key])
+                            copy_config_key(new_config, current_config, section, key, default_config[section][key])
                     if not current_config.has_option(section, key):
                         changes = True
-                        write_config_key(new_config, section, key, default_config_file()[section][key])
+                        write_config_key(new_config, section, key, default_config[section][key])
                     elif key == 'Version':
                         changes = True
                         new_config.set(section, key, latest_version)
@@ -272,14 +279,54 @@ def update():
         with open('wfpiconsole.ini', 'w') as config_file:
             new_config.write(config_file)
 
-    #  VERSION UNCHANGED. VERIFY STATION AND DEVICE DETAILS FOR EXISTING
-    # CONFIGURATION
-    # --------------------------------------------------------------------------
-    elif version.parse(current_version) == version.parse(latest_version):
-        if current_config['System']['rest_api'] and int(current_config['System']['rest_api']):
-            current_config = verify_station(current_config)
-        with open('wfpiconsole.ini', 'w') as config_file:
-            current_config.write(config_file)
+
+def fetch_station(config):
+
+    """ Fetches the latest station metadata from the WeatherFlow REST API.
+        Conditional requests are used so that unchanged metadata is taken from
+        the HTTP validator cache
+
+    INPUTS
+        config              Station configuration
+
+    OUTPUT
+        station             Station metadata, or None if unavailable
+    """
+
+    Template = 'https://swd.weatherflow.com/swd/rest/observations/station/{}?token={}'
+    URL = Template.format(config['Station']['StationID'], config['Keys']['WeatherFlow'])
+    Timeout = int(config['System'].get('Timeout', TIMEOUT))
+    for _ in range(MAXRETRIES):
+        try:
+            station = http_cache.get(URL, timeout=Timeout).json()
+        except Exception:
+            station = None
+        if station is not None and 'status' in station:
+            if 'SUCCESS' in station['status']['status_message']:
+                return station
+    return None
+
+
+def station_changes(config, station):
+
+    """ Compares station details in the configuration against the latest
+        station metadata
+
+    INPUTS
+        config              Station configuration
+        station             Station metadata
+
+    OUTPUT
+        changes             Dictionary of station keys and updated values
+    """
+
+    config_key = ['Latitude', 'Longitude', 'Elevation', 'Timezone', 'Name']
+    api_key    = ['latitude', 'longitude', 'elevation', 'timezone', 'station_name']
+    changes = {}
+    for idx, key in enumerate(config_key):
+        if config['Station'][key] != str(station[api_key[idx]]):
+            changes[key] = str(station[api_key[idx]])
+    return changes
 
 
 def verify_station(config):
@@ -290,34 +337,17 @@ def verify_station(config):
 
     # Fetch latest station metadata
     Logger.info('Config: Verifying station details')
-    RETRIES = 0
-    while True:
-        Template = 'https://swd.weatherflow.com/swd/rest/observations/station/{}?token={}'
-        URL = Template.format(config['Station']['StationID'], config['Keys']['WeatherFlow'])
-        try:
-            STATION = requests.get(URL).json()
-        except Exception:
-            STATION = None
-        if STATION is not None and 'status' in STATION:
-            if 'SUCCESS' in STATION['status']['status_message']:
-                break
-            else:
-                RETRIES += 1
-        else:
-            RETRIES += 1
-        if RETRIES >= MAXRETRIES:
-            Logger.error('Config: Unable to fetch station metadata')
-            if config['System']['Connection'] == 'UDP':
-                Logger.warning('Config: Disable REST API services when using UDP without an internet connection')
-            sys.exit()
+    STATION = fetch_station(config)
+    if STATION is None:
+        Logger.error('Config: Unable to fetch station metadata')
+        if config['System']['Connection'] == 'UDP':
+            Logger.warning('Config: Disable REST API services when using UDP without an internet connection')
+        sys.exit()
 
     # Verify station details
-    config_key = ['Latitude', 'Longitude', 'Elevation', 'Timezone', 'Name']
-    api_key    = ['latitude', 'longitude', 'elevation', 'timezone', 'station_name']
-    for idx, key in enumerate(config_key):
-        if config['Station'][key] != str(STATION[api_key[idx]]):
-            config.set('Station', key, str(STATION[api_key[idx]]))
-            Logger.info('Config: Updating station ' + key.lower())
+    for key, value in station_changes(config, STATION).items():
+        config.set('Station', key, value)
+        Logger.info('Config: Updating station ' + key.lower())
 
     # Return verified configuration
     return config
@@ -555,7 +585,7 @@ def write_config_key(config, section, key, details):
             while True:
                 Template = 'https://swd.weatherflow.com/swd/rest/observations/station/{}?token={}'
                 URL = Template.format(config['Station']['StationID'], config['Keys']['WeatherFlow'])
-                OBSERVATION = requests.get(URL).json()
+                OBSERVATION = requests.get(URL, timeout=TIMEOUT).json()
                 if 'status' in STATION:
                     if 'SUCCESS' in STATION['status']['status_message']:
                         break
@@ -729,7 +759,7 @@ def validate_API_keys(config):
             while True:
                 header = {'X-API-Key': config['Keys']['CheckWX']}
                 URL = 'https://api.checkwx.com/station/EGLL'
-                CHECKWX = requests.get(URL, headers=header).json()
+                CHECKWX = requests.get(URL, headers=header, timeout=TIMEOUT).json()
                 if 'error' in CHECKWX:
                     if 'Unauthorized' in CHECKWX['error']:
                         input_string = '    Access not authorized. Please re-enter your CheckWX API key*: '
@@ -757,7 +787,7 @@ def validate_API_keys(config):
             while True:
                 url_template = 'https://swd.weatherflow.com/swd/rest/stations/?token={}'
                 URL = url_template.format(config['Keys']['WeatherFlow'])
-                STATION = requests.get(URL).json()
+                STATION = http_cache.get(URL, timeout=TIMEOUT).json()
                 if 'status' in STATION:
                     if 'UNAUTHORIZED' in STATION['status']['status_message']:
                         input_string = '    Access not authorized. Please re-enter your WeatherFlow Personal Access Token*: '
@@ -836,10 +866,12 @@ def query_user(question, default=None):
             sys.stdout.write('    Please respond with "yes"/"no" or "y"/"n"\n')
 
 
+@functools.lru_cache(maxsize=None)
 def default_config_file():
 
     """ Generates the default configuration required by the Raspberry Pi Python
-        console for Weather Flow Smart Home Weather Stations.
+        console for Weather Flow Smart Home Weather Stations. The default
+        configuration is built once and shared, so must not be modified
 
     OUTPUT:
         Default         Default configuration required by PiConsole
@@ -887,6 +919,7 @@ def default_config_file():
                                                          ('LightningPanel',        {'type': 'default',   'value': '1',                'desc': 'lightning panel toggle'}),
                                                          ('lightning_timeout',     {'type': 'default',   'value': '0',                'desc': 'lightning panel timeout'}),
                                                          ('IndoorTemp',            {'type': 'dependent',                              'desc': 'indoor temperature toggle'}),
+                                                         ('RollingWind',           {'type': 'default',   'value': '1',                'desc': 'rolling mean wind speed toggle'}),
                                                          ('Cursor',                {'type': 'default',   'value': '1',                'desc': 'cursor toggle'}),
                                                          ('Border',                {'type': 'default',   'value': '1',                'desc': 'border toggle'}),
                                                          ('Fullscreen',            {'type': 'default',   'value': '1',                'desc': 'fullscreen toggle'}),
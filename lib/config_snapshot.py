@@ -0,0 +1,139 @@
+""" Defines the immutable configuration snapshot required by the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+from collections.abc import Mapping
+from types           import MappingProxyType
+from kivy.logger     import Logger
+import pytz
+
+
+def to_float(value):
+
+    """ Convert a configuration value to a float
+
+    INPUTS:
+        value               Configuration value
+
+    OUTPUT:
+        value               Configuration value as float, or None if the value
+                            is missing or invalid
+    """
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_bool(value):
+
+    """ Convert a '0'/'1' configuration value to a boolean
+
+    INPUTS:
+        value               Configuration value
+
+    OUTPUT:
+        value               Configuration value as boolean
+    """
+
+    try:
+        return bool(int(value))
+    except (TypeError, ValueError):
+        return False
+
+
+# ==============================================================================
+# config_snapshot CLASS
+# ==============================================================================
+class config_snapshot(Mapping):
+
+    """ Read-only snapshot of the console configuration. Values used on every
+    observation are converted once into typed attributes, and each section
+    remains available as a read-only mapping so that the snapshot can be used
+    wherever the configuration object is read. A new snapshot is created when
+    the configuration changes, so a message that reads a single snapshot sees
+    consistent settings throughout
+    """
+
+    def __init__(self, config):
+
+        """ Compile the configuration snapshot
+
+        INPUTS:
+            config              Console configuration object
+        """
+
+        # Copy each configuration section into a read-only mapping
+        self.sections = MappingProxyType({section: MappingProxyType(dict(config[section]))
+                                          for section in config.sections()})
+        station = self.sections.get('Station', {})
+        system  = self.sections.get('System',  {})
+        display = self.sections.get('Display', {})
+
+        # Define system settings
+        self.connection     = system.get('Connection', '')
+        self.hardware       = system.get('Hardware', '')
+        self.rest_api       = to_bool(system.get('rest_api'))
+        self.stats_endpoint = to_bool(system.get('stats_endpoint'))
+        self.timeout        = int(to_float(system.get('Timeout')) or 20)
+
+        # Define station settings
+        self.station_id     = station.get('StationID', '')
+        self.latitude       = to_float(station.get('Latitude'))
+        self.longitude      = to_float(station.get('Longitude'))
+        self.elevation      = to_float(station.get('Elevation'))
+        self.tempest_height = to_float(station.get('TempestHeight'))
+        self.out_air_height = to_float(station.get('OutAirHeight'))
+        try:
+            self.timezone   = pytz.timezone(station.get('Timezone', ''))
+        except pytz.UnknownTimeZoneError:
+            Logger.error(f'Config: Unknown timezone "{station.get("Timezone", "")}", using UTC')
+            self.timezone   = pytz.utc
+
+        # Define device IDs and serial numbers, and the set of identifiers
+        # each device type can be referenced by
+        self.tempest_id      = station.get('TempestID', '')
+        self.sky_id          = station.get('SkyID',     '')
+        self.out_air_id      = station.get('OutAirID',  '')
+        self.in_air_id       = station.get('InAirID',   '')
+        self.tempest_devices = frozenset([self.tempest_id, station.get('TempestSN', '')])
+        self.sky_devices     = frozenset([self.sky_id,     station.get('SkySN',     '')])
+        self.out_air_devices = frozenset([self.out_air_id, station.get('OutAirSN',  '')])
+        self.in_air_devices  = frozenset([self.in_air_id,  station.get('InAirSN',   '')])
+
+        # Define display settings, observation units and "Feels Like"
+        # temperature cutoffs
+        self.time_format  = display.get('TimeFormat', '')
+        self.rolling_wind = to_bool(display.get('RollingWind', '1'))
+        self.units       = self.sections.get('Units', MappingProxyType({}))
+        self.feels_like  = tuple(to_float(value) for value in self.sections.get('FeelsLike', {}).values())
+        self.frozen      = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, 'frozen', False):
+            raise AttributeError('config_snapshot is read-only')
+        super().__setattr__(name, value)
+
+    def __getitem__(self, section):
+        return self.sections[section]
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
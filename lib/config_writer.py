@@ -0,0 +1,136 @@
+""" Defines the debounced configuration writer required by the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.system  import system
+from lib         import persistence
+
+# Import required Kivy modules
+from kivy.logger import Logger
+from kivy.clock  import Clock
+
+# Import required Python modules
+import configparser
+import threading
+import io
+
+# Define time over which configuration changes are batched into a single
+# write [s]
+CONFIG_WRITE_DELAY = 2
+
+
+# ==============================================================================
+# config_writer CLASS
+# ==============================================================================
+class config_writer():
+
+    """ Batches writes of the console configuration file. Write requests made
+    within CONFIG_WRITE_DELAY seconds of each other are combined, the
+    configuration is serialised on the main thread, and the file is replaced
+    atomically in a background thread so that the display is never blocked by
+    the SD card. Snapshots are numbered so that an older snapshot is never
+    written over a newer one
+    """
+
+    def __init__(self, config, path, delay=CONFIG_WRITE_DELAY):
+        self.config     = config
+        self.path       = path
+        self.trigger    = Clock.create_trigger(self.flush, delay)
+        self.save_lock  = threading.Lock()
+        self.save_count = {'queued': 0, 'written': 0}
+        self.stats      = {'requests': 0, 'writes': 0}
+        self.last_text  = self.serialise()
+
+    def write(self, *largs):
+
+        """ Request that the configuration is written to disk. Replaces the
+        write() method of the configuration object, so returns True in the
+        same way
+        """
+
+        self.stats['requests'] += 1
+        self.trigger()
+        return True
+
+    def serialise(self):
+
+        """ Serialise the current configuration
+
+        OUTPUT:
+            text                Configuration file text
+        """
+
+        buffer = io.StringIO()
+        configparser.RawConfigParser.write(self.config, buffer)
+        return buffer.getvalue()
+
+    def queue(self):
+
+        """ Serialise the configuration and number the snapshot if it has
+        changed since it was last queued
+
+        OUTPUT:
+            text                Configuration file text, or None if unchanged
+            number              Sequence number of snapshot
+        """
+
+        self.trigger.cancel()
+        text = self.serialise()
+        if text == self.last_text:
+            return None, self.save_count['queued']
+        self.last_text = text
+        self.save_count['queued'] += 1
+        return text, self.save_count['queued']
+
+    def flush(self, *largs):
+
+        """ Write the configuration to disk in a background thread if it has
+        changed since it was last written
+        """
+
+        text, number = self.queue()
+        if text is not None:
+            threading.Thread(target=self.save, args=[text, number], daemon=True, name='config_writer').start()
+
+    def flush_now(self):
+
+        """ Write any pending configuration changes to disk before returning.
+        Used when the console is stopping
+        """
+
+        text, number = self.queue()
+        if text is not None or self.save_count['written'] < number:
+            self.save(self.last_text, number)
+
+    def save(self, text, number):
+
+        """ Atomically replace the configuration file
+
+        INPUTS:
+            text                Configuration file text
+            number              Sequence number of snapshot
+        """
+
+        with self.save_lock:
+            if number <= self.save_count['written']:
+                return
+            try:
+                persistence.write_atomic(self.path, text)
+                self.save_count['written'] = number
+                self.stats['writes'] += 1
+            except Exception as error:
+                Logger.warning(f'Config: {system().log_time()} - Unable to write {self.path}: {error}')
@@ -0,0 +1,134 @@
+""" Defines the dependency graph used to incrementally recompute the derived
+variables required by the Raspberry Pi Python console for WeatherFlow Tempest
+and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+# =============================================================================
+# DEFINE 'derivation_graph' CLASS
+# =============================================================================
+class derivation_graph():
+
+    """ Dependency graph of derived variables. Each node declares the inputs it
+    is calculated from and the device types that trigger it. Calling update()
+    recomputes only those nodes whose inputs have changed since they were last
+    evaluated, and returns the set of outputs whose value changed
+    """
+
+    def __init__(self, resolve):
+
+        """ Initialise the dependency graph
+
+        INPUTS:
+            resolve             Function returning the current value of a named
+                                input for a given device and device type
+        """
+
+        self.resolve  = resolve
+        self.nodes    = {}
+        self.order    = []
+        self.snapshot = {}
+        self.stats    = {'evaluated': 0, 'skipped': 0}
+
+    def add_node(self, output, device_types, inputs, function):
+
+        """ Add a derived variable node to the dependency graph
+
+        INPUTS:
+            output              Name of derived variable calculated by node
+            device_types        Device types that trigger node evaluation
+            inputs              Names of inputs node is calculated from. May
+                                include the outputs of other nodes
+            function            Function of (device, config) that returns the
+                                derived variable
+        """
+
+        self.nodes[output] = {'device_types': tuple(device_types),
+                              'inputs':       tuple(inputs),
+                              'function':     function}
+        self.order = self.sort_nodes()
+
+    def sort_nodes(self):
+
+        """ Topologically sort nodes so that every node is evaluated after all
+        nodes it depends on
+
+        OUTPUT:
+            order               List of node outputs in evaluation order
+        """
+
+        order   = []
+        visited = {}
+
+        def visit(output):
+            if visited.get(output) == 'done':
+                return
+            if visited.get(output) == 'active':
+                raise ValueError(f'derivation_graph: cyclic dependency at {output}')
+            visited[output] = 'active'
+            for name in self.nodes[output]['inputs']:
+                if name in self.nodes:
+                    visit(name)
+            visited[output] = 'done'
+            order.append(output)
+
+        for output in self.nodes:
+            visit(output)
+        return order
+
+    def update(self, device, config, device_type, store):
+
+        """ Recompute the dirty subgraph for the specified device type
+
+        INPUTS:
+            device              Device ID
+            config              Console configuration object
+            device_type         Device type that triggered the update
+            store               Dictionary holding the derived variables
+
+        OUTPUT:
+            changed             Set of derived variables whose value changed
+        """
+
+        changed = set()
+        for output in self.order:
+            node = self.nodes[output]
+            if device_type not in node['device_types']:
+                continue
+
+            # Skip node if none of its inputs have changed since the node was
+            # last evaluated
+            values = tuple(store[name] if name in self.nodes else self.resolve(name, device, device_type)
+                           for name in node['inputs'])
+            if output in self.snapshot and self.snapshot[output] == values:
+                self.stats['skipped'] += 1
+                continue
+
+            # Evaluate node and record whether its output has changed
+            value = node['function'](device, config)
+            if store[output] != value:
+                changed.add(output)
+            store[output] = value
+            self.snapshot[output] = values
+            self.stats['evaluated'] += 1
+        return changed
+
+    def reset(self):
+
+        """ Mark all nodes as dirty
+        """
+
+        self.snapshot = {}
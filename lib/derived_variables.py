@@ -19,12 +19,12 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 from lib.request_api import weatherflow_api
 from lib.system      import system
 from lib             import derived_variables as derive
+from lib             import ephemeris
 
 # Import required Python modules
 from kivy.logger  import Logger
 from datetime     import datetime, timedelta
 import bisect
-import ephem
 import math
 import pytz
 import time
@@ -124,7 +124,7 @@ def feels_like(out_temp, humidity, wind_spd, config):
         feels_like = out_temp
 
     # Define 'FeelsLike' temperature cutoffs
-    cutoffs = [float(item) for item in list(config['FeelsLike'].values())]
+    cutoffs = config.feels_like
 
     # Define 'FeelsLike temperature text and icon
     description = ['Feeling extremely cold', 'Feeling freezing cold', 'Feeling very cold',
@@ -132,7 +132,7 @@ def feels_like(out_temp, humidity, wind_spd, config):
                    'Feeling very hot', 'Feeling extremely hot', '-']
     icon =        ['ExtremelyCold', 'FreezingCold', 'VeryCold', 'Cold', 'Mild', 'Warm',
                    'Hot', 'VeryHot', 'ExtremelyHot', '-']
-    if config['Units']['Temp'] == 'f':
+    if config.units['Temp'] == 'f':
         idx = bisect.bisect(cutoffs, feels_like[0] * (9 / 5) + 32)
     else:
         idx = bisect.bisect(cutoffs, feels_like[0])
@@ -161,11 +161,11 @@ def SLP(pressure, device, config):
         return error_output
 
     # Extract required configuration variables
-    elevation = config['Station']['Elevation']
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
-        height = config['Station']['OutAirHeight']
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
-        height = config['Station']['TempestHeight']
+    elevation = config.elevation
+    if str(device) in config.out_air_devices:
+        height = config.out_air_height
+    elif str(device) in config.tempest_devices:
+        height = config.tempest_height
 
     # Define required constants
     P0      = 1013.25
@@ -173,7 +173,7 @@ def SLP(pressure, device, config):
     gamma_s = 0.0065
     g       = 9.80665
     T0      = 288.15
-    elevation = float(elevation) + float(height)
+    elevation = elevation + height
 
     # Calculate and return sea level pressure
     SLP = (pressure[0]
@@ -209,14 +209,14 @@ def SLP_trend(pressure, ob_time, device, api_data, config):
         return error_output
 
     # Define index of pressure in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a  = 1
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 6
 
     # If REST API services are enabled, extract required observations from
     # WeatherFlow API data based on device type indicated in API call
-    if (int(config['System']['rest_api'])
+    if (config.rest_api
             and '24Hrs' in api_data[device]
             and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
         data_24hrs = api_data[device]['24Hrs'].json()['obs']
@@ -315,19 +315,19 @@ def SLP_max(pressure, ob_time, max_pres, device, api_data, config):
     SLP = derive.SLP(pressure, device, config)
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
     # Define index of temperature in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a  = 1
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 6
 
     # If console is initialising and REST API services are enabled, download all
     # data for current day using Weatherflow API and calculate daily maximum
     # pressure
-    if int(config['System']['rest_api']) and max_pres[0] is None:
+    if config.rest_api and max_pres[0] is None:
         if ('today' in api_data[device]
                 and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
             data_today = api_data[device]['today'].json()['obs']
@@ -344,7 +344,7 @@ def SLP_max(pressure, ob_time, max_pres, device, api_data, config):
 
     # If console is initialising and REST API services are disabled, set daily
     # minimum pressure to current temperature
-    elif not int(config['System']['rest_api']) and max_pres[0] is None:
+    elif not config.rest_api and max_pres[0] is None:
         max_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
 
     # Else if midnight has passed, reset maximum pressure
@@ -393,19 +393,19 @@ def SLP_min(pressure, ob_time, min_pres, device, api_data, config):
     SLP = derive.SLP(pressure, device, config)
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
     # Define index of temperature in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a  = 1
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 6
 
     # If console is initialising and REST API services are enabled, download all
     # data for current day using Weatherflow API and calculate daily minimum
     # pressure
-    if int(config['System']['rest_api']) and min_pres[0] is None:
+    if config.rest_api and min_pres[0] is None:
         if ('today' in api_data[device]
                 and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
             data_today = api_data[device]['today'].json()['obs']
@@ -422,7 +422,7 @@ def SLP_min(pressure, ob_time, min_pres, device, api_data, config):
 
     # If console is initialising and REST API services are disabled, set daily
     # minimum pressure to current temperature
-    elif not int(config['System']['rest_api']) and min_pres[0] is None:
+    elif not config.rest_api and min_pres[0] is None:
         min_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
 
     # Else if midnight has passed, reset maximum and minimum pressure
@@ -467,14 +467,14 @@ def temp_diff(out_temp, ob_time, device, api_data, config):
         return error_output
 
     # Define index of temperature in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a  = 2
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 7
 
     # If REST API services are enabled, extract required observations from
     # WeatherFlow API data based on device type indicated in API call
-    if (int(config['System']['rest_api'])
+    if (config.rest_api
             and '24Hrs' in api_data[device]
             and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
         data_24hrs = api_data[device]['24Hrs'].json()['obs']
@@ -538,14 +538,14 @@ def temp_trend(out_temp, ob_time, device, api_data, config):
         return error_output
 
     # Define index of temperature in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a  = 2
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 7
 
     # If REST API services are enabled, extract required observations from
     # WeatherFlow API data based on device type indicated in API call
-    if (int(config['System']['rest_api'])
+    if (config.rest_api
             and '24Hrs' in api_data[device]
             and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
         data_24hrs = api_data[device]['24Hrs'].json()['obs']
@@ -612,20 +612,20 @@ def temp_max(temp, ob_time, max_temp, device, api_data, config):
         return error_output
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
     # Define index of temperature in websocket packets
-    if (str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]
-            or str(device) in [config['Station']['InAirID'], config['Station']['InAirSN']]):
+    if (str(device) in config.out_air_devices
+            or str(device) in config.in_air_devices):
         index_bucket_a  = 2
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 7
 
     # If console is initialising and REST API services are enabled, download all
     # data for current day using Weatherflow API and calculate daily maximum
     # temperature
-    if int(config['System']['rest_api']) and max_temp[0] is None:
+    if config.rest_api and max_temp[0] is None:
         if ('today' in api_data[device]
                 and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
             data_today = api_data[device]['today'].json()['obs']
@@ -641,7 +641,7 @@ def temp_max(temp, ob_time, max_temp, device, api_data, config):
 
     # If console is initialising and REST API services are disabled, set daily
     # maximum temperature to current temperature
-    elif not int(config['System']['rest_api']) and max_temp[0] is None:
+    elif not config.rest_api and max_temp[0] is None:
         max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
 
     # Else if midnight has passed, reset maximum temperature to current
@@ -688,20 +688,20 @@ def temp_min(temp, ob_time, min_temp, device, api_data, config):
         return error_output
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
     # Define index of temperature in websocket packets
-    if (str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]
-            or str(device) in [config['Station']['InAirID'], config['Station']['InAirSN']]):
+    if (str(device) in config.out_air_devices
+            or str(device) in config.in_air_devices):
         index_bucket_a  = 2
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 7
 
     # If console is initialising and REST API services are enabled, download all
     # data for current day using Weatherflow API and calculate daily minimum
     # temperature
-    if int(config['System']['rest_api']) and min_temp[0] is None:
+    if config.rest_api and min_temp[0] is None:
         if 'today' in api_data[device] and weatherflow_api.verify_response(api_data[device]['today'], 'obs'):
             data_today = api_data[device]['today'].json()['obs']
             api_time   = [item[0]              for item in data_today if item[index_bucket_a] is not None]
@@ -716,7 +716,7 @@ def temp_min(temp, ob_time, min_temp, device, api_data, config):
 
     # If console is initialising and REST API services are disabled, set daily
     # minimum temperature to current temperature
-    elif not int(config['System']['rest_api']) and min_temp[0] is None:
+    elif not config.rest_api and min_temp[0] is None:
         min_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
 
     # Else if midnight has passed, reset minimum temperature to current
@@ -751,7 +751,7 @@ def strike_delta_t(strike_time, config):
     # Return None if required variables are missing
     error_output = [None, 's', None]
     if strike_time[0] is None:
-        if config['System']['Connection'] != 'UDP':
+        if config.connection != 'UDP':
             Logger.warning(f'strike_delta_t: {system().log_time()} - strike_time is None')
         return error_output
 
@@ -786,14 +786,14 @@ def strike_frequency(ob_time, device, api_data, config):
         return error_output
 
     # Define index of total lightning strike counts in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a  = 4
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a  = 15
 
     # If REST API services are enabled, extract lightning strike count over the
     # last three hours
-    if (int(config['System']['rest_api'])
+    if (config.rest_api
             and '24Hrs' in api_data[device]
             and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
         data_24hrs = api_data[device]['24Hrs'].json()['obs']
@@ -823,7 +823,7 @@ def strike_frequency(ob_time, device, api_data, config):
 
     # If REST API services are enabled, extract lightning strike count over the
     # last 10 minutes
-    if (int(config['System']['rest_api'])
+    if (config.rest_api
             and '24Hrs' in api_data[device]
             and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
         data_24hrs = api_data[device]['24Hrs'].json()['obs']
@@ -886,17 +886,17 @@ def strike_count(count, strike_count, device, api_data, config):
         return {'today': today_strikes, 'month': month_strikes, 'year': year_strikes}
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
     day_date = time_now.strftime("%Y-%m-%d")
     month_date = time_now.replace(day=1).strftime("%Y-%m-%d")
     year_date  = time_now.replace(day=1, month=1).strftime("%Y-%m-%d")
 
     # Define index of total lightning strike counts in websocket packets
-    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+    if str(device) in config.out_air_devices:
         index_bucket_a = 4
         index_bucket_e = 4
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a = 15
         index_bucket_e = 24
 
@@ -905,8 +905,8 @@ def strike_count(count, strike_count, device, api_data, config):
     # ==========================================================================
     # If console is initialising and REST API services are enabled, calculate
     # total daily lightning strikes using WeatherFlow API
-    if int(config['System']['rest_api']) and strike_count['today'][0] is None:
-        if not int(config['System']['stats_endpoint']):
+    if config.rest_api and strike_count['today'][0] is None:
+        if not config.stats_endpoint:
             if 'today' in api_data[device] and weatherflow_api.verify_response(api_data[device]['today'], 'obs'):
                 data_today = api_data[device]['today'].json()['obs']
                 strikes = [item[index_bucket_a] for item in data_today if item[index_bucket_a] is not None]
@@ -917,7 +917,7 @@ def strike_count(count, strike_count, device, api_data, config):
                     today_strikes = error_output
             else:
                 today_strikes = error_output
-        elif int(config['System']['stats_endpoint']):
+        elif config.stats_endpoint:
             if 'statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_day'):
                 statistics = api_data[device]['statistics'].json()
                 if statistics["stats_day"][-1][0] == day_date:
@@ -934,7 +934,7 @@ def strike_count(count, strike_count, device, api_data, config):
 
     # Else if console is initialising and REST API services are not enabled,
     # set total daily lightning strikes equal to last minute count
-    elif not int(config['System']['rest_api']) and strike_count['today'][0] is None:
+    elif not config.rest_api and strike_count['today'][0] is None:
         today_strikes = [count[0], 'count', count[0], time.time()]
 
     # Else if midnight has passed, reset daily lightning strike count to zero
@@ -957,8 +957,8 @@ def strike_count(count, strike_count, device, api_data, config):
 
     # Else if console is initialising and REST API services are enabled,
     # calculate total monthly lightning strikes using WeatherFlow API
-    elif int(config['System']['rest_api']) and strike_count['month'][0] is None:
-        if not int(config['System']['stats_endpoint']):
+    elif config.rest_api and strike_count['month'][0] is None:
+        if not config.stats_endpoint:
             if 'month' in api_data[device] and weatherflow_api.verify_response(api_data[device]['month'], 'obs'):
                 month_data  = api_data[device]['month'].json()['obs']
                 strikes     = [item[index_bucket_e] for item in month_data if item[index_bucket_e] is not None]
@@ -972,7 +972,7 @@ def strike_count(count, strike_count, device, api_data, config):
                     month_strikes = error_output
             else:
                 month_strikes = error_output
-        elif int(config['System']['stats_endpoint']):
+        elif config.stats_endpoint:
             if 'statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_month'):
                 statistics = api_data[device]['statistics'].json()
                 if statistics["stats_month"][-1][0] == month_date:
@@ -989,7 +989,7 @@ def strike_count(count, strike_count, device, api_data, config):
 
     # Else if console is initialising and REST API services are not enabled, set
     # total daily lightning strikes equal to last minute count
-    elif not int(config['System']['rest_api']) and strike_count['month'][0] is None:
+    elif not config.rest_api and strike_count['month'][0] is None:
         month_strikes = [count[0], 'count', count[0], time.time()]
 
     # Else if the end of the month has passed, reset monthly lightning strike
@@ -1013,8 +1013,8 @@ def strike_count(count, strike_count, device, api_data, config):
 
     # Else if console is initialising and REST API services are enabled,
     # calculate total yearly lightning strikes using WeatherFlow API
-    elif int(config['System']['rest_api']) and strike_count['year'][0] is None:
-        if not int(config['System']['stats_endpoint']):
+    elif config.rest_api and strike_count['year'][0] is None:
+        if not config.stats_endpoint:
             if 'year' in api_data[device] and weatherflow_api.verify_response(api_data[device]['year'], 'obs'):
                 year_data = api_data[device]['year'].json()['obs']
                 strikes   = [item[index_bucket_e] for item in year_data if item[index_bucket_e] is not None]
@@ -1028,7 +1028,7 @@ def strike_count(count, strike_count, device, api_data, config):
                     year_strikes = error_output
             else:
                 year_strikes = error_output
-        elif int(config['System']['stats_endpoint']):
+        elif config.stats_endpoint:
             if 'statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_year'):
                 statistics = api_data[device]['statistics'].json()
                 if statistics["stats_year"][-1][0] == year_date:
@@ -1045,7 +1045,7 @@ def strike_count(count, strike_count, device, api_data, config):
 
     # Else if console is initialising and REST API services are not enabled, set
     # total yearly lightning strikes equal to last minute count
-    elif not int(config['System']['rest_api']) and strike_count['month'][0] is None:
+    elif not config.rest_api and strike_count['month'][0] is None:
         year_strikes = [count[0], 'count', count[0], time.time()]
 
     # Else if the end of the year has passed, reset monthly and yearly lightning
@@ -1136,7 +1136,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
         return {'today': today_rain, 'yesterday': yesterday_rain, 'month': month_rain, 'year': year_rain}
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
     day_date = time_now.strftime("%Y-%m-%d")
     yesterday_date = (time_now - timedelta(days=1)).strftime("%Y-%m-%d")
@@ -1144,10 +1144,10 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     year_date  = time_now.replace(day=1, month=1).strftime("%Y-%m-%d")
 
     # Define index of total daily rain accumulation in websocket packets
-    if str(device) in [config['Station']['SkyID'], config['Station']['SkySN']]:
+    if str(device) in config.sky_devices:
         index_bucket_a = 3
         index_bucket_e = 3
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a = 12
         index_bucket_e = 28
 
@@ -1155,20 +1155,20 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     # TODAY RAIN
     # ==========================================================================
     # Set current daily rainfall accumulation for websocket connections
-    if config['System']['Connection'] == 'Websocket':
+    if config.connection == 'Websocket':
         if daily_rain[0] is not None:
             today_rain = [daily_rain[0], 'mm', daily_rain[0], time.time()]
         else:
             today_rain = error_output
 
     # Else, set current daily rainfall accumulation for UDP connections
-    elif config['System']['Connection'] == 'UDP':
+    elif config.connection == 'UDP':
 
         # If console is initialising and REST API services are enabled, download
         # all data for current day using Weatherflow API and calculate todays's
         # rainfall
-        if int(config['System']['rest_api']) and rain_accum['today'][0] is None:
-            if not int(config['System']['stats_endpoint']):
+        if config.rest_api and rain_accum['today'][0] is None:
+            if not config.stats_endpoint:
                 if 'today' in api_data[device] and weatherflow_api.verify_response(api_data[device]['today'], 'obs'):
                     today_data = api_data[device]['today'].json()['obs']
                     rain_data = [item[index_bucket_a] for item in today_data if item[index_bucket_a] is not None]
@@ -1179,7 +1179,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                         today_rain = error_output
                 else:
                     today_rain = error_output
-            elif int(config['System']['stats_endpoint']):    
+            elif config.stats_endpoint:    
                 if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_day')):
                     statistics = api_data[device]['statistics'].json()
                     if statistics["stats_day"][-1][0] == day_date:
@@ -1196,7 +1196,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
 
         # Else if console is initialising and REST API services are not enabled,
         # set today's rainfall accumulation equal to minute_rain
-        elif not int(config['System']['rest_api']) and rain_accum['today'][0] is None:
+        elif not config.rest_api and rain_accum['today'][0] is None:
             today_rain = [minute_rain[0], 'mm', minute_rain[0], time.time()]
 
         # Else if midnight has passed, set today's rainfall accumulation equal
@@ -1214,8 +1214,8 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     # If console is initialising and REST API services are enabled, download
     # all data for yesterday using Weatherflow API and calculate yesterday's
     # rainfall
-    if int(config['System']['rest_api']) and rain_accum['yesterday'][0] is None:
-        if not int(config['System']['stats_endpoint']):
+    if config.rest_api and rain_accum['yesterday'][0] is None:
+        if not config.stats_endpoint:
             if 'yesterday' in api_data[device] and weatherflow_api.verify_response(api_data[device]['yesterday'], 'obs'):
                 yesterday_data = api_data[device]['yesterday'].json()['obs']
                 rain_data = [item[index_bucket_a] for item in yesterday_data if item[index_bucket_a] is not None]
@@ -1226,7 +1226,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                     yesterday_rain = error_output
             else:
                 yesterday_rain = error_output
-        elif int(config['System']['stats_endpoint']):   
+        elif config.stats_endpoint:   
             if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_day')):
                 statistics = api_data[device]['statistics'].json()
                 if statistics["stats_day"][-2][0] == yesterday_date:
@@ -1249,7 +1249,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
 
     # Else if console is initialising and REST API services are not enabled, set
     # yesterday's rainfall accumulation equal to None
-    elif not int(config['System']['rest_api']) and rain_accum['yesterday'][0] is None:
+    elif not config.rest_api and rain_accum['yesterday'][0] is None:
         yesterday_rain = error_output
 
     # Else, set yesterday rainfall accumulation as unchanged
@@ -1267,9 +1267,9 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     # Else if console is initialising and REST API services are enabled,
     # download all data for the current month using Weatherflow API and
     # calculate the monthly rainfall
-    elif int(config['System']['rest_api']) and rain_accum['month'][0] is None:
+    elif config.rest_api and rain_accum['month'][0] is None:
         if today_rain[0] is not None:
-            if not int(config['System']['stats_endpoint']):
+            if not config.stats_endpoint:
                 if 'month' in api_data[device] and weatherflow_api.verify_response(api_data[device]['month'], 'obs'):
                     month_data = api_data[device]['month'].json()['obs']
                     rain_data  = [item[index_bucket_e] for item in month_data if item[index_bucket_e] is not None]
@@ -1281,7 +1281,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                         month_rain = error_output
                 else:
                     month_rain = error_output
-            elif int(config['System']['stats_endpoint']):
+            elif config.stats_endpoint:
                 if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_month')):
                     statistics = api_data[device]['statistics'].json()
                     if statistics["stats_month"][-1][0] == month_date:
@@ -1301,7 +1301,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
      
     # Else if console is initialising and REST API services are not enabled, set
     # monthly rainfall accumulation equal to minute_rain
-    elif not int(config['System']['rest_api']) and rain_accum['month'][0] is None:
+    elif not config.rest_api and rain_accum['month'][0] is None:
         month_rain = [minute_rain[0], 'mm', minute_rain[0], time.time()]
 
     # Else if the end of the month has passed, reset monthly rain accumulation
@@ -1333,9 +1333,9 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     # Else if console is initialising, and REST API services are enabled,
     # download all data for the current year using Weatherflow API and
     # calculate the yearly rainfall
-    elif int(config['System']['rest_api']) and rain_accum['year'][0] is None:
+    elif config.rest_api and rain_accum['year'][0] is None:
         if today_rain[0] is not None:
-            if not int(config['System']['stats_endpoint']):
+            if not config.stats_endpoint:
                 if 'year' in api_data[device] and weatherflow_api.verify_response(api_data[device]['year'], 'obs'):
                     year_data = api_data[device]['year'].json()['obs']
                     rain_data = [item[index_bucket_e] for item in year_data if item[index_bucket_e] is not None]
@@ -1347,7 +1347,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                         year_rain = error_output
                 else:
                     year_rain = error_output
-            elif int(config['System']['stats_endpoint']):
+            elif config.stats_endpoint:
                 if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_month')):
                     statistics = api_data[device]['statistics'].json()
                     if statistics["stats_year"][-1][0] == year_date:
@@ -1367,7 +1367,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
 
     # Else if console is initialising and REST API services are not enabled, set
     # yearly rainfall accumulation equal to minute_rain
-    elif not int(config['System']['rest_api']) and rain_accum['year'][0] is None:
+    elif not config.rest_api and rain_accum['year'][0] is None:
         year_rain = [minute_rain[0], 'mm', minute_rain[0], time.time()]
 
     # Else if the end of the year has passed, reset monthly and yearly rain
@@ -1393,48 +1393,62 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     return {'today': today_rain, 'yesterday': yesterday_rain, 'month': month_rain, 'year': year_rain}
 
 
-def avg_wind_speed(wind_spd, avg_wind, device, api_data, config):
+def avg_wind_speed(wind_spd, ob_time, avg_wind, device, api_data, config):
 
-    """ Calculate the average windspeed since midnight station time
+    """ Calculate the time-weighted average windspeed since midnight station
+        time. Each observation is weighted by the time elapsed since the
+        previous observation, capped at max_interval so that gaps in the data
+        do not bias the average
 
     INPUTS:
         wind_spd            Wind speed                                  [m/s]
+        ob_time             Observation time                             [s]
         avg_wind            Average wind speed since midnight           [m/s]
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
 
     OUTPUT:
-        AvgWind             Average wind speed since midnight           [m/s]
+        AvgWind             Average wind speed since midnight, total    [m/s]
+                            weighted time and time of last observation  [s]
     """
 
+    # Define nominal and maximum interval between observations
+    interval     = 60
+    max_interval = 300
+
     # Return None if required variables are missing
     error_output = [None, 'mps', None, None, time.time()]
     if wind_spd[0] is None:
         Logger.warning(f'avgSpeed: {system().log_time()} - wind_spd is None')
         return error_output
+    elif ob_time[0] is None:
+        Logger.warning(f'avgSpeed: {system().log_time()} - ob_time is None')
+        return error_output
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
     # Define index of wind speed in websocket packets
-    if str(device) in [config['Station']['SkyID'], config['Station']['SkySN']]:
+    if str(device) in config.sky_devices:
         index_bucket_a = 5
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a = 2
 
     # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate daily averaged
-    # windspeed
-    if int(config['System']['rest_api']) and avg_wind[0] is None:
+    # data for current day using Weatherflow API and calculate daily
+    # time-weighted averaged windspeed
+    if config.rest_api and avg_wind[0] is None:
         if ('today' in api_data[device]
                 and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
             today_data = api_data[device]['today'].json()['obs']
-            wind_spd = [item[index_bucket_a] for item in today_data if item[index_bucket_a] is not None]
+            today_data = [item for item in today_data if item[index_bucket_a] is not None]
             try:
-                average = sum(x for x in wind_spd) / len(wind_spd)
-                wind_avg = [average, 'mps', average, len(wind_spd), time.time()]
+                weights = [interval] + [min(max(today_data[ii][0] - today_data[ii - 1][0], 0), max_interval) for ii in range(1, len(today_data))]
+                total   = sum(weights)
+                average = sum(item[index_bucket_a] * weight for item, weight in zip(today_data, weights)) / total
+                wind_avg = [average, 'mps', average, total, today_data[-1][0]]
             except Exception as error:
                 Logger.warning(f'avgSpeed: {system().log_time()} - {error}')
                 wind_avg = error_output
@@ -1443,24 +1457,47 @@ def avg_wind_speed(wind_spd, avg_wind, device, api_data, config):
 
     # If console is initialising and REST API services are not enabled,
     # set daily averaged wind speed to current wind speed
-    elif not int(config['System']['rest_api']) and avg_wind[0] is None:
-        wind_avg = [wind_spd[0], 'mps', wind_spd[0], 1, time.time()]
+    elif not config.rest_api and avg_wind[0] is None:
+        wind_avg = [wind_spd[0], 'mps', wind_spd[0], interval, ob_time[0]]
 
     # Else if midnight has passed, reset daily averaged wind speed
     elif time_now.date() > datetime.fromtimestamp(avg_wind[4], Tz).date():
-        wind_avg = [wind_spd[0], 'mps', wind_spd[0], 1, time.time()]
+        wind_avg = [wind_spd[0], 'mps', wind_spd[0], interval, ob_time[0]]
 
-    # Else, calculate current daily averaged wind speed
+    # Else, calculate current daily time-weighted averaged wind speed
     else:
-        length = avg_wind[3] + 1
-        current_avg = avg_wind[2]
-        updated_avg = (length - 1) / length * current_avg + 1 / length * wind_spd[0]
-        wind_avg    = [updated_avg, 'mps', updated_avg, length, time.time()]
+        weight      = min(max(ob_time[0] - avg_wind[4], 0), max_interval)
+        total       = avg_wind[3] + weight
+        updated_avg = (avg_wind[3] * avg_wind[2] + weight * wind_spd[0]) / total if total > 0 else avg_wind[2]
+        wind_avg    = [updated_avg, 'mps', updated_avg, total, max(ob_time[0], avg_wind[4])]
 
     # Return daily averaged wind speed
     return wind_avg
 
 
+def rolling_wind_speed(rapid_wind_spd, rolling_mean, ob_time):
+
+    """ Calculate the time-weighted rolling mean windspeed from rapid_wind
+        observations
+
+    INPUTS:
+        rapid_wind_spd      Rapid wind speed                            [m/s]
+        rolling_mean        Rolling mean holding rapid wind samples
+        ob_time             Time of rapid wind observation              [s]
+
+    OUTPUT:
+        RollingWind         Rolling mean wind speed                     [m/s]
+    """
+
+    # Return None if required variables are missing
+    if rapid_wind_spd[0] is None or ob_time is None:
+        return [None, 'mps']
+
+    # Add latest rapid wind sample and return rolling mean wind speed
+    rolling_mean.append(ob_time, rapid_wind_spd[0])
+    return [rolling_mean.mean(), 'mps']
+
+
 def max_wind_gust(wind_gust, max_gust, device, api_data, config):
 
     """ Calculate the maximum wind gust since midnight station time
@@ -1483,18 +1520,18 @@ def max_wind_gust(wind_gust, max_gust, device, api_data, config):
         return error_output
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
     # Define index of wind speed in websocket packets
-    if str(device) in [config['Station']['SkyID'], config['Station']['SkySN']]:
+    if str(device) in config.sky_devices:
         index_bucket_a = 6
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a = 3
 
     # If console is initialising and REST API services are enabled, download all
     # data for current day using Weatherflow API and calculate maximum wind gust
-    if int(config['System']['rest_api']) and max_gust[0] is None:
+    if config.rest_api and max_gust[0] is None:
         if ('today' in api_data[device]
                 and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
             today_data = api_data[device]['today'].json()['obs']
@@ -1509,7 +1546,7 @@ def max_wind_gust(wind_gust, max_gust, device, api_data, config):
 
     # If console is initialising and REST API services are not enabled,
     # set maximum wind gust to current wind gust
-    elif not int(config['System']['rest_api']) and max_gust[0] is None:
+    elif not config.rest_api and max_gust[0] is None:
         max_gust = [wind_gust[0], 'mps', wind_gust[0], time.time()]
 
     # Else if midnight has passed, reset maximum recorded wind gust
@@ -1669,31 +1706,24 @@ def peak_sun_hours(radiation, peak_sun, device, api_data, config):
         return error_output
 
     # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
+    Tz = config.timezone
     time_now = datetime.now(pytz.utc).astimezone(Tz)
 
-    # Calculate time of sunrise and sunset or use existing values
-    if peak_sun[0] is None or time_now > datetime.fromtimestamp(peak_sun[5], Tz):
-        observer          = ephem.Observer()
-        observer.pressure = 0
-        observer.lat      = str(config['Station']['Latitude'])
-        observer.lon      = str(config['Station']['Longitude'])
-        observer.horizon  = '-0:34'
-        sunrise           = observer.next_rising(ephem.Sun()).datetime().timestamp()
-        sunset            = observer.next_setting(ephem.Sun()).datetime().timestamp()
-    else:
-        sunrise           = peak_sun[4]
-        sunset            = peak_sun[5]
+    # Get time of sunrise and sunset for the current day from the shared solar
+    # ephemeris cache
+    sun_events = ephemeris.sun_events(config, time_now.date())
+    sunrise    = sun_events['Sunrise'].timestamp()
+    sunset     = sun_events['Sunset'].timestamp()
 
     # Define index of radiation in websocket packets
-    if str(device) in [config['Station']['SkyID'], config['Station']['SkySN']]:
+    if str(device) in config.sky_devices:
         index_bucket_a = 10
-    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+    elif str(device) in config.tempest_devices:
         index_bucket_a = 11
 
     # If console is initialising and REST API services are enabled, download all
     # data for current day using Weatherflow API and calculate Peak Sun Hours
-    if int(config['System']['rest_api']) and peak_sun[0] is None:
+    if config.rest_api and peak_sun[0] is None:
         if ('today' in api_data[device]
                 and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
             data_today = api_data[device]['today'].json()['obs']
@@ -1709,7 +1739,7 @@ def peak_sun_hours(radiation, peak_sun, device, api_data, config):
 
     # If console is initialising and REST API services are not enabled,
     # calculate current Peak Sun Hours
-    elif not int(config['System']['rest_api']) and peak_sun[0] is None:
+    elif not config.rest_api and peak_sun[0] is None:
         watt_hrs = radiation[0] * (1 / 60)
         peak_sun = [watt_hrs / 1000, 'hrs', watt_hrs, sunrise, sunset, time.time()]
 
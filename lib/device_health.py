@@ -0,0 +1,182 @@
+""" Defines the device health time-series required by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.ring_buffer import series_buffer
+
+# Import required Python modules
+import threading
+import math
+
+# Define device health retention, expected interval between device health
+# samples [s] and sample fields
+HEALTH_DAYS     = 7
+HEALTH_INTERVAL = 60
+HEALTH_FIELDS   = ['time', 'voltage', 'rssi', 'hub_rssi', 'sensor_status', 'uptime']
+
+# Define device configuration serial number keys
+DEVICE_SN = {'tempest': 'TempestSN', 'sky': 'SkySN', 'out_air': 'OutAirSN', 'in_air': 'InAirSN'}
+
+# Define sensor status bits reported in device_status messages. Failures are
+# shown in red and warnings in orange
+SENSOR_STATUS = [(0x00001, 'Lightning failed',       'd73027ff'),
+                 (0x00002, 'Lightning noise',        'ef6c00ff'),
+                 (0x00004, 'Lightning disturber',    'ef6c00ff'),
+                 (0x00008, 'Pressure failed',        'd73027ff'),
+                 (0x00010, 'Temperature failed',     'd73027ff'),
+                 (0x00020, 'Humidity failed',        'd73027ff'),
+                 (0x00040, 'Wind failed',            'd73027ff'),
+                 (0x00080, 'Precip failed',          'd73027ff'),
+                 (0x00100, 'Light/UV failed',        'd73027ff'),
+                 (0x08000, 'Power booster depleted', 'ef6c00ff')]
+
+
+# ==============================================================================
+# device_health CLASS
+# ==============================================================================
+class device_health():
+
+    """ Holds seven days of battery voltage, radio signal strength, sensor
+    status and uptime for the hub and each device in fixed-size series
+    buffers. Samples are taken from UDP hub_status and device_status messages,
+    or from the battery voltage in each observation when device_status
+    messages are not available
+    """
+
+    def __init__(self):
+        self.lock    = threading.Lock()
+        self.hub_sn  = None
+        self.buffers = {device: series_buffer(HEALTH_DAYS * 86400 // HEALTH_INTERVAL, HEALTH_FIELDS)
+                        for device in ['hub'] + list(DEVICE_SN)}
+
+    def parse_device_status(self, message, config):
+
+        """ Parse device_status UDP message
+
+        INPUTS:
+            message             device_status UDP message
+            config              Console configuration object
+        """
+
+        for device, sn_key in DEVICE_SN.items():
+            if config['Station'][sn_key] and message.get('serial_number') == config['Station'][sn_key]:
+                with self.lock:
+                    self.hub_sn = message.get('hub_sn', self.hub_sn)
+                    self.buffers[device].append({'time':          message.get('timestamp'),
+                                                 'voltage':       message.get('voltage'),
+                                                 'rssi':          message.get('rssi'),
+                                                 'hub_rssi':      message.get('hub_rssi'),
+                                                 'sensor_status': message.get('sensor_status'),
+                                                 'uptime':        message.get('uptime')})
+
+    def parse_hub_status(self, message, config):
+
+        """ Parse hub_status UDP message. Only messages from the hub that the
+        station devices report to are used. The hub reports several times a
+        minute, so messages are downsampled to one every HEALTH_INTERVAL
+        seconds
+
+        INPUTS:
+            message             hub_status UDP message
+            config              Console configuration object
+        """
+
+        sample_time = message.get('timestamp')
+        with self.lock:
+            if self.hub_sn is not None and message.get('serial_number') == self.hub_sn and sample_time is not None:
+                newest = self.buffers['hub'].newest()
+                if newest is None or sample_time - newest['time'] >= HEALTH_INTERVAL:
+                    self.buffers['hub'].append({'time':   sample_time,
+                                                'rssi':   message.get('rssi'),
+                                                'uptime': message.get('uptime')})
+
+    def record_observation(self, device, sample_time, voltage):
+
+        """ Record the battery voltage from a device observation. Ignored while
+        device_status messages are being received for the device
+
+        INPUTS:
+            device              Device name (tempest, sky, out_air or in_air)
+            sample_time         Observation time                             [s]
+            voltage             Battery voltage                              [v]
+        """
+
+        with self.lock:
+            newest = self.buffers[device].newest()
+            if newest is None or sample_time - newest['time'] > 2 * HEALTH_INTERVAL:
+                self.buffers[device].append({'time': sample_time, 'voltage': voltage})
+
+    def clear(self):
+
+        """ Remove all samples when the station or devices change
+        """
+
+        with self.lock:
+            self.hub_sn = None
+            for buffer in self.buffers.values():
+                buffer.clear()
+
+    def summary(self, device):
+
+        """ Summarise the health of the specified device for the status panel
+
+        INPUTS:
+            device              Device name (hub, tempest, sky, out_air or
+                                in_air)
+
+        OUTPUT:
+            summary             Dictionary holding the voltage trend, latest
+                                signal strength, uptime and number of resets,
+                                and the sensor status flags
+        """
+
+        # Copy required fields from device health buffer
+        with self.lock:
+            buffer = self.buffers[device]
+            if not len(buffer):
+                return None
+            times   = buffer.column('time',    86400 // HEALTH_INTERVAL)
+            voltage = buffer.column('voltage', 86400 // HEALTH_INTERVAL)
+            uptime  = buffer.column('uptime')
+            newest  = buffer.newest()
+
+        # Calculate voltage trend over the last day as the least squares slope
+        # of voltage against time. A trend needs at least two hours of data
+        trend  = None
+        points = [(t, v) for t, v in zip(times, voltage) if t > times[-1] - 86400 and not math.isnan(v)]
+        if len(points) > 2 and points[-1][0] - points[0][0] >= 7200:
+            mean_t = sum(t for t, _ in points) / len(points)
+            mean_v = sum(v for _, v in points) / len(points)
+            sxx    = sum((t - mean_t) ** 2 for t, _ in points)
+            sxy    = sum((t - mean_t) * (v - mean_v) for t, v in points)
+            trend  = sxy / sxx * 86400
+
+        # Count resets from decreases in uptime
+        uptime = [value for value in uptime if not math.isnan(value)]
+        resets = sum(1 for previous, current in zip(uptime, uptime[1:]) if current < previous)
+
+        # Define sensor status flags
+        flags = []
+        if not math.isnan(newest['sensor_status']):
+            flags = [(label, colour) for bit, label, colour in SENSOR_STATUS if int(newest['sensor_status']) & bit]
+
+        # Return device health summary
+        return {'trend':  trend,
+                'rssi':   None if math.isnan(newest['rssi']) else int(newest['rssi']),
+                'uptime': None if math.isnan(newest['uptime']) else int(newest['uptime']),
+                'resets': resets,
+                'flags':  flags}
@@ -0,0 +1,656 @@
+""" Defines the shared ephemeris cache required by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.system import system
+from lib        import persistence
+
+# Import required modules
+from kivy.logger import Logger
+from datetime    import datetime, timedelta
+import threading
+import bisect
+import ephem
+import math
+import time
+import pytz
+
+# Define shared solar ephemeris cache
+sun_cache = {}
+sun_lock  = threading.Lock()
+
+# Define shared moon phase curve cache and sample interval [s]
+moon_cache = {}
+moon_lock  = threading.Lock()
+MOON_STEP  = 600
+
+# Define shared sun and moon position curve cache and sample interval [s]
+position_cache = {}
+position_lock  = threading.Lock()
+POSITION_STEP  = 600
+
+# Define yearly ephemeris table properties. The table is rebuilt in the
+# background when it holds less than TABLE_MARGIN days of future events. If the
+# table cannot be built, for example because the sun or moon never rises or
+# sets at the station location, the failure is cached and events are
+# calculated directly until the end of the period the table would have covered
+TABLE_FILE    = 'ephemeris.json'
+TABLE_VERSION = 1
+TABLE_DAYS    = 366
+TABLE_MARGIN  = 30
+table         = {'data': None, 'worker': None, 'failed': None}
+table_lock    = threading.Lock()
+
+
+def station_date(config):
+
+    """ Return the current date according to the station clock
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        date                Current date in station timezone
+    """
+
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    return datetime.now(pytz.utc).astimezone(Tz).date()
+
+
+def sun_events(config, date=None):
+
+    """ Return the dawn, sunrise, sunset and dusk times for the specified date
+    in the station timezone. Times are calculated once per station and date and
+    shared by all callers. Entries for dates before the previous station day
+    are discarded when the station clock rolls over
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone. Defaults to today
+
+    OUTPUT:
+        events              Dictionary holding the dawn, sunrise, sunset and
+                            dusk times in station timezone
+    """
+
+    # Define cache key from station location and requested date
+    if date is None:
+        date = station_date(config)
+    key = (str(config['Station']['Latitude']),
+           str(config['Station']['Longitude']),
+           config['Station']['Timezone'],
+           date)
+
+    # Return cached events, or look up events for requested date in the yearly
+    # ephemeris table, or calculate events if the table is not available
+    with sun_lock:
+        if key not in sun_cache:
+            today = station_date(config)
+            for old_key in [old_key for old_key in sun_cache if old_key[3] < today - timedelta(days=1)]:
+                del sun_cache[old_key]
+            sun_cache[key] = table_sun_events(config, date) or calculate_sun_events(config, date)
+        return sun_cache[key]
+
+
+def calculate_sun_events(config, date):
+
+    """ Calculate the dawn, sunrise, sunset and dusk times for the specified
+    date in the station timezone
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone
+
+    OUTPUT:
+        events              Dictionary holding the dawn, sunrise, sunset and
+                            dusk times in station timezone
+    """
+
+    # Get station timezone
+    Tz = pytz.timezone(config['Station']['Timezone'])
+
+    # Define observer properties. Set pressure to 0 to match the United States
+    # Naval Observatory Astronomical Almanac
+    observer          = ephem.Observer()
+    observer.lat      = str(config['Station']['Latitude'])
+    observer.lon      = str(config['Station']['Longitude'])
+    observer.pressure = 0
+    sun               = ephem.Sun()
+
+    # Set Observer time to midnight in station timezone
+    Midnight = Tz.localize(datetime(date.year, date.month, date.day, 0, 0, 0)).astimezone(pytz.utc)
+    observer.date = Midnight.strftime('%Y/%m/%d %H:%M:%S')
+
+    # Calculate Dawn, Sunrise, Sunset and Dusk times in UTC
+    events = {}
+    for event, horizon, use_center, function in [('Dawn',    '-6',    True,  observer.next_rising),
+                                                 ('Sunrise', '-0:34', False, observer.next_rising),
+                                                 ('Sunset',  '-0:34', False, observer.next_setting),
+                                                 ('Dusk',    '-6',    True,  observer.next_setting)]:
+        observer.horizon = horizon
+        event_time = function(sun, use_center=use_center)
+        event_time = pytz.utc.localize(event_time.datetime().replace(second=0, microsecond=0))
+        events[event] = event_time.astimezone(Tz)
+
+    # Return Dawn, Sunrise, Sunset and Dusk times in station timezone
+    return events
+
+
+def moon_phase_curve(config, date=None, refresh=False):
+
+    """ Return the moon phase and illuminated face angle sampled at fixed
+    intervals across the specified station day. Curves are calculated once per
+    station and date and shared by all callers. Curves for dates before the
+    previous station day are discarded when the station clock rolls over
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone. Defaults to today
+        refresh             Recalculate the curve even if it is cached
+
+    OUTPUT:
+        curve               Dictionary holding the UTC timestamp of the first
+                            sample, the sample interval and the moon phase and
+                            illuminated face angle at each sample
+    """
+
+    # Define cache key from station location and requested date
+    if date is None:
+        date = station_date(config)
+    key = (str(config['Station']['Latitude']),
+           str(config['Station']['Longitude']),
+           config['Station']['Timezone'],
+           date)
+
+    # Return cached curve or calculate curve for requested date
+    with moon_lock:
+        if key not in moon_cache or refresh:
+            today = station_date(config)
+            for old_key in [old_key for old_key in moon_cache if old_key[3] < today - timedelta(days=1)]:
+                del moon_cache[old_key]
+            moon_cache[key] = calculate_moon_phase_curve(config, date)
+        return moon_cache[key]
+
+
+def calculate_moon_phase_curve(config, date):
+
+    """ Calculate the moon phase and the angle of the illuminated moon face at
+    fixed intervals across the specified station day
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone
+
+    OUTPUT:
+        curve               Dictionary holding the UTC timestamp of the first
+                            sample, the sample interval and the moon phase and
+                            illuminated face angle at each sample
+    """
+
+    # Get start and end of station day as UTC timestamps
+    Tz    = pytz.timezone(config['Station']['Timezone'])
+    start = Tz.localize(datetime(date.year, date.month, date.day)).timestamp()
+    end   = Tz.localize(datetime(date.year, date.month, date.day) + timedelta(days=1)).timestamp()
+
+    # Define observer properties
+    observer     = ephem.Observer()
+    observer.lat = str(config['Station']['Latitude'])
+    observer.lon = str(config['Station']['Longitude'])
+    sun          = ephem.Sun()
+    moon         = ephem.Moon()
+
+    # Sample moon phase and illuminated face angle across station day
+    curve = {'start': start, 'step': MOON_STEP, 'phase': [], 'angle': []}
+    for ii in range(math.ceil((end - start) / MOON_STEP) + 1):
+        sample_time = ephem.Date(datetime.fromtimestamp(start + ii * MOON_STEP, pytz.utc).replace(tzinfo=None))
+        moon.compute(sample_time)
+        curve['phase'].append(moon.phase)
+        observer.date = sample_time
+        moon.compute(observer)
+        sun.compute(observer)
+        dLon = sun.az - moon.az
+        y = math.sin(dLon) * math.cos(sun.alt)
+        x = math.cos(moon.alt) * math.sin(sun.alt) - math.sin(moon.alt) * math.cos(sun.alt) * math.cos(dLon)
+        curve['angle'].append(math.degrees(math.atan2(y, x)))
+
+    # Return moon phase curve
+    return curve
+
+
+def moon_phase_at(config, timestamp):
+
+    """ Return the moon phase and illuminated face angle at the specified time,
+    linearly interpolated from the moon phase curve for the station day
+
+    INPUTS:
+        config              Station configuration
+        timestamp           UTC timestamp
+
+    OUTPUT:
+        phase               Percentage of moon face illuminated              [%]
+        angle               Angle of illuminated moon face                 [deg]
+    """
+
+    # Get moon phase curve for station day holding requested time
+    Tz    = pytz.timezone(config['Station']['Timezone'])
+    curve = moon_phase_curve(config, datetime.fromtimestamp(timestamp, Tz).date())
+
+    # Locate samples either side of requested time
+    position = (timestamp - curve['start']) / curve['step']
+    ii       = min(max(int(position), 0), len(curve['phase']) - 2)
+    fraction = min(max(position - ii, 0), 1)
+
+    # Interpolate moon phase and illuminated face angle, taking the shortest
+    # path around the circle for the angle
+    phase = curve['phase'][ii] + (curve['phase'][ii + 1] - curve['phase'][ii]) * fraction
+    delta = (curve['angle'][ii + 1] - curve['angle'][ii] + 180) % 360 - 180
+    angle = (curve['angle'][ii] + delta * fraction + 180) % 360 - 180
+    return phase, angle
+
+
+def position_curve(config, date=None):
+
+    """ Return the sun and moon geometric elevation and azimuth sampled at fixed
+    intervals across the specified station day. Curves are calculated once per
+    station and date and shared by all callers. Curves for dates before the
+    previous station day are discarded when the station clock rolls over
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone. Defaults to today
+
+    OUTPUT:
+        curve               Dictionary holding the UTC timestamp of the first
+                            sample, the sample interval and the sun and moon
+                            elevation and azimuth at each sample
+    """
+
+    # Define cache key from station location and requested date
+    if date is None:
+        date = station_date(config)
+    key = (str(config['Station']['Latitude']),
+           str(config['Station']['Longitude']),
+           config['Station']['Timezone'],
+           date)
+
+    # Return cached curve or calculate curve for requested date
+    with position_lock:
+        if key not in position_cache:
+            today = station_date(config)
+            for old_key in [old_key for old_key in position_cache if old_key[3] < today - timedelta(days=1)]:
+                del position_cache[old_key]
+            position_cache[key] = calculate_position_curve(config, date)
+        return position_cache[key]
+
+
+def calculate_position_curve(config, date):
+
+    """ Calculate the sun and moon elevation and azimuth at fixed intervals
+    across the specified station day
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone
+
+    OUTPUT:
+        curve               Dictionary holding the UTC timestamp of the first
+                            sample, the sample interval and the sun and moon
+                            elevation and azimuth at each sample
+    """
+
+    # Get start and end of station day as UTC timestamps
+    Tz    = pytz.timezone(config['Station']['Timezone'])
+    start = Tz.localize(datetime(date.year, date.month, date.day)).timestamp()
+    end   = Tz.localize(datetime(date.year, date.month, date.day) + timedelta(days=1)).timestamp()
+
+    # Define observer properties. Set pressure to 0 so that elevation is
+    # geometric, which keeps the curve smooth enough to interpolate through
+    # the horizon
+    observer          = ephem.Observer()
+    observer.lat      = str(config['Station']['Latitude'])
+    observer.lon      = str(config['Station']['Longitude'])
+    observer.pressure = 0
+    sun               = ephem.Sun()
+    moon              = ephem.Moon()
+
+    # Sample sun and moon elevation and azimuth across station day
+    curve = {'start': start, 'step': POSITION_STEP, 'sun_alt': [], 'sun_az': [], 'moon_alt': [], 'moon_az': []}
+    for ii in range(math.ceil((end - start) / POSITION_STEP) + 1):
+        observer.date = ephem.Date(datetime.fromtimestamp(start + ii * POSITION_STEP, pytz.utc).replace(tzinfo=None))
+        sun.compute(observer)
+        moon.compute(observer)
+        curve['sun_alt'].append(math.degrees(sun.alt))
+        curve['sun_az'].append(math.degrees(sun.az))
+        curve['moon_alt'].append(math.degrees(moon.alt))
+        curve['moon_az'].append(math.degrees(moon.az))
+
+    # Return sun and moon position curve
+    return curve
+
+
+def position_at(config, timestamp):
+
+    """ Return the sun and moon elevation and azimuth at the specified time,
+    linearly interpolated from the position curve for the station day
+
+    INPUTS:
+        config              Station configuration
+        timestamp           UTC timestamp
+
+    OUTPUT:
+        position            Dictionary holding the sun and moon elevation
+                            [deg] and azimuth [deg]
+    """
+
+    # Get position curve for station day holding requested time
+    Tz    = pytz.timezone(config['Station']['Timezone'])
+    curve = position_curve(config, datetime.fromtimestamp(timestamp, Tz).date())
+
+    # Locate samples either side of requested time
+    position = (timestamp - curve['start']) / curve['step']
+    ii       = min(max(int(position), 0), len(curve['sun_alt']) - 2)
+    fraction = min(max(position - ii, 0), 1)
+
+    # Interpolate elevation, and azimuth taking the shortest path around the
+    # circle
+    output = {}
+    for body in ['sun', 'moon']:
+        alt   = curve[body + '_alt']
+        az    = curve[body + '_az']
+        delta = (az[ii + 1] - az[ii] + 180) % 360 - 180
+        output[body + '_alt'] = alt[ii] + (alt[ii + 1] - alt[ii]) * fraction
+        output[body + '_az']  = (az[ii] + delta * fraction) % 360
+    return output
+
+
+def moon_events(config, start, lunar_start):
+
+    """ Return the first moonrise after the specified time, the following
+    moonset, and the next full and new moon. Events are looked up in the
+    yearly ephemeris table, or calculated if the table is not available
+
+    INPUTS:
+        config              Station configuration
+        start               Time to search for next moonrise from
+        lunar_start         Time to search for next full and new moon from
+
+    OUTPUT:
+        events              Dictionary holding the moonrise and moonset times
+                            in station timezone, and the full and new moon
+                            times in UTC
+    """
+
+    return table_moon_events(config, start, lunar_start) or calculate_moon_events(config, start, lunar_start)
+
+
+def calculate_moon_events(config, start, lunar_start):
+
+    """ Calculate the first moonrise after the specified time, the following
+    moonset, and the next full and new moon
+
+    INPUTS:
+        config              Station configuration
+        start               Time to search for next moonrise from
+        lunar_start         Time to search for next full and new moon from
+
+    OUTPUT:
+        events              Dictionary holding the moonrise and moonset times
+                            in station timezone, and the full and new moon
+                            times in UTC
+    """
+
+    # Get station timezone
+    Tz = pytz.timezone(config['Station']['Timezone'])
+
+    # Define observer properties
+    observer          = moon_observer(config)
+    moon              = ephem.Moon()
+    observer.date     = start.astimezone(pytz.utc).strftime('%Y/%m/%d %H:%M:%S')
+
+    # Calculate Moonrise time and the time of the following Moonset
+    events = {}
+    Moonrise = observer.next_rising(moon)
+    Moonrise = pytz.utc.localize(Moonrise.datetime().replace(second=0, microsecond=0))
+    observer.date = Moonrise.strftime('%Y/%m/%d %H:%M:%S')
+    Moonset = observer.next_setting(moon)
+    Moonset = pytz.utc.localize(Moonset.datetime().replace(second=0, microsecond=0))
+    events['Moonrise'] = Moonrise.astimezone(Tz)
+    events['Moonset']  = Moonset.astimezone(Tz)
+
+    # Calculate date of next full moon and new moon in UTC
+    lunar_start = lunar_start.astimezone(pytz.utc).strftime('%Y/%m/%d %H:%M:%S')
+    events['FullMoon'] = pytz.utc.localize(ephem.next_full_moon(lunar_start).datetime())
+    events['NewMoon']  = pytz.utc.localize(ephem.next_new_moon(lunar_start).datetime())
+
+    # Return moon events
+    return events
+
+
+def moon_observer(config):
+
+    """ Return an observer at the station location with the standard horizon
+    and pressure used for moonrise and moonset
+    """
+
+    observer          = ephem.Observer()
+    observer.lat      = str(config['Station']['Latitude'])
+    observer.lon      = str(config['Station']['Longitude'])
+    observer.horizon  = '0'
+    observer.pressure = 1010
+    return observer
+
+
+def get_table(config):
+
+    """ Return the yearly ephemeris table for the station location. The table
+    is loaded from disk if required. If no table is available, or the table is
+    close to expiry, a background worker is started to build a new table and
+    None is returned until a table covering the current time is ready. No
+    worker is started while a failed build is cached for the station location
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        data                Yearly ephemeris table or None
+    """
+
+    location = [str(config['Station']['Latitude']), str(config['Station']['Longitude']), config['Station']['Timezone']]
+    with table_lock:
+        data = table['data']
+        if data is None or data['location'] != location:
+            data = persistence.read_json(persistence.cache_file(TABLE_FILE))
+            if data is None or data.get('version') != TABLE_VERSION or data.get('location') != location:
+                data = None
+            table['data'] = data
+        failed = table['failed']
+        if failed is not None and (failed['location'] != location or failed['until'] < time.time()):
+            table['failed'] = failed = None
+        if failed is None and (data is None or data['end'] < time.time() + TABLE_MARGIN * 86400):
+            if table['worker'] is None or not table['worker'].is_alive():
+                table['worker'] = threading.Thread(target=build_table, args=[dict(config['Station'])],
+                                                   name='Ephemeris', daemon=True)
+                table['worker'].start()
+        if data is None or data['start'] > time.time() - 86400 or data['end'] < time.time():
+            return None
+        return data
+
+
+def build_table(station):
+
+    """ Build the yearly ephemeris table for the station location and save it
+    to disk. If the table cannot be built the failure is cached so that events
+    are calculated directly until the end of the table period. Runs in a
+    background worker thread
+
+    INPUTS:
+        station             Station section of the station configuration
+    """
+
+    # Define table coverage from two days ago to a year ahead
+    start = math.floor(time.time() / 86400) * 86400 - 2 * 86400
+    end   = start + TABLE_DAYS * 86400
+    location   = [str(station['Latitude']), str(station['Longitude']), station['Timezone']]
+    start_date = datetime.fromtimestamp(start, pytz.utc).replace(tzinfo=None)
+    first_day  = start_date.date()
+
+    # Define observer and body for moon events
+    observer = moon_observer({'Station': station})
+    moon     = ephem.Moon()
+
+    # Calculate all events between start and end of table as UTC timestamps.
+    # Sun events are calculated for each station day exactly as they are when
+    # no table is available, and stored by day. Moon events are stored as
+    # sorted lists. Rising and setting times are truncated to the minute
+    events = {'Dawn': [], 'Sunrise': [], 'Sunset': [], 'Dusk': []}
+    try:
+        for day in range(TABLE_DAYS):
+            sun_events = calculate_sun_events({'Station': station}, first_day + timedelta(days=day))
+            for event in ['Dawn', 'Sunrise', 'Sunset', 'Dusk']:
+                events[event].append(int(sun_events[event].timestamp()))
+        events['Moonrise'] = next_events(observer, start_date, end, lambda: observer.next_rising(moon))
+        events['Moonset']  = next_events(observer, start_date, end, lambda: observer.next_setting(moon))
+        for event, function in [('FullMoon', ephem.next_full_moon), ('NewMoon', ephem.next_new_moon)]:
+            events[event] = []
+            date = ephem.Date(start_date)
+            while True:
+                date = function(date)
+                if date.datetime().replace(tzinfo=pytz.utc).timestamp() > end:
+                    break
+                events[event].append(round(date.datetime().replace(tzinfo=pytz.utc).timestamp()))
+                date = ephem.Date(date + ephem.minute)
+    except Exception as error:
+        Logger.warning(f'Ephemeris: {system().log_time()} - Unable to build table: {error}')
+        with table_lock:
+            table['failed'] = {'location': location, 'until': end}
+        return
+
+    # Save table to disk and make it available to callers
+    data = {'version': TABLE_VERSION, 'location': location,
+            'start': start, 'end': end, 'first_day': first_day.toordinal(), 'events': events}
+    persistence.write_json(persistence.cache_file(TABLE_FILE), data)
+    with table_lock:
+        table['data'] = data
+
+
+def next_events(observer, start_date, end, function):
+
+    """ Return the UTC timestamps, truncated to the minute, of successive
+    events returned by function from start_date until end
+
+    INPUTS:
+        observer            Observer used by function
+        start_date          Time to search for events from
+        end                 UTC timestamp to search for events until
+        function            Function returning the next event for observer
+
+    OUTPUT:
+        timestamps          List of event times as UTC timestamps
+    """
+
+    timestamps = []
+    observer.date = start_date
+    while True:
+        event_date = function()
+        event_time = event_date.datetime().replace(second=0, microsecond=0, tzinfo=pytz.utc).timestamp()
+        if event_time > end:
+            return timestamps
+        timestamps.append(int(event_time))
+        observer.date = ephem.Date(event_date + ephem.minute)
+
+
+def table_event(data, event, after):
+
+    """ Return the first event in the ephemeris table at or after the specified
+    UTC timestamp. Returns None if the table does not cover the search
+
+    INPUTS:
+        data                Yearly ephemeris table
+        event               Name of event
+        after               UTC timestamp to search from
+
+    OUTPUT:
+        timestamp           UTC timestamp of event or None
+    """
+
+    if after < data['start']:
+        return None
+    timestamps = data['events'][event]
+    ii = bisect.bisect_left(timestamps, after)
+    return timestamps[ii] if ii < len(timestamps) else None
+
+
+def table_sun_events(config, date):
+
+    """ Look up the dawn, sunrise, sunset and dusk times for the specified date
+    in the yearly ephemeris table. Returns None if the table is not available
+
+    INPUTS:
+        config              Station configuration
+        date                Date in station timezone
+
+    OUTPUT:
+        events              Dictionary holding the dawn, sunrise, sunset and
+                            dusk times in station timezone or None
+    """
+
+    data = get_table(config)
+    if data is None:
+        return None
+    day = date.toordinal() - data['first_day']
+    if not 0 <= day < len(data['events']['Dawn']):
+        return None
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    return {event: datetime.fromtimestamp(data['events'][event][day], pytz.utc).astimezone(Tz)
+            for event in ['Dawn', 'Sunrise', 'Sunset', 'Dusk']}
+
+
+def table_moon_events(config, start, lunar_start):
+
+    """ Look up the first moonrise after the specified time, the following
+    moonset, and the next full and new moon in the yearly ephemeris table.
+    Returns None if the table is not available
+
+    INPUTS:
+        config              Station configuration
+        start               Time to search for next moonrise from
+        lunar_start         Time to search for next full and new moon from
+
+    OUTPUT:
+        events              Dictionary holding the moonrise and moonset times
+                            in station timezone, and the full and new moon
+                            times in UTC, or None
+    """
+
+    data = get_table(config)
+    if data is None:
+        return None
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    timestamps = {}
+    timestamps['Moonrise'] = table_event(data, 'Moonrise', start.timestamp())
+    if timestamps['Moonrise'] is not None:
+        timestamps['Moonset'] = table_event(data, 'Moonset', timestamps['Moonrise'])
+    timestamps['FullMoon'] = table_event(data, 'FullMoon', lunar_start.timestamp())
+    timestamps['NewMoon']  = table_event(data, 'NewMoon',  lunar_start.timestamp())
+    if None in timestamps.values() or 'Moonset' not in timestamps:
+        return None
+    events = {}
+    events['Moonrise'] = datetime.fromtimestamp(timestamps['Moonrise'], pytz.utc).astimezone(Tz)
+    events['Moonset']  = datetime.fromtimestamp(timestamps['Moonset'],  pytz.utc).astimezone(Tz)
+    events['FullMoon'] = datetime.fromtimestamp(timestamps['FullMoon'], pytz.utc)
+    events['NewMoon']  = datetime.fromtimestamp(timestamps['NewMoon'],  pytz.utc)
+    return events
@@ -16,30 +16,71 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
-from lib.system import system
+from lib.request_api import http_cache
 from lib        import observation_format as observation
 from lib        import derived_variables  as derive
 from lib        import properties
+from lib        import persistence
 
 # Import required Kivy modules
 from kivy.network.urlrequest import UrlRequest
-from kivy.logger             import Logger
 from kivy.clock              import Clock
 from kivy.app                import App
 
 # Import required system modules
 from datetime   import datetime, timedelta, time
 import time     as UNIX
+import threading
 import certifi
 import bisect
 import pytz
 
+# Define maximum age of a saved forecast shown while a new forecast is fetched
+# at startup [s]
+SAVED_MAX_AGE = 86400
+
 
 class forecast():
 
     def __init__(self):
         self.app = App.get_running_app()
         self.met_data = properties.Met()
+        self.index = None
+        self.saved_file = persistence.cache_file('forecast.json')
+
+    def load_forecast(self):
+
+        """ Display the last forecast saved to disk, if it belongs to the current
+        station and is recent enough, while a new forecast is fetched from the
+        WeatherFlow BetterForecast API
+        """
+
+        saved = persistence.read_json(self.saved_file)
+        if (not saved
+                or str(saved.get('station')) != self.app.config['Station']['StationID']
+                or not 0 <= UNIX.time() - saved.get('saved', 0) < SAVED_MAX_AGE):
+            return
+        try:
+            self.index = self.index_forecast(saved['response'])
+        except (IndexError, KeyError, TypeError):
+            return
+        self.met_data['Response'] = saved['response']
+        if not self.display_forecast():
+            self.index = None
+
+    def save_forecast(self, Response):
+
+        """ Save the latest forecast to disk so that it can be displayed
+        immediately when the console is next started. Runs in a background
+        thread
+
+        INPUTS:
+            Response            BetterForecast API response
+        """
+
+        persistence.write_json(self.saved_file, {'station':  self.app.config['Station']['StationID'],
+                                                 'saved':    UNIX.time(),
+                                                 'response': Response})
 
     def reset_forecast(self):
 
@@ -49,6 +90,7 @@ class forecast():
 
         # Reset the forecast and schedule new forecast to be generated
         self.met_data = properties.Met()
+        self.index = None
         self.update_display()
         if hasattr(self.app, 'ForecastPanel'):
             for panel in getattr(self.app, 'ForecastPanel'):
@@ -67,7 +109,9 @@ class forecast():
             URL = URL.format(self.app.config['Keys']['WeatherFlow'],
                              self.app.config['Station']['StationID'])
             UrlRequest(URL,
+                       req_headers=http_cache.request_headers(URL),
                        on_success=self.success_forecast,
+                       on_redirect=self.unchanged_forecast,
                        on_failure=self.fail_forecast,
                        on_error=self.fail_forecast,
                        timeout=int(self.app.config['System']['Timeout']),
@@ -100,10 +144,38 @@ class forecast():
 
         """
 
-        # Parse the latest daily and hourly weather forecast data
+        # Store response validators so that the next request only downloads
+        # the forecast if it has changed
+        http_cache.store(Request.url, Request.resp_headers, Response)
+
+        # Index and save the latest daily and hourly weather forecast data
+        try:
+            self.index = self.index_forecast(Response)
+        except (IndexError, KeyError, TypeError):
+            self.fail_forecast()
+            return
         self.met_data['Response'] = Response
+        threading.Thread(target=self.save_forecast, args=[Response], daemon=True).start()
+
+        # Parse the latest daily and hourly weather forecast data
         self.parse_forecast()
 
+    def unchanged_forecast(self, Request, Response):
+
+        """ The WeatherFlow BetterForecast API reports that the forecast has
+        not changed since it was last downloaded. Parse the cached forecast
+
+        INPUTS:
+            Request             UrlRequest object
+            Response            UrlRequest response
+        """
+
+        Response = http_cache.cached_body(Request.url)
+        if Request.resp_status == 304 and Response is not None:
+            self.success_forecast(Request, Response)
+        else:
+            self.fail_forecast()
+
     def fail_forecast(self, *largs):
 
         """ Failed to fetch forecast from the WeatherFlow BetterForecast API.
@@ -115,8 +187,12 @@ class forecast():
 
         """
 
-        # Set forecast variables to blank and indicate to user that forecast is
-        # unavailable
+        # Keep showing the last forecast while it still covers the current
+        # hour. Otherwise set forecast variables to blank and indicate to user
+        # that forecast is unavailable
+        if self.index is not None and self.display_forecast():
+            self.schedule_retry()
+            return
         self.met_data['Valid']        = '--'
         self.met_data['Temp']         = '--'
         self.met_data['highTemp']     = '--'
@@ -140,8 +216,16 @@ class forecast():
             for panel in getattr(self.app, 'ForecastPanel'):
                 panel.setForecastIcon()
 
-        # Schedule new forecast to be downloaded in 5 minutes. Note secondsSched
-        # refers to number of seconds since the function was last called.
+        # Schedule new forecast to be downloaded
+        self.schedule_retry()
+
+    def schedule_retry(self):
+
+        """ Schedule new forecast to be downloaded in 5 minutes. Note
+        secondsSched refers to number of seconds since the function was last
+        called.
+        """
+
         Tz  = pytz.timezone(self.app.config['Station']['Timezone'])
         Now = datetime.now(pytz.utc).astimezone(Tz)
         sched_time = Now + timedelta(minutes=5)
@@ -149,19 +233,70 @@ class forecast():
         self.app.Sched.metDownload.cancel()
         self.app.Sched.metDownload = Clock.schedule_once(self.fetch_forecast, secondsSched)
 
+    def index_forecast(self, Forecast):
+
+        """ Index the hourly and daily forecasts in a BetterForecast API
+        response. The index is built once per response so that the forecast can
+        be reformatted without walking the response again
+
+        INPUTS:
+            Forecast            BetterForecast API response
+
+        OUTPUT:
+            index               Dictionary holding the hourly and daily
+                                forecasts, the 'valid from' time of each hourly
+                                forecast, the daily forecasts by day number, and
+                                the index of the first hourly forecast after
+                                each hourly forecast with different conditions
+        """
+
+        # Extract all hourly and daily forecasts
+        hourly = Forecast['forecast']['hourly']
+        daily  = Forecast['forecast']['daily']
+
+        # Find the first hourly forecast in which the expected conditions have
+        # changed, or the last hourly forecast if they do not change
+        until = [len(hourly) - 1] * len(hourly)
+        for ii in range(len(hourly) - 2, -1, -1):
+            if hourly[ii + 1]['conditions'] == hourly[ii]['conditions']:
+                until[ii] = until[ii + 1]
+            else:
+                until[ii] = ii + 1
+
+        # Return forecast index
+        return {'hourly': hourly,
+                'hours':  [forecast['time'] for forecast in hourly],
+                'daily':  {forecast['day_num']: forecast for forecast in daily},
+                'until':  until}
+
     def parse_forecast(self):
 
         """ Parse the latest daily and hourly weather forecast from the
-        WeatherFlow BetterForecast API and format for display based on user
-        specified units
+        WeatherFlow BetterForecast API, format it for display based on user
+        specified units and schedule the next forecast
         """
 
         # Extract Forecast dictionary
-        if 'Response' in self.met_data:
-            Forecast = self.met_data['Response']
-        else:
+        if 'Response' not in self.met_data or self.index is None:
             return
 
+        # Display forecast and schedule new forecast. If forecast cannot be
+        # displayed indicate to user that forecast is unavailable
+        if self.display_forecast():
+            Clock.schedule_once(self.schedule_forecast)
+        else:
+            Clock.schedule_once(self.fail_forecast)
+
+    def display_forecast(self):
+
+        """ Format the indexed daily and hourly weather forecast for display
+        based on user specified units
+
+        OUTPUT:
+            success             True if the forecast covers the current hour
+                                and was displayed
+        """
+
         # Get current time in station time zone
         Tz  = pytz.timezone(self.app.config['Station']['Timezone'])
         Now = datetime.now(pytz.utc).astimezone(Tz)
@@ -175,27 +310,19 @@ class forecast():
         else:
             TimeFormat = '%H:%M'
 
-        # Extract all forecast data from WeatherFlow JSON object
+        # Extract all forecast data from forecast index
         try:
-            # Extract all hourly and daily forecasts
-            hourlyForecasts  = (Forecast['forecast']['hourly'])
-            dailyForecasts   = (Forecast['forecast']['daily'])
-
-            # Extract 'valid from' time of all available hourly forecasts and
-            # retrieve forecast for the current hour
-            Hours          = list(forecast['time'] for forecast in hourlyForecasts)
+            # Retrieve forecast for the current hour
+            Hours          = self.index['hours']
             hoursInd       = bisect.bisect(Hours, int(UNIX.time()))
-            hourlyCurrent  = hourlyForecasts[hoursInd]
+            hourlyCurrent  = self.index['hourly'][hoursInd]
             hourlyLocalDay = hourlyCurrent['local_day']
 
             # Extract 'Valid' until time of forecast for current hour
-            Valid = Hours[bisect.bisect(Hours, int(UNIX.time()))]
-            Valid = datetime.fromtimestamp(Valid, pytz.utc).astimezone(Tz)
+            Valid = datetime.fromtimestamp(Hours[hoursInd], pytz.utc).astimezone(Tz)
 
-            # Extract 'day_start_local' time of all available daily forecasts and
-            # retrieve forecast for the current day
-            dailyDayNum  = list(forecast['day_num'] for forecast in dailyForecasts)
-            dailyCurrent = dailyForecasts[dailyDayNum.index(hourlyLocalDay)]
+            # Retrieve forecast for the current day
+            dailyCurrent = self.index['daily'][hourlyLocalDay]
 
             # Extract weather variables from current hourly forecast
             Temp         = [hourlyCurrent['air_temperature'], 'c']
@@ -227,14 +354,8 @@ class forecast():
             lowTemp   = [dailyCurrent['air_temp_low'], 'c']
             precipDay = [dailyCurrent['precip_probability'], '%']
 
-            # Extract list of expected conditions and find time when expected conditions
-            # will change
-            conditionList = list(forecast['conditions'] for forecast in hourlyForecasts[hoursInd:])
-            try:
-                Ind = next(i for i, C in enumerate(conditionList) if C != hourlyCurrent['conditions'])
-            except StopIteration:
-                Ind = len(conditionList) - 1
-            Time = datetime.fromtimestamp(Hours[Ind], pytz.utc).astimezone(Tz)
+            # Find time until which expected conditions will not change
+            Time = datetime.fromtimestamp(Hours[self.index['until'][hoursInd]], pytz.utc).astimezone(Tz)
             if Time.date() == Now.date():
                 Conditions = hourlyCurrent['conditions'].capitalize() + ' until ' + datetime.strftime(Time, TimeFormat) + ' today'
             elif Time.date() == Now.date() + timedelta(days=1):
@@ -288,27 +409,16 @@ class forecast():
             if hasattr(self.app, 'ForecastPanel'):
                 for panel in getattr(self.app, 'ForecastPanel'):
                     panel.setForecastIcon()
+            return True
 
-            # Schedule new forecast
-            Clock.schedule_once(self.schedule_forecast)
-
-        # Unable to extract forecast data from JSON object. Set forecast
-        # variables to blank and indicate to user that forecast is unavailable
+        # Unable to extract forecast data from forecast index
         except (IndexError, KeyError, ValueError):
-            Clock.schedule_once(self.fail_forecast)
+            return False
 
     def update_display(self):
 
-        """ Update display with new forecast variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Update display with new forecast variables
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.met_data.items()):
-            try:
-                self.app.CurrentConditions.Met[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'astro: {system().log_time()} - Reference error')
-                    reference_error = True
+        # Push display values to update bus
+        self.app.update_bus.push('forecast', 'Met', self.met_data)
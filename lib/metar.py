@@ -0,0 +1,188 @@
+""" Defines the cached METAR report service required by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.request_api import checkwx_api
+from lib.system      import system
+from lib             import persistence
+
+# Import required modules
+from kivy.logger     import Logger
+from datetime        import datetime
+import functools
+import threading
+import time
+import pytz
+import re
+
+# Define METAR cache file, time a cached report is reused before a new report
+# is requested [s], maximum age of the last good report used when CheckWX is
+# unavailable [s], and time the nearest reporting station is remembered [s]
+METAR_FILE    = 'metar.json'
+METAR_TTL     = 1800
+METAR_MAX_AGE = 3 * 3600
+STATION_TTL   = 86400
+
+# Define precipitation codes used by the Sager Weathercaster, in order of
+# precedence within a present weather group
+PRECIP_CODES = ['FZDZ', 'FZRA', 'SHGR', 'SHGS', 'SHPL', 'SHRA', 'SHSN', 'TSGR', 'TSGS', 'TSPL', 'TSRA',
+                'TSSN', 'VCSH', 'VCTS', 'DZ', 'GR', 'GS', 'IC', 'PL', 'RA', 'SG', 'SN', 'UP']
+
+# Define METAR cloud group and present weather group token patterns
+CLOUD_TOKEN   = re.compile(r'(CAVOK|CLR|NCD|NSC|SKC)$|(FEW|SCT|BKN|OVC|VV)(\d{3}|///)')
+WEATHER_TOKEN = re.compile(r'(\+|-)?(VC)?(MI|PR|BC|DR|BL|SH|TS|FZ)?((DZ|RA|SN|SG|IC|PL|GR|GS|UP|BR|FG|FU|VA|DU|SA|HZ|PY|PO|SQ|FC|SS|DS)+)?$')
+PRECIP_CODE   = re.compile('|'.join(PRECIP_CODES))
+END_TOKENS    = ['RMK', 'TEMPO', 'BECMG', 'NOSIG']
+
+# Define shared METAR report cache
+cache = {'location': None, 'station': None, 'station_time': 0, 'report': None, 'observed': 0, 'fetched': 0}
+lock  = threading.Lock()
+
+
+@functools.lru_cache(maxsize=256)
+def decode(report):
+
+    """ Decode the cloud and precipitation codes from a METAR report in a single
+    pass over the report tokens. The first cloud group and the first present
+    weather group holding a precipitation code are used. Trend forecasts and
+    remarks are ignored
+
+    INPUTS:
+        report              Raw METAR report
+
+    OUTPUT:
+        cloud_code          First cloud code in METAR report, or None
+        precip_code         First precipitation code in METAR report, or None
+    """
+
+    # Skip report type and station identifier
+    tokens = report.split()
+    if tokens and tokens[0] in ['METAR', 'SPECI']:
+        tokens = tokens[1:]
+
+    # Decode cloud and precipitation codes up to the trend forecast or
+    # remarks
+    cloud_code  = None
+    precip_code = None
+    for token in tokens[1:]:
+        if token in END_TOKENS:
+            break
+        if cloud_code is None:
+            match = CLOUD_TOKEN.match(token)
+            if match:
+                cloud_code = match.group(1) or match.group(2)
+                continue
+        if precip_code is None and len(token) >= 2 and WEATHER_TOKEN.match(token):
+            match = PRECIP_CODE.search(token)
+            if match:
+                precip_code = match.group(0)
+    return cloud_code, precip_code
+
+
+def latest(config):
+
+    """ Return the latest METAR report from the reporting station nearest to
+    the station location. Reports are cached for METAR_TTL seconds, and the
+    last good report is saved to disk and used for up to METAR_MAX_AGE seconds
+    when CheckWX is unavailable
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        report              Raw METAR report, or None if no report is available
+    """
+
+    location = [str(config['Station']['Latitude']), str(config['Station']['Longitude'])]
+    with lock:
+
+        # Load last good report from disk if required
+        if cache['location'] != location:
+            saved = persistence.read_json(persistence.cache_file(METAR_FILE))
+            cache.update(location=location, station=None, station_time=0, report=None, observed=0, fetched=0)
+            if saved is not None and saved.get('location') == location:
+                cache.update({key: saved[key] for key in cache if key in saved})
+
+        # Return cached report if it has not expired
+        now = time.time()
+        if cache['report'] is not None and now - cache['fetched'] < METAR_TTL:
+            return cache['report']
+
+        # Request latest report, first from the remembered nearest reporting
+        # station and then from all stations near to the station location
+        report = None
+        if cache['station'] is not None and now - cache['station_time'] < STATION_TTL:
+            report = select_report(checkwx_api.METAR_station(cache['station'], config))
+        if report is None:
+            report = select_report(checkwx_api.METAR(config))
+            if report is not None:
+                cache['station']      = report.get('icao')
+                cache['station_time'] = now
+
+        # Update and save cache with latest report
+        if report is not None:
+            cache['report']   = report['raw_text']
+            cache['observed'] = observed_time(report, now)
+            cache['fetched']  = now
+            persistence.write_json(persistence.cache_file(METAR_FILE), cache)
+            return cache['report']
+
+        # Fall back to last good report if it is recent enough
+        if cache['report'] is not None and now - cache['observed'] < METAR_MAX_AGE:
+            Logger.warning(f'METAR: {system().log_time()} - CheckWX unavailable, using last good report')
+            return cache['report']
+        Logger.warning(f'METAR: {system().log_time()} - CheckWX unavailable, no recent report')
+        return None
+
+
+def select_report(data):
+
+    """ Select the first METAR report holding cloud information from a CheckWX
+    API response
+
+    INPUTS:
+        data                CheckWX API response
+
+    OUTPUT:
+        report              Decoded METAR report, or None
+    """
+
+    if not checkwx_api.verify_response(data, 'data'):
+        return None
+    for report in data.json()['data']:
+        if 'clouds' in report and report.get('raw_text'):
+            return report
+    return None
+
+
+def observed_time(report, default):
+
+    """ Return the time a decoded METAR report was observed
+
+    INPUTS:
+        report              Decoded METAR report
+        default             Time returned if observation time is missing   [s]
+
+    OUTPUT:
+        observed            Observation time as UNIX timestamp              [s]
+    """
+
+    try:
+        observed = datetime.strptime(report['observed'][:19], '%Y-%m-%dT%H:%M:%S')
+        return pytz.utc.localize(observed).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return default
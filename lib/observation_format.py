@@ -18,9 +18,452 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 # Import required modules
 from lib      import derived_variables as derive
 from datetime import datetime
-import pytz
+import threading
 
+# Define caches holding the compiled unit conversion and format plans. Each
+# plan is compiled once for a given observation signature and stored until the
+# user changes the console units
+unit_plans   = {}
+format_plans = {}
+plan_lock    = threading.Lock()
+MAX_PLANS    = 1024
 
+
+# ==============================================================================
+# COMPILED PLAN FUNCTIONS
+# ==============================================================================
+def signature(Obs):
+
+    """ Returns the signature of an observation used to look up its compiled
+    plans. Only the string elements of the observation determine which
+    conversions and formats apply, so numeric values are replaced by None
+
+    INPUTS:
+        Obs             Observations with units
+
+    OUTPUT:
+        signature       Tuple holding the string elements of the observation
+    """
+
+    return tuple(item if isinstance(item, str) else None for item in Obs)
+
+
+def clear_cache():
+
+    """ Clears the compiled unit conversion and format plans. Called when the
+    console units are changed
+    """
+
+    with plan_lock:
+        unit_plans.clear()
+        format_plans.clear()
+
+
+def store_plan(plans, key, plan):
+
+    """ Stores a compiled plan in the specified cache, clearing the cache if it
+    grows beyond MAX_PLANS entries
+    """
+
+    with plan_lock:
+        if len(plans) >= MAX_PLANS:
+            plans.clear()
+        plans[key] = plan
+    return plan
+
+
+def compile_units(Signature, Unit):
+
+    """ Compiles the unit conversions required for an observation signature
+
+    INPUTS:
+        Signature       Observation signature
+        Unit            Required output unit
+
+    OUTPUT:
+        plan            List of (index, handler) unit conversions
+    """
+
+    plan = []
+    for ii, token in enumerate(Signature):
+        if token is not None:
+            handler = unit_handler(token, Unit)
+            if handler is not None:
+                plan.append((ii, handler))
+    return plan
+
+
+def compile_format(Signature, obType):
+
+    """ Compiles the display formats required for an observation signature
+
+    INPUTS:
+        Signature       Observation signature
+        obType          Tuple of observation types
+
+    OUTPUT:
+        plan            List of (index, handler) display formats
+    """
+
+    plan = []
+    for Type in obType:
+        handlers = format_handlers.get(Type, {})
+        for ii, token in enumerate(Signature):
+            if token is not None and token.strip() in handlers:
+                plan.append((ii, handlers[token.strip()]))
+    return plan
+
+
+# ==============================================================================
+# UNIT CONVERSION HANDLERS
+# ==============================================================================
+def convert(factor, token, offset=None):
+
+    """ Returns handler that scales the observation value and sets its unit
+    """
+
+    def handler(Obs, cObs, ii):
+        if Obs[ii - 1] is not None:
+            if offset is None:
+                cObs[ii - 1] = Obs[ii - 1] * factor
+            else:
+                cObs[ii - 1] = Obs[ii - 1] * factor + offset
+        cObs[ii] = token
+    return handler
+
+
+def relabel(token):
+
+    """ Returns handler that leaves the observation value unchanged and sets its
+    unit
+    """
+
+    def handler(Obs, cObs, ii):
+        cObs[ii] = token
+    return handler
+
+
+def beaufort(Obs, cObs, ii):
+    if Obs[ii - 1] is not None:
+        cObs[ii - 1] = derive.beaufort_scale(Obs[ii - 1:ii + 1])[2]
+    cObs[ii] = 'bft'
+
+
+def direction(cardinal):
+
+    """ Returns handler that converts wind direction observations
+    """
+
+    def handler(Obs, cObs, ii):
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+            cObs[ii] = ''
+        elif cObs[ii - 1] == 'calm':
+            cObs[ii - 1] = 'Calm'
+            cObs[ii] = ''
+        elif cardinal:
+            cObs[ii - 1] = derive.cardinal_wind_dir(Obs[ii - 1:ii + 1])[2]
+            cObs[ii] = ''
+        else:
+            cObs[ii] = 'degrees'
+    return handler
+
+
+# Define unit conversion handlers for each required output unit and
+# observation unit
+unit_handlers = {
+    'f':        {'c':     convert(9 / 5, 'f', 32),
+                 'dc':    convert(9 / 5, 'f'),
+                 'c/hr':  convert(9 / 5, 'f/hr')},
+    'c':        {'c':     relabel('c'),
+                 'dc':    relabel('c')},
+    'inhg':     {'mb':    convert(0.0295301, ' inHg'),
+                 'mb/hr': convert(0.0295301, ' inHg/hr')},
+    'mmhg':     {'mb':    convert(0.750063, ' mmHg'),
+                 'mb/hr': convert(0.750063, ' mmHg/hr')},
+    'hpa':      {'mb':    relabel(' hPa'),
+                 'mb/hr': relabel(' hPa/hr')},
+    'mb':       {'mb':    relabel(' mb'),
+                 'mb/hr': relabel(' mb/hr')},
+    'mph':      {'mps':   convert(2.2369362920544, 'mph')},
+    'lfm':      {'mps':   convert(2.2369362920544, 'mph')},
+    'kts':      {'mps':   convert(1.9438, 'kts')},
+    'kph':      {'mps':   convert(3.6, 'km/h')},
+    'bft':      {'mps':   beaufort},
+    'mps':      {'mps':   relabel('m/s')},
+    'degrees':  {'degrees': direction(cardinal=False)},
+    'cardinal': {'degrees': direction(cardinal=True)},
+    'in':       {'mm':    convert(0.0393701, ' in'),
+                 'mm/hr': convert(0.0393701, ' in/hr')},
+    'cm':       {'mm':    convert(0.1, ' cm'),
+                 'mm/hr': convert(0.1, ' cm/hr')},
+    'mm':       {'mm':    relabel(' mm'),
+                 'mm/hr': relabel(' mm/hr')},
+    'mi':       {'km':    convert(0.62137, 'miles')},
+}
+
+
+def unit_handler(token, Unit):
+
+    """ Returns the handler that converts an observation unit into the required
+    output unit. None if no conversion is required
+    """
+
+    return unit_handlers.get(Unit, {}).get(token)
+
+
+# ==============================================================================
+# DISPLAY FORMAT HANDLERS
+# ==============================================================================
+def fixed(Format, absZero=None):
+
+    """ Returns handler that formats the observation value using the specified
+    format string. If absZero is set, values that round to zero at absZero
+    decimal places are formatted without a sign
+    """
+
+    def handler(cObs, ii, config):
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+        elif absZero is not None and round(cObs[ii - 1], absZero) == 0.0:
+            cObs[ii - 1] = Format.format(abs(cObs[ii - 1]))
+        else:
+            cObs[ii - 1] = Format.format(cObs[ii - 1])
+        return cObs
+    return handler
+
+
+def temperature(Format, symbol, absFormat=None):
+
+    """ Returns handler that formats temperature observations
+    """
+
+    absFormat = absFormat or Format
+
+    def handler(cObs, ii, config):
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+        elif round(cObs[ii - 1], 1) == 0.0:
+            cObs[ii - 1] = absFormat.format(abs(cObs[ii - 1]))
+        else:
+            cObs[ii - 1] = Format.format(cObs[ii - 1])
+        cObs[ii] = symbol
+        return cObs
+    return handler
+
+
+def wind_speed(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    else:
+        if round(cObs[ii - 1], 1) < 10:
+            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+        else:
+            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    return cObs
+
+
+def wind_direction(cObs, ii, config):
+    cObs[ii] = u'\u00B0'
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    else:
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    return cObs
+
+
+def precip(trace, fine, symbol=None):
+
+    """ Returns handler that formats rain accumulation observations. Values
+    below trace are shown as 'Trace'. If fine is set, values are shown to two
+    decimal places below 10 and one decimal place below 100, otherwise to one
+    decimal place below 10
+    """
+
+    def handler(cObs, ii, config):
+        if symbol is not None:
+            cObs[ii] = symbol
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+        else:
+            if cObs[ii - 1] == 0:
+                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+            elif cObs[ii - 1] < trace:
+                cObs[ii - 1] = 'Trace'
+                cObs[ii] = ''
+            elif not fine:
+                if round(cObs[ii - 1], 1) < 10:
+                    cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+                else:
+                    cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+            elif round(cObs[ii - 1], 2) < 10:
+                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
+            elif round(cObs[ii - 1], 1) < 100:
+                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+            else:
+                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+        return cObs
+    return handler
+
+
+def precip_rate_mm(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    else:
+        if cObs[ii - 1] == 0:
+            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+        elif cObs[ii - 1] < 0.1:
+            cObs[ii - 1] = '<0.1'
+        elif round(cObs[ii - 1], 1) < 10:
+            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+        else:
+            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    return cObs
+
+
+def precip_rate(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    else:
+        if cObs[ii - 1] == 0:
+            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+        elif cObs[ii - 1] < 0.01:
+            cObs[ii - 1] = '<0.01'
+        elif round(cObs[ii - 1], 2) < 10:
+            cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
+        elif round(cObs[ii - 1], 1) < 100:
+            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+        else:
+            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    return cObs
+
+
+def radiation(cObs, ii, config):
+    cObs[ii] = ' W/m' + u'\u00B2'
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    else:
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    return cObs
+
+
+def uv_index(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+        cObs.extend(['-', '#646464'])
+    else:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+    return cObs
+
+
+def strike_count(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    elif cObs[ii - 1] < 1000:
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    else:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1] / 1000) + ' k'
+    return cObs
+
+
+def strike_distance(offset):
+
+    """ Returns handler that formats lightning strike distance observations
+    """
+
+    def handler(cObs, ii, config):
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+        else:
+            cObs[ii - 1] = '{:.0f}'.format(max(cObs[ii - 1] - offset, 0)) + '-' +  '{:.0f}'.format(cObs[ii - 1] + offset)
+        return cObs
+    return handler
+
+
+def strike_frequency(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    elif cObs[ii - 1].is_integer():
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    else:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+    cObs[ii] = ' /min'
+    return cObs
+
+
+def time_of_day(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    else:
+        Tz = config.timezone
+        if config.time_format == '12 hr':
+            if config.hardware == 'Other':
+                Format = '%#I:%M %p'
+            else:
+                Format = '%-I:%M %p'
+        else:
+            Format = '%H:%M'
+        cObs[ii - 1] = datetime.fromtimestamp(cObs[ii - 1], Tz).strftime(Format)
+    return cObs
+
+
+def time_delta(cObs, ii, config):
+    if cObs[ii - 1] is None:
+        return ['-', '-', '-', '-', cObs[2]]
+    days, remainder  = divmod(cObs[ii - 1], 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if days >= 1:
+        if days <= 99:
+            return ['{:.0f}'.format(days), 'day' if days == 1 else 'days', '{:.0f}'.format(hours), 'hour' if hours == 1 else 'hours', cObs[2]]
+        return ['{:.0f}'.format(days), 'days', '-', '-', cObs[2]]
+    elif hours >= 1:
+        return ['{:.0f}'.format(hours), 'hour' if hours == 1 else 'hours', '{:.0f}'.format(minutes), 'min' if minutes == 1 else 'mins', cObs[2]]
+    elif minutes == 0:
+        return ['< 1', 'minute', '-', '-', cObs[2]]
+    elif minutes == 1:
+        return ['{:.0f}'.format(minutes), 'minute', '-', '-', cObs[2]]
+    return ['{:.0f}'.format(minutes), 'minutes', '-', '-', cObs[2]]
+
+
+# Define display format handlers for each observation type and unit
+format_handlers = {
+    'Temp':            {'c':       temperature('{:.1f}',  u'\N{DEGREE CELSIUS}'),
+                        'f':       temperature('{:.1f}',  u'\N{DEGREE FAHRENHEIT}'),
+                        'c/hr':    temperature('{:+.1f}', u'\N{DEGREE CELSIUS}/hr',    '{:.1f}'),
+                        'f/hr':    temperature('{:+.1f}', u'\N{DEGREE FAHRENHEIT}/hr', '{:.1f}')},
+    'forecastTemp':    {'c':       temperature('{:.0f}',  u'\N{DEGREE CELSIUS}'),
+                        'f':       temperature('{:.0f}',  u'\N{DEGREE FAHRENHEIT}')},
+    'Pressure':        {'inHg/hr': fixed('{:.3f}', 3), 'inHg': fixed('{:.3f}', 3),
+                        'mmHg/hr': fixed('{:.2f}', 2), 'mmHg': fixed('{:.2f}', 2),
+                        'hPa/hr':  fixed('{:.1f}', 1), 'hPa':  fixed('{:.1f}', 1),
+                        'mb/hr':   fixed('{:.1f}', 1), 'mb':   fixed('{:.1f}', 1)},
+    'Wind':            {unit: wind_speed for unit in ['mph', 'kts', 'km/h', 'bft', 'm/s']},
+    'forecastWind':    {unit: fixed('{:.0f}') for unit in ['mph', 'kts', 'km/h', 'bft', 'm/s']},
+    'Direction':       {'degrees': wind_direction},
+    'Precip':          {'mm':      precip(0.127,  fine=False),
+                        'cm':      precip(0.0127, fine=True),
+                        'in':      precip(0.005,  fine=True, symbol=u'\u0022'),
+                        'mm/hr':   precip_rate_mm,
+                        'in/hr':   precip_rate,
+                        'cm/hr':   precip_rate},
+    'Humidity':        {'%':       fixed('{:.0f}')},
+    'Radiation':       {'Wm2':     radiation},
+    'UV':              {'index':   uv_index},
+    'peakSun':         {'hrs':     fixed('{:.2f}')},
+    'Battery':         {'v':       fixed('{:.2f}')},
+    'StrikeCount':     {'count':   strike_count},
+    'StrikeDistance':  {'km':      strike_distance(3),
+                        'miles':   strike_distance(3 * 0.62137)},
+    'StrikeFrequency': {'/min':    strike_frequency},
+    'Time':            {'s':       time_of_day},
+    'TimeDelta':       {'s':       time_delta},
+}
+
+
+# ==============================================================================
+# UNIT CONVERSION AND DISPLAY FORMAT FUNCTIONS
+# ==============================================================================
 def units(Obs, Unit):
 
     """ Sets the required observation units
@@ -33,158 +476,16 @@ def units(Obs, Unit):
         cObs            Observation converted into required unit
     """
 
-    # Convert temperature observations
+    # Get compiled unit conversion plan for observation signature
+    Signature = signature(Obs)
+    plan = unit_plans.get((Signature, Unit))
+    if plan is None:
+        plan = store_plan(unit_plans, (Signature, Unit), compile_units(Signature, Unit))
+
+    # Convert observations
     cObs = Obs[:]
-    if Unit in ['f', 'c']:
-        for ii, T in enumerate(Obs):
-            if T == 'c':
-                if Unit == 'f':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * (9 / 5) + 32
-                    cObs[ii] = 'f'
-                else:
-                    cObs[ii - 1] = Obs[ii - 1]
-                    cObs[ii] = 'c'
-            if T in ['dc', 'c/hr']:
-                if Unit == 'f':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * (9 / 5)
-                    if T == 'dc':
-                        cObs[ii] = 'f'
-                    elif T == 'c/hr':
-                        cObs[ii] = 'f/hr'
-                else:
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if T == 'dc':
-                        cObs[ii] = 'c'
-
-    # Convert pressure and pressure trend observations
-    elif Unit in ['inhg', 'mmhg', 'hpa', 'mb']:
-        for ii, P in enumerate(Obs):
-            if P in ['mb', 'mb/hr']:
-                if Unit == 'inhg':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.0295301
-                    if P == 'mb':
-                        cObs[ii] = ' inHg'
-                    else:
-                        cObs[ii] = ' inHg/hr'
-                elif Unit == 'mmhg':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.750063
-                    if P == 'mb':
-                        cObs[ii] = ' mmHg'
-                    else:
-                        cObs[ii] = ' mmHg/hr'
-                elif Unit == 'hpa':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if P == 'mb':
-                        cObs[ii] = ' hPa'
-                    else:
-                        cObs[ii] = ' hPa/hr'
-                else:
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if P == 'mb':
-                        cObs[ii] = ' mb'
-                    else:
-                        cObs[ii] = ' mb/hr'
-
-    # Convert windspeed observations
-    elif Unit in ['mph', 'lfm', 'kts', 'kph', 'bft', 'mps']:
-        for ii, W in enumerate(Obs):
-            if W == 'mps':
-                if Unit == 'mph' or Unit == 'lfm':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 2.2369362920544
-                    cObs[ii] = 'mph'
-                elif Unit == 'kts':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 1.9438
-                    cObs[ii] = 'kts'
-                elif Unit == 'kph':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 3.6
-                    cObs[ii] = 'km/h'
-                elif Unit == 'bft':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = derive.beaufort_scale(Obs[ii - 1:ii + 1])[2]
-                    cObs[ii] = 'bft'
-                else:
-                    cObs[ii - 1] = Obs[ii - 1]
-                    cObs[ii] = 'm/s'
-
-    # Convert wind direction observations
-    elif Unit in ['degrees', 'cardinal']:
-        for ii, W in enumerate(Obs):
-            if W == 'degrees':
-                if cObs[ii - 1] is None:
-                    cObs[ii - 1] = '-'
-                    cObs[ii] = ''
-                elif cObs[ii - 1] == 'calm':
-                    cObs[ii - 1] = 'Calm'
-                    cObs[ii] = ''
-                elif Unit == 'cardinal':
-                    cObs[ii - 1] = derive.cardinal_wind_dir(Obs[ii - 1:ii + 1])[2]
-                    cObs[ii] = ''
-                else:
-                    cObs[ii - 1] = Obs[ii - 1]
-                    cObs[ii] = 'degrees'
-
-    # Convert rain accumulation and rain rate observations
-    elif Unit in ['in', 'cm', 'mm']:
-        for ii, Prcp in enumerate(Obs):
-            if Prcp in ['mm', 'mm/hr']:
-                if Unit == 'in':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.0393701
-                    if Prcp == 'mm':
-                        cObs[ii] = ' in'
-                    else:
-                        cObs[ii] = ' in/hr'
-                elif Unit == 'cm':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.1
-                    if Prcp == 'mm':
-                        cObs[ii] = ' cm'
-                    else:
-                        cObs[ii] = ' cm/hr'
-                else:
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if Prcp == 'mm':
-                        cObs[ii] = ' mm'
-                    else:
-                        cObs[ii] = ' mm/hr'
-
-    # Convert distance observations
-    elif Unit in ['km', 'mi']:
-        for ii, Dist in enumerate(Obs):
-            if Dist == 'km':
-                if Unit == 'mi':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.62137
-                    cObs[ii] = 'miles'
-
-    # Convert other observations
-    elif Unit in ['metric', 'imperial']:
-        for ii, other in enumerate(Obs):
-            if other == 'Wm2':
-                pass
-            elif other == 'index':
-                pass
-            elif other == 'hrs':
-                pass
-            elif other == '/min':
-                pass
-            elif other == 'count':
-                pass
-            elif other == 's':
-                pass
-            elif other == '%':
-                pass
+    for ii, handler in plan:
+        handler(Obs, cObs, ii)
 
     # Return converted observations
     return cObs
@@ -202,324 +503,22 @@ def format(Obs, obType, config=[]):
         cObs            Formatted observation based on specified obType
     """
 
-    # Convert obType to list if required
-    if not isinstance(obType, list):
-        obType = [obType]
+    # Convert obType to tuple if required
+    if isinstance(obType, list):
+        obType = tuple(obType)
+    elif not isinstance(obType, tuple):
+        obType = (obType,)
+
+    # Get compiled display format plan for observation signature
+    Signature = signature(Obs)
+    plan = format_plans.get((Signature, obType))
+    if plan is None:
+        plan = store_plan(format_plans, (Signature, obType), compile_format(Signature, obType))
 
-    # Format temperature observations
+    # Format observations
     cObs = Obs[:]
-    for Type in obType:
-        if Type == 'Temp':
-            for ii, T in enumerate(Obs):
-                if isinstance(T, str) and T.strip() in ['c', 'f']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif round(cObs[ii - 1], 1) == 0.0:
-                        cObs[ii - 1] = '{:.1f}'.format(abs(cObs[ii - 1]))
-                    else:
-                        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                    if T.strip() == 'c':
-                        cObs[ii] = u'\N{DEGREE CELSIUS}'
-                    elif T.strip() == 'f':
-                        cObs[ii] = u'\N{DEGREE FAHRENHEIT}'
-                elif isinstance(T, str) and T.strip() in ['c/hr', 'f/hr']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif round(cObs[ii - 1], 1) == 0.0:
-                        cObs[ii - 1] = '{:.1f}'.format(abs(cObs[ii - 1]))
-                    else:
-                        cObs[ii - 1] = '{:+.1f}'.format(cObs[ii - 1])
-                    if T.strip() == 'c/hr':
-                        cObs[ii] = u'\N{DEGREE CELSIUS}/hr'
-                    elif T.strip() == 'f/hr':
-                        cObs[ii] = u'\N{DEGREE FAHRENHEIT}/hr'
-        elif Type == 'forecastTemp':
-            for ii, T in enumerate(Obs):
-                if isinstance(T, str) and T.strip() in ['c', 'f']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif round(cObs[ii - 1], 1) == 0.0:
-                        cObs[ii - 1] = '{:.0f}'.format(abs(cObs[ii - 1]))
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    if T.strip() == 'c':
-                        cObs[ii] = u'\N{DEGREE CELSIUS}'
-                    elif T.strip() == 'f':
-                        cObs[ii] = u'\N{DEGREE FAHRENHEIT}'
-
-        # Format pressure observations
-        elif Type == 'Pressure':
-            for ii, P in enumerate(Obs):
-                if isinstance(P, str) and P.strip() in ['inHg/hr', 'inHg', 'mmHg/hr', 'mmHg', 'hPa/hr', 'mb/hr', 'hPa', 'mb']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        if P.strip() in ['inHg/hr', 'inHg']:
-                            if round(cObs[ii - 1], 3) == 0.0:
-                                cObs[ii - 1] = '{:.3f}'.format(abs(cObs[ii - 1]))
-                            else:
-                                cObs[ii - 1] = '{:.3f}'.format(cObs[ii - 1])
-                        elif P.strip() in ['mmHg/hr', 'mmHg']:
-                            if round(cObs[ii - 1], 2) == 0.0:
-                                cObs[ii - 1] = '{:.2f}'.format(abs(cObs[ii - 1]))
-                            else:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                        elif P.strip() in ['hPa/hr', 'mb/hr', 'hPa', 'mb']:
-                            if round(cObs[ii - 1], 1) == 0.0:
-                                cObs[ii - 1] = '{:.1f}'.format(abs(cObs[ii - 1]))
-                            else:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-
-        # Format windspeed observations
-        elif Type == 'Wind':
-            for ii, W in enumerate(Obs):
-                if isinstance(W, str) and W.strip() in ['mph', 'kts', 'km/h', 'bft', 'm/s']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        if round(cObs[ii - 1], 1) < 10:
-                            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                        else:
-                            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-        elif Type == 'forecastWind':
-            for ii, W in enumerate(Obs):
-                if isinstance(W, str) and W.strip() in ['mph', 'kts', 'km/h', 'bft', 'm/s']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format wind direction observations
-        elif Type == 'Direction':
-            for ii, D in enumerate(Obs):
-                if isinstance(D, str) and D.strip() in ['degrees']:
-                    cObs[ii] = u'\u00B0'
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format rain accumulation and rain rate observations
-        elif Type == 'Precip':
-            for ii, Prcp in enumerate(Obs):
-                if isinstance(Prcp, str):
-                    if Prcp.strip() == 'mm':
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.127:
-                                cObs[ii - 1] = 'Trace'
-                                cObs[ii] = ''
-                            elif round(cObs[ii - 1], 1) < 10:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() == 'cm':
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.0127:
-                                cObs[ii - 1] = 'Trace'
-                                cObs[ii] = ''
-                            elif round(cObs[ii - 1], 2) < 10:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                            elif round(cObs[ii - 1], 1) < 100:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() == 'in':
-                        cObs[ii] = u'\u0022'
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.005:
-                                cObs[ii - 1] = 'Trace'
-                                cObs[ii] = ''
-                            elif round(cObs[ii - 1], 2) < 10:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                            elif round(cObs[ii - 1], 1) < 100:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() == 'mm/hr':
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.1:
-                                cObs[ii - 1] = '<0.1'
-                            elif round(cObs[ii - 1], 1) < 10:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() in ['in/hr', 'cm/hr']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.01:
-                                cObs[ii - 1] = '<0.01'
-                            elif round(cObs[ii - 1], 2) < 10:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                            elif round(cObs[ii - 1], 1) < 100:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format humidity observations
-        elif Type == 'Humidity':
-            for ii, H in enumerate(Obs):
-                if isinstance(H, str) and H.strip() == '%':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format solar radiation observations
-        elif Type == 'Radiation':
-            for ii, Rad in enumerate(Obs):
-                if isinstance(Rad, str) and Rad.strip() == 'Wm2':
-                    cObs[ii]   = ' W/m' + u'\u00B2'
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format UV observations
-        elif Type == 'UV':
-            for ii, UV in enumerate(Obs):
-                if isinstance(UV, str) and UV.strip() == 'index':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                        cObs.extend(['-', '#646464'])
-                    else:
-                        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-
-        # Format Peak Sun Hours observations
-        elif Type == 'peakSun':
-            for ii, psh in enumerate(Obs):
-                if isinstance(psh, str) and psh.strip() == 'hrs':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-
-        # Format battery voltage observations
-        elif Type == 'Battery':
-            for ii, V in enumerate(Obs):
-                if isinstance(V, str) and V.strip() == 'v':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-
-        # Format lightning strike count observations
-        elif Type == 'StrikeCount':
-            for ii, L in enumerate(Obs):
-                if isinstance(L, str) and L.strip() == 'count':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif cObs[ii - 1] < 1000:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    else:
-                        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1] / 1000) + ' k'
-
-        # Format lightning strike distance observations
-        elif Type == 'StrikeDistance':
-            for ii, StrikeDist in enumerate(Obs):
-                if isinstance(StrikeDist, str):
-                    if StrikeDist.strip() in ['km']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            cObs[ii - 1] = '{:.0f}'.format(max(cObs[ii - 1] - 3, 0)) + '-' +  '{:.0f}'.format(cObs[ii - 1] + 3)
-                    elif StrikeDist.strip() in ['miles']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            cObs[ii - 1] = '{:.0f}'.format(max(cObs[ii - 1] - 3 * 0.62137, 0)) + '-' +  '{:.0f}'.format(cObs[ii - 1] + 3 * 0.62137)
-
-        # Format lightning strike frequency observations
-        elif Type == 'StrikeFrequency':
-            for ii, StrikeFreq in enumerate(Obs):
-                if isinstance(StrikeFreq, str):
-                    if StrikeFreq.strip() in ['/min']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                            cObs[ii] = ' /min'
-                        elif cObs[ii - 1].is_integer():
-                            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            cObs[ii] = ' /min'
-                        else:
-                            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            cObs[ii] = ' /min'
-
-        # Format time difference observations
-        elif Type == 'Time':
-            for ii, Time in enumerate(Obs):
-                if isinstance(Time, str) and Time.strip() in ['s']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        Tz = pytz.timezone(config['Station']['Timezone'])
-                        if config['Display']['TimeFormat'] == '12 hr':
-                            if config['System']['Hardware'] == 'Other':
-                                Format = '%#I:%M %p'
-                            else:
-                                Format = '%-I:%M %p'
-                        else:
-                            Format = '%H:%M'
-                        cObs[ii - 1] = datetime.fromtimestamp(cObs[ii - 1], Tz).strftime(Format)
-
-        # Format time difference observations
-        elif Type == 'TimeDelta':
-            for ii, Delta in enumerate(Obs):
-                if isinstance(Delta, str) and Delta.strip() in ['s']:
-                    if cObs[ii - 1] is None:
-                        cObs = ['-', '-', '-', '-', cObs[2]]
-                    else:
-                        days, remainder  = divmod(cObs[ii - 1], 86400)
-                        hours, remainder = divmod(remainder, 3600)
-                        minutes, seconds = divmod(remainder, 60)
-                        if days >= 1:
-                            if days == 1:
-                                if hours == 1:
-                                    cObs = ['{:.0f}'.format(days), 'day', '{:.0f}'.format(hours), 'hour', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(days), 'day', '{:.0f}'.format(hours), 'hours', cObs[2]]
-                            elif days <= 99:
-                                if hours == 1:
-                                    cObs = ['{:.0f}'.format(days), 'days', '{:.0f}'.format(hours), 'hour', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(days), 'days', '{:.0f}'.format(hours), 'hours', cObs[2]]
-                            elif days >= 100:
-                                cObs = ['{:.0f}'.format(days), 'days', '-', '-', cObs[2]]
-                        elif hours >= 1:
-                            if hours == 1:
-                                if minutes == 1:
-                                    cObs = ['{:.0f}'.format(hours), 'hour', '{:.0f}'.format(minutes), 'min', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(hours), 'hour', '{:.0f}'.format(minutes), 'mins', cObs[2]]
-                            elif hours > 1:
-                                if minutes == 1:
-                                    cObs = ['{:.0f}'.format(hours), 'hours', '{:.0f}'.format(minutes), 'min', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(hours), 'hours', '{:.0f}'.format(minutes), 'mins', cObs[2]]
-                        else:
-                            if minutes == 0:
-                                cObs = ['< 1', 'minute', '-', '-', cObs[2]]
-                            elif minutes == 1:
-                                cObs = ['{:.0f}'.format(minutes), 'minute', '-', '-', cObs[2]]
-                            else:
-                                cObs = ['{:.0f}'.format(minutes), 'minutes', '-', '-', cObs[2]]
+    for ii, handler in plan:
+        cObs = handler(cObs, ii, config)
 
     # Return formatted observations
     return cObs
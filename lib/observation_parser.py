@@ -18,15 +18,23 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 # Import required library modules
 from lib.request_api import weatherflow_api
 from lib.system      import system
+from lib.derivation_graph import derivation_graph
 from lib             import derived_variables  as derive
 from lib             import observation_format as observation
 from lib             import properties
+from lib             import persistence
+from lib.ring_buffer import rolling_mean
 
 # Import required Kivy modules
 from kivy.logger  import Logger
-from kivy.clock   import mainthread
 from kivy.app     import App
 
+# Import required Python modules
+from datetime     import datetime
+import threading
+import time
+import pytz
+
 # Define empty deviceObs dictionary
 device_obs = {'obTime':       [None, 's'],                'pressure':     [None, 'mb'],              'outTemp':      [None, 'c'],
               'inTemp':       [None, 'c'],                'humidity':     [None, '%'],               'windSpd':      [None, 'mps'],
@@ -44,7 +52,7 @@ derive_obs = {'dewPoint':     [None, 'c'],                  'feelsLike':    [Non
               'windSpd':      [None, 'mps', '-', '-', '-'], 'windAvg':      [None, 'mps'],                'gustMax':      [None, 'mps'],
               'windDir':      [None, 'degrees', '-', '-'],  'rapidWindDir': [None, 'degrees', '-', '-'],  'rainRate':     [None, 'mm/hr', '-'],
               'uvIndex':      [None, 'index'],              'peakSun':      [None, 'hrs', '-'],           'strikeDeltaT': [None, 's', None],
-              'strikeFreq':   [None, '/min', None, '/min'],
+              'strikeFreq':   [None, '/min', None, '/min'], 'windAvg2m':    [None, 'mps'],                'windAvg10m':   [None, 'mps'],
               'strikeCount':  {'today': [None, 'count'],
                                'month': [None, 'count'],
                                'year':  [None, 'count']
@@ -56,6 +64,11 @@ derive_obs = {'dewPoint':     [None, 'c'],                  'feelsLike':    [Non
                                }
               }
 
+# Define derived variables that accumulate running state between observations
+# and are persisted across restarts
+state_keys = ['outTempMax', 'outTempMin', 'inTempMax', 'inTempMin', 'SLPMax', 'SLPMin',
+              'windAvg', 'gustMax', 'peakSun', 'strikeCount', 'rainAccum']
+
 
 # =============================================================================
 # DEFINE 'obsParser' CLASS
@@ -66,6 +79,8 @@ class obs_parser():
 
         # Define instance variables
         self.display_obs = properties.Obs()
+        self.pushed_obs  = {}
+        self.push_lock   = threading.Lock()
         self.api_data    = {}
         self.transmit    = 1
         self.flag_api    = [1, 1, 1, 1]
@@ -78,13 +93,159 @@ class obs_parser():
         self.device_obs = device_obs.copy()
         self.derive_obs = derive_obs.copy()
 
+        # Define rolling wind speed means fed from rapid_wind observations when
+        # enabled in the display settings
+        self.rolling_wind = {'windAvg2m':  rolling_mean(120, 3),
+                             'windAvg10m': rolling_mean(600, 3)}
+
+        # Define derived variables dependency graph
+        self.derived_graph = derivation_graph(self.resolve_input)
+        self.api_keys      = {}
+        self.define_derived_nodes()
+        self.changed_obs = set()
+
+        # Restore running state of derived variables saved before the console
+        # was last stopped. When REST API services are enabled, the state is
+        # only restored if no observation can have been missed since it was
+        # saved, which is one reporting interval after the last observation
+        self.state_file     = persistence.cache_file('derive_obs.json')
+        self.state_interval = 300
+        self.state_max_gap  = 60
+        self.state_saved    = time.time()
+        self.load_state(self.app.config_snapshot)
+
+    def define_derived_nodes(self):
+
+        """ Declare each derived variable as a node in the dependency graph,
+        together with the inputs it is calculated from and the device types that
+        trigger it. Nodes that accumulate state between observations or depend
+        on the current time take the latest 'message' as an input so that they
+        are evaluated for every new observation
+        """
+
+        # Define device types that share derived variables
+        out_air_st = ('obs_out_air', 'obs_st')
+        sky_st     = ('obs_sky', 'obs_st')
+
+        # Define derived variables from available obs_out_air and obs_st
+        # observations
+        graph = self.derived_graph
+        graph.add_node('feelsLike',    out_air_st, ['obs:outTemp', 'obs:humidity', 'obs:windSpd'],
+                       lambda device, config: derive.feels_like(self.device_obs['outTemp'], self.device_obs['humidity'], self.device_obs['windSpd'], config))
+        graph.add_node('dewPoint',     out_air_st, ['obs:outTemp', 'obs:humidity'],
+                       lambda device, config: derive.dew_point(self.device_obs['outTemp'], self.device_obs['humidity']))
+        graph.add_node('outTempDiff',  out_air_st, ['obs:outTemp', 'api:24Hrs'],
+                       lambda device, config: derive.temp_diff(self.device_obs['outTemp'], self.device_obs['obTime'], device, self.api_data, config))
+        graph.add_node('outTempTrend', out_air_st, ['obs:outTemp', 'api:24Hrs'],
+                       lambda device, config: derive.temp_trend(self.device_obs['outTemp'], self.device_obs['obTime'], device, self.api_data, config))
+        graph.add_node('outTempMax',   out_air_st, ['obs:outTemp', 'message'],
+                       lambda device, config: derive.temp_max(self.device_obs['outTemp'], self.device_obs['obTime'], self.derive_obs['outTempMax'], device, self.api_data, config))
+        graph.add_node('outTempMin',   out_air_st, ['obs:outTemp', 'message'],
+                       lambda device, config: derive.temp_min(self.device_obs['outTemp'], self.device_obs['obTime'], self.derive_obs['outTempMin'], device, self.api_data, config))
+        graph.add_node('SLP',          out_air_st, ['obs:pressure'],
+                       lambda device, config: derive.SLP(self.device_obs['pressure'], device, config))
+        graph.add_node('SLPTrend',     out_air_st, ['obs:pressure', 'api:24Hrs'],
+                       lambda device, config: derive.SLP_trend(self.device_obs['pressure'], self.device_obs['obTime'], device, self.api_data, config))
+        graph.add_node('SLPMax',       out_air_st, ['obs:pressure', 'message'],
+                       lambda device, config: derive.SLP_max(self.device_obs['pressure'], self.device_obs['obTime'], self.derive_obs['SLPMax'], device, self.api_data, config))
+        graph.add_node('SLPMin',       out_air_st, ['obs:pressure', 'message'],
+                       lambda device, config: derive.SLP_min(self.device_obs['pressure'], self.device_obs['obTime'], self.derive_obs['SLPMin'], device, self.api_data, config))
+        graph.add_node('strikeCount',  out_air_st, ['obs:strikeMinute', 'message'],
+                       lambda device, config: derive.strike_count(self.device_obs['strikeMinute'], self.derive_obs['strikeCount'], device, self.api_data, config))
+        graph.add_node('strikeFreq',   out_air_st, ['api:24Hrs'],
+                       lambda device, config: derive.strike_frequency(self.device_obs['obTime'], device, self.api_data, config))
+        graph.add_node('strikeDeltaT', out_air_st + ('evt_strike',), ['obs:strikeTime', 'message'],
+                       lambda device, config: derive.strike_delta_t(self.device_obs['strikeTime'], config))
+
+        # Define derived variables from available obs_sky and obs_st
+        # observations
+        graph.add_node('uvIndex',      sky_st, ['obs:uvIndex'],
+                       lambda device, config: derive.uv_index(self.device_obs['uvIndex']))
+        graph.add_node('peakSun',      sky_st, ['obs:radiation', 'message'],
+                       lambda device, config: derive.peak_sun_hours(self.device_obs['radiation'], self.derive_obs['peakSun'], device, self.api_data, config))
+        graph.add_node('windSpd',      sky_st, ['obs:windSpd'],
+                       lambda device, config: derive.beaufort_scale(self.device_obs['windSpd']))
+        graph.add_node('windDir',      sky_st, ['obs:windDir', 'obs:windSpd'],
+                       lambda device, config: derive.cardinal_wind_dir(self.device_obs['windDir'], self.device_obs['windSpd']))
+        graph.add_node('windAvg',      sky_st, ['obs:windSpd', 'message'],
+                       lambda device, config: derive.avg_wind_speed(self.device_obs['windSpd'], self.device_obs['obTime'], self.derive_obs['windAvg'], device, self.api_data, config))
+        graph.add_node('gustMax',      sky_st, ['obs:windGust', 'message'],
+                       lambda device, config: derive.max_wind_gust(self.device_obs['windGust'], self.derive_obs['gustMax'], device, self.api_data, config))
+        graph.add_node('rainRate',     sky_st, ['obs:minuteRain'],
+                       lambda device, config: derive.rain_rate(self.device_obs['minuteRain']))
+        graph.add_node('rainAccum',    sky_st, ['obs:minuteRain', 'obs:dailyRain', 'message'],
+                       lambda device, config: derive.rain_accumulation(self.device_obs['minuteRain'], self.device_obs['dailyRain'], self.derive_obs['rainAccum'], device, self.api_data, config))
+
+        # Define derived variables from available obs_in_air observations
+        graph.add_node('inTempMax',    ('obs_in_air',), ['obs:inTemp', 'message'],
+                       lambda device, config: derive.temp_max(self.device_obs['inTemp'], self.device_obs['obTime'], self.derive_obs['inTempMax'], device, self.api_data, config))
+        graph.add_node('inTempMin',    ('obs_in_air',), ['obs:inTemp', 'message'],
+                       lambda device, config: derive.temp_min(self.device_obs['inTemp'], self.device_obs['obTime'], self.derive_obs['inTempMin'], device, self.api_data, config))
+
+        # Define derived variables from available rapid_wind observations
+        graph.add_node('rapidWindDir', ('rapid_wind',), ['obs:rapidWindDir', 'obs:rapidWindSpd'],
+                       lambda device, config: derive.cardinal_wind_dir(self.device_obs['rapidWindDir'], self.device_obs['rapidWindSpd']))
+        graph.add_node('windAvg2m',    ('rapid_wind',), ['obs:rapidWindSpd', 'message'],
+                       lambda device, config: derive.rolling_wind_speed(self.device_obs['rapidWindSpd'], self.rolling_wind['windAvg2m'], self.display_obs['rapid_wind']['ob'][0]) if config.rolling_wind else [None, 'mps'])
+        graph.add_node('windAvg10m',   ('rapid_wind',), ['obs:rapidWindSpd', 'message'],
+                       lambda device, config: derive.rolling_wind_speed(self.device_obs['rapidWindSpd'], self.rolling_wind['windAvg10m'], self.display_obs['rapid_wind']['ob'][0]) if config.rolling_wind else [None, 'mps'])
+
+    def resolve_input(self, name, device, device_type):
+
+        """ Return the current value of a derived variable input
+
+        INPUTS:
+            name                Input name. Either a device observation
+                                ('obs:<key>'), a WeatherFlow API response
+                                ('api:<key>') or the latest message ('message')
+            device              Device ID
+            device_type         Device type
+
+        OUTPUT:
+            value               Current value of input
+        """
+
+        if name == 'message':
+            return self.display_obs.get(device_type)
+        elif name.startswith('api:'):
+            return self.api_key(self.api_data.get(device, {}).get(name[4:]))
+        else:
+            return self.device_obs[name[4:]]
+
+    def api_key(self, response):
+
+        """ Return a key that identifies the observations held in a WeatherFlow
+        API response. A new response object is requested for every message, so
+        the time of the last observation it holds is used to determine whether
+        the data has changed
+
+        INPUTS:
+            response            WeatherFlow API response
+
+        OUTPUT:
+            key                 Time of last observation in response, or None
+                                if the response holds no observations
+        """
+
+        if response is None:
+            return None
+        cached = self.api_keys
+        if cached.get('response') is response:
+            return cached['key']
+        key = None
+        if weatherflow_api.verify_response(response, 'obs'):
+            obs = response.json()['obs']
+            key = obs[-1][0] if obs else None
+        self.api_keys = {'response': response, 'key': key}
+        return key
+
     def parse_obs_st(self, message, config):
 
         """ Parse obs_st Websocket messages from TEMPEST module
 
         INPUTS:
             message             obs_sky Websocket message
-            config              Console configuration object
+            config              Console configuration snapshot
         """
 
         # Extract latest TEMPEST Websocket JSON
@@ -98,8 +259,8 @@ class obs_parser():
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
-        if int(config['System']['rest_api']) and config['Station']['TempestID']:
-            api_device_id = config['Station']['TempestID']
+        if config.rest_api and config.tempest_id:
+            api_device_id = config.tempest_id
             self.api_data[device_id] = {'flagAPI': self.flag_api[0]}
 
         # Discard duplicate TEMPEST Websocket messages
@@ -130,7 +291,7 @@ class obs_parser():
             self.device_obs['strike3hr']  = [message['summary']['strike_count_3h']   if 'strike_count_3h'   in message['summary'] else None, 'count']
 
         # Request required TEMPEST data from the WeatherFlow API
-        if int(config['System']['rest_api']) and config['Station']['TempestID']:
+        if config.rest_api and config.tempest_id:
             self.api_data[device_id]['24Hrs'] = weatherflow_api.last_24h(api_device_id, latest_ob[0], config)
             if self.api_data[device_id]['flagAPI']:
                 if (self.derive_obs['SLPMin'][0] is None
@@ -148,13 +309,13 @@ class obs_parser():
                 if (self.derive_obs['rainAccum']['month'][0] is None
                     or self.derive_obs['strikeCount']['month'][0] is None):
                     self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
-                if int(config['System']['stats_endpoint']):
+                if config.stats_endpoint:
                     if (self.derive_obs['rainAccum']['month'][0] is None
                         or self.derive_obs['strikeCount']['month'][0] is None
                         or self.derive_obs['rainAccum']['year'][0] is None
                         or self.derive_obs['strikeCount']['year'][0] is None):
-                        self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config['Station']['StationID'], config)
-                elif not int(config['System']['stats_endpoint']):
+                        self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config.station_id, config)
+                elif not config.stats_endpoint:
                     if (self.derive_obs['rainAccum']['month'][0] is None
                         or self.derive_obs['strikeCount']['month'][0] is None):
                         self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
@@ -175,7 +336,7 @@ class obs_parser():
 
         INPUTS:
             message             obs_sky Websocket message
-            config              Console configuration object
+            config              Console configuration snapshot
         """
 
         # Extract latest SKY Websocket JSON
@@ -189,8 +350,8 @@ class obs_parser():
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
-        if int(config['System']['rest_api']) and config['Station']['SkyID']:
-            api_device_id = config['Station']['SkyID']
+        if config.rest_api and config.sky_id:
+            api_device_id = config.sky_id
             self.api_data[device_id] = {'flagAPI': self.flag_api[1]}
 
         # Discard duplicate SKY Websocket messages
@@ -209,7 +370,7 @@ class obs_parser():
             self.device_obs['dailyRain']  = [latest_ob[11], 'mm']
 
         # Request required SKY data from the WeatherFlow API
-        if int(config['System']['rest_api']) and config['Station']['SkyID']:
+        if config.rest_api and config.sky_id:
             if self.api_data[device_id]['flagAPI']:
                 if (self.derive_obs['windAvg'][0] is None
                     or self.derive_obs['gustMax'][0] is None
@@ -217,11 +378,11 @@ class obs_parser():
                     self.api_data[device_id]['today'] = weatherflow_api.today(api_device_id, config)
                 if self.derive_obs['rainAccum']['yesterday'][0] is None:
                     self.api_data[device_id]['yesterday'] = weatherflow_api.yesterday(api_device_id, config)
-                if int(config['System']['stats_endpoint']):
+                if config.stats_endpoint:
                     if (self.derive_obs['rainAccum']['month'][0] is None
                         or self.derive_obs['rainAccum']['year'][0] is None):
-                        self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config['Station']['StationID'], config)            
-                elif not int(config['System']['stats_endpoint']):
+                        self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config.station_id, config)            
+                elif not config.stats_endpoint:
                     if self.derive_obs['rainAccum']['month'][0] is None:
                         self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
                     if self.derive_obs['rainAccum']['year'][0] is None:
@@ -240,7 +401,7 @@ class obs_parser():
 
         INPUTS:
             message             obs_air Websocket message
-            config              Console configuration object
+            config              Console configuration snapshot
         """
 
         # Extract latest outdoor AIR Websocket JSON
@@ -254,8 +415,8 @@ class obs_parser():
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
-        if int(config['System']['rest_api']) and config['Station']['OutAirID']:
-            api_device_id = config['Station']['OutAirID']
+        if config.rest_api and config.out_air_id:
+            api_device_id = config.out_air_id
             self.api_data[device_id] = {'flagAPI': self.flag_api[2]}
 
         # Discard duplicate outdoor AIR Websocket messages
@@ -278,7 +439,7 @@ class obs_parser():
             self.device_obs['strike3hr']  = [message['summary']['strike_count_3h']   if 'strike_count_3h'   in message['summary'] else None, 'count']
 
         # Request required outdoor AIR data from the WeatherFlow API
-        if int(config['System']['rest_api']) and config['Station']['OutAirID']:
+        if config.rest_api and config.out_air_id:
             self.api_data[device_id]['24Hrs'] = weatherflow_api.last_24h(api_device_id, latest_ob[0], config)
             if self.api_data[device_id]['flagAPI']:
                 if (self.derive_obs['SLPMin'][0] is None
@@ -287,11 +448,11 @@ class obs_parser():
                     or self.derive_obs['outTempMax'][0] is None
                     or self.derive_obs['strikeCount']['today'][0] is None):
                     self.api_data[device_id]['today'] = weatherflow_api.today(api_device_id, config)
-                if int(config['System']['stats_endpoint']):
+                if config.stats_endpoint:
                     if (self.derive_obs['strikeCount']['month'][0] is None
                         or self.derive_obs['strikeCount']['year'][0] is None):
-                        self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config['Station']['StationID'], config)
-                elif not int(config['System']['stats_endpoint']):
+                        self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config.station_id, config)
+                elif not config.stats_endpoint:
                     if self.derive_obs['strikeCount']['month'][0] is None:
                         self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
                     if self.derive_obs['strikeCount']['year'][0] is None:
@@ -310,7 +471,7 @@ class obs_parser():
 
         INPUTS:
             message             obs_air Websocket message
-            config              Console configuration object
+            config              Console configuration snapshot
         """
 
         # Extract latest indoor AIR Websocket JSON
@@ -324,8 +485,8 @@ class obs_parser():
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
-        if int(config['System']['rest_api']) and config['Station']['InAirID']:
-            api_device_id = config['Station']['InAirID']
+        if config.rest_api and config.in_air_id:
+            api_device_id = config.in_air_id
             self.api_data[device_id] = {'flagAPI': self.flag_api[3]}
 
         # Discard duplicate indoor AIR Websocket messages
@@ -338,7 +499,7 @@ class obs_parser():
         self.device_obs['inTemp'] = [latest_ob[2], 'c']
 
         # Request required indoor AIR data from the WeatherFlow API
-        if int(config['System']['rest_api']) and config['Station']['InAirID']:
+        if config.rest_api and config.in_air_id:
             if (self.api_data[device_id]['flagAPI']
                     or self.derive_obs['inTempMin'][0] is None
                     or self.derive_obs['inTempMax'][0] is None):
@@ -358,7 +519,7 @@ class obs_parser():
         INPUTS:
             message             rapid_wind Websocket message received from
                                 SKY or TEMPEST module
-            config              Console configuration object
+            config              Console configuration snapshot
         """
 
         # Extract latest rapid_wind Websocket JSON
@@ -409,7 +570,7 @@ class obs_parser():
         INPUTS:
             message             evt_strike Websocket message received from
                                 AIR or TEMPEST module
-            config              Console configuration object
+            config              Console configuration snapshot
         """
 
         # Extract latest evt_strike Websocket JSON
@@ -445,116 +606,142 @@ class obs_parser():
 
         INPUTS:
             device              Device ID
-            config              Console configuration object
+            config              Console configuration snapshot
             device_type         Device type
         """
 
-        # Derive variables from available obs_out_air and obs_st observations
-        # Derive variables from available obs_out_air and obs_st observations
-        if device_type in ('obs_out_air', 'obs_st'):
-            self.derive_obs['feelsLike']    = derive.feels_like(self.device_obs['outTemp'], self.device_obs['humidity'], self.device_obs['windSpd'], config)
-            self.derive_obs['dewPoint']     = derive.dew_point(self.device_obs['outTemp'],  self.device_obs['humidity'])
-            self.derive_obs['outTempDiff']  = derive.temp_diff(self.device_obs['outTemp'],  self.device_obs['obTime'], device, self.api_data, config)
-            self.derive_obs['outTempTrend'] = derive.temp_trend(self.device_obs['outTemp'], self.device_obs['obTime'], device, self.api_data, config)
-            self.derive_obs['outTempMax']   = derive.temp_max(self.device_obs['outTemp'],   self.device_obs['obTime'], self.derive_obs['outTempMax'],   device, self.api_data, config)
-            self.derive_obs['outTempMin']   = derive.temp_min(self.device_obs['outTemp'],   self.device_obs['obTime'], self.derive_obs['outTempMin'],   device, self.api_data, config)
-            self.derive_obs['SLP']          = derive.SLP(self.device_obs['pressure'],      device, config)
-            self.derive_obs['SLPTrend']     = derive.SLP_trend(self.device_obs['pressure'], self.device_obs['obTime'], device, self.api_data, config)
-            self.derive_obs['SLPMax']       = derive.SLP_max(self.device_obs['pressure'],   self.device_obs['obTime'], self.derive_obs['SLPMax'], device, self.api_data, config)
-            self.derive_obs['SLPMin']       = derive.SLP_min(self.device_obs['pressure'],   self.device_obs['obTime'], self.derive_obs['SLPMin'], device, self.api_data, config)
-            self.derive_obs['strikeCount']  = derive.strike_count(self.device_obs['strikeMinute'], self.derive_obs['strikeCount'], device, self.api_data, config)
-            self.derive_obs['strikeFreq']   = derive.strike_frequency(self.device_obs['obTime'],   device, self.api_data, config)
-            self.derive_obs['strikeDeltaT'] = derive.strike_delta_t(self.device_obs['strikeTime'], config)
-
-        # Derive variables from available obs_sky and obs_st observations
-        if device_type in ('obs_sky', 'obs_st'):
-            self.derive_obs['uvIndex']   = derive.uv_index(self.device_obs['uvIndex'])
-            self.derive_obs['peakSun']   = derive.peak_sun_hours(self.device_obs['radiation'],  self.derive_obs['peakSun'], device, self.api_data, config)
-            self.derive_obs['windSpd']   = derive.beaufort_scale(self.device_obs['windSpd'])
-            self.derive_obs['windDir']   = derive.cardinal_wind_dir(self.device_obs['windDir'], self.device_obs['windSpd'])
-            self.derive_obs['windAvg']   = derive.avg_wind_speed(self.device_obs['windSpd'],    self.derive_obs['windAvg'], device, self.api_data, config)
-            self.derive_obs['gustMax']   = derive.max_wind_gust(self.device_obs['windGust'],    self.derive_obs['gustMax'], device, self.api_data, config)
-            self.derive_obs['rainRate']  = derive.rain_rate(self.device_obs['minuteRain'])
-            self.derive_obs['rainAccum'] = derive.rain_accumulation(self.device_obs['minuteRain'], self.device_obs['dailyRain'], self.derive_obs['rainAccum'], device, self.api_data, config)
-
-        # Derive variables from available obs_out_air and obs_st observations
-        if device_type == 'obs_in_air':
-            self.derive_obs['inTempMax']   = derive.temp_max(self.device_obs['inTemp'], self.device_obs['obTime'], self.derive_obs['inTempMax'], device, self.api_data, config)
-            self.derive_obs['inTempMin']   = derive.temp_min(self.device_obs['inTemp'], self.device_obs['obTime'], self.derive_obs['inTempMin'], device, self.api_data, config)
-
-        # Derive variables from available rapid_wind observations
-        if device_type == 'rapid_wind':
-            self.derive_obs['rapidWindDir'] = derive.cardinal_wind_dir(self.device_obs['rapidWindDir'], self.device_obs['rapidWindSpd'])
-
-        # Derive variables from available evt_strike observations
-        if device_type == 'evt_strike':
-            self.derive_obs['strikeDeltaT'] = derive.strike_delta_t(self.device_obs['strikeTime'], config)
+        # Recompute derived variables whose inputs have changed since the last
+        # observation and record which derived variables have changed
+        self.changed_obs = self.derived_graph.update(device, config, device_type, self.derive_obs)
+
+        # Periodically save running state of derived variables
+        if time.time() - self.state_saved >= self.state_interval:
+            self.save_state(config)
 
         # Format derived observations
         self.format_derived_variables(config, device_type)
 
+    def save_state(self, config):
+
+        """ Atomically save a snapshot of the running state of the derived
+        variables
+
+        INPUTS:
+            config              Console configuration snapshot
+        """
+
+        state = {'station':    config.station_id,
+                 'saved':      time.time(),
+                 'ob_time':    self.device_obs['obTime'][0],
+                 'derive_obs': {key: self.derive_obs[key] for key in state_keys}}
+        persistence.write_json(self.state_file, state)
+        self.state_saved = state['saved']
+
+    def load_state(self, config):
+
+        """ Restore the running state of the derived variables from the last
+        saved snapshot. The snapshot is discarded if it belongs to a different
+        station or was saved before the start of the current station day. When
+        REST API services are enabled, the snapshot is also discarded if its
+        last observation is more than state_max_gap seconds old, so that rain,
+        strikes and other accumulations since that observation are backfilled
+        from the WeatherFlow API
+
+        INPUTS:
+            config              Console configuration snapshot
+        """
+
+        # Read saved snapshot
+        state = persistence.read_json(self.state_file)
+        if not state:
+            return
+
+        # Validate snapshot against current station and station day
+        try:
+            Tz       = config.timezone
+            time_now = datetime.now(pytz.utc).astimezone(Tz)
+            saved    = datetime.fromtimestamp(state['saved'], Tz)
+            if str(state['station']) != config.station_id:
+                return
+            if saved > time_now or saved.date() != time_now.date():
+                Logger.info(f'obs_parser: {system().log_time()} - Discarding saved state from previous day')
+                return
+            if config.rest_api:
+                ob_time = state.get('ob_time')
+                if ob_time is None or time_now.timestamp() - ob_time > self.state_max_gap:
+                    Logger.info(f'obs_parser: {system().log_time()} - Discarding saved state and backfilling from REST API')
+                    return
+            for key in state_keys:
+                if key in state['derive_obs'] and isinstance(state['derive_obs'][key], type(derive_obs[key])):
+                    self.derive_obs[key] = state['derive_obs'][key]
+            Logger.info(f'obs_parser: {system().log_time()} - Restored saved state')
+        except Exception as error:
+            Logger.warning(f'obs_parser: {system().log_time()} - Unable to restore saved state: {error}')
+
     def format_derived_variables(self, config, device_type):
 
         """ Format derived variables from available device observations
 
         INPUTS:
-            config              Console configuration object
+            config              Console configuration snapshot
             device_type         Device type
         """
 
         # Convert derived variable units from obs_out_air and obs_st observations
         if device_type in ('obs_out_air', 'obs_st', 'obs_all'):
-            outTemp        = observation.units(self.device_obs['outTemp'],              config['Units']['Temp'])
-            feelsLike      = observation.units(self.derive_obs['feelsLike'],            config['Units']['Temp'])
-            dewPoint       = observation.units(self.derive_obs['dewPoint'],             config['Units']['Temp'])
-            outTempDiff    = observation.units(self.derive_obs['outTempDiff'],          config['Units']['Temp'])
-            outTempTrend   = observation.units(self.derive_obs['outTempTrend'],         config['Units']['Temp'])
-            outTempMax     = observation.units(self.derive_obs['outTempMax'],           config['Units']['Temp'])
-            outTempMin     = observation.units(self.derive_obs['outTempMin'],           config['Units']['Temp'])
-            humidity       = observation.units(self.device_obs['humidity'],             config['Units']['Other'])
-            SLP            = observation.units(self.derive_obs['SLP'],                  config['Units']['Pressure'])
-            SLPTrend       = observation.units(self.derive_obs['SLPTrend'],             config['Units']['Pressure'])
-            SLPMax         = observation.units(self.derive_obs['SLPMax'],               config['Units']['Pressure'])
-            SLPMin         = observation.units(self.derive_obs['SLPMin'],               config['Units']['Pressure'])
-            strikeDist     = observation.units(self.device_obs['strikeDist'],           config['Units']['Distance'])
-            strikeDeltaT   = observation.units(self.derive_obs['strikeDeltaT'],         config['Units']['Other'])
-            strikeFreq     = observation.units(self.derive_obs['strikeFreq'],           config['Units']['Other'])
-            strike3hr      = observation.units(self.device_obs['strike3hr'],            config['Units']['Other'])
-            strikeToday    = observation.units(self.derive_obs['strikeCount']['today'], config['Units']['Other'])
-            strikeMonth    = observation.units(self.derive_obs['strikeCount']['month'], config['Units']['Other'])
-            strikeYear     = observation.units(self.derive_obs['strikeCount']['year'],  config['Units']['Other'])
+            outTemp        = observation.units(self.device_obs['outTemp'],              config.units['Temp'])
+            feelsLike      = observation.units(self.derive_obs['feelsLike'],            config.units['Temp'])
+            dewPoint       = observation.units(self.derive_obs['dewPoint'],             config.units['Temp'])
+            outTempDiff    = observation.units(self.derive_obs['outTempDiff'],          config.units['Temp'])
+            outTempTrend   = observation.units(self.derive_obs['outTempTrend'],         config.units['Temp'])
+            outTempMax     = observation.units(self.derive_obs['outTempMax'],           config.units['Temp'])
+            outTempMin     = observation.units(self.derive_obs['outTempMin'],           config.units['Temp'])
+            humidity       = observation.units(self.device_obs['humidity'],             config.units['Other'])
+            SLP            = observation.units(self.derive_obs['SLP'],                  config.units['Pressure'])
+            SLPTrend       = observation.units(self.derive_obs['SLPTrend'],             config.units['Pressure'])
+            SLPMax         = observation.units(self.derive_obs['SLPMax'],               config.units['Pressure'])
+            SLPMin         = observation.units(self.derive_obs['SLPMin'],               config.units['Pressure'])
+            strikeDist     = observation.units(self.device_obs['strikeDist'],           config.units['Distance'])
+            strikeDeltaT   = observation.units(self.derive_obs['strikeDeltaT'],         config.units['Other'])
+            strikeFreq     = observation.units(self.derive_obs['strikeFreq'],           config.units['Other'])
+            strike3hr      = observation.units(self.device_obs['strike3hr'],            config.units['Other'])
+            strikeToday    = observation.units(self.derive_obs['strikeCount']['today'], config.units['Other'])
+            strikeMonth    = observation.units(self.derive_obs['strikeCount']['month'], config.units['Other'])
+            strikeYear     = observation.units(self.derive_obs['strikeCount']['year'],  config.units['Other'])
 
         # Convert derived variable units from obs_sky and obs_st observations
         if device_type in ('obs_sky', 'obs_st', 'obs_all'):
-            rainRate       = observation.units(self.derive_obs['rainRate'],               config['Units']['Precip'])
-            todayRain      = observation.units(self.derive_obs['rainAccum']['today'],     config['Units']['Precip'])
-            yesterdayRain  = observation.units(self.derive_obs['rainAccum']['yesterday'], config['Units']['Precip'])
-            monthRain      = observation.units(self.derive_obs['rainAccum']['month'],     config['Units']['Precip'])
-            yearRain       = observation.units(self.derive_obs['rainAccum']['year'],      config['Units']['Precip'])
-            radiation      = observation.units(self.device_obs['radiation'],              config['Units']['Other'])
-            uvIndex        = observation.units(self.derive_obs['uvIndex'],                config['Units']['Other'])
-            peakSun        = observation.units(self.derive_obs['peakSun'],                config['Units']['Other'])
-            windSpd        = observation.units(self.derive_obs['windSpd'],                config['Units']['Wind'])
-            windDir        = observation.units(self.derive_obs['windDir'],                config['Units']['Direction'])
-            windGust       = observation.units(self.device_obs['windGust'],               config['Units']['Wind'])
-            windAvg        = observation.units(self.derive_obs['windAvg'],                config['Units']['Wind'])
-            windMax        = observation.units(self.derive_obs['gustMax'],                config['Units']['Wind'])
+            rainRate       = observation.units(self.derive_obs['rainRate'],               config.units['Precip'])
+            todayRain      = observation.units(self.derive_obs['rainAccum']['today'],     config.units['Precip'])
+            yesterdayRain  = observation.units(self.derive_obs['rainAccum']['yesterday'], config.units['Precip'])
+            monthRain      = observation.units(self.derive_obs['rainAccum']['month'],     config.units['Precip'])
+            yearRain       = observation.units(self.derive_obs['rainAccum']['year'],      config.units['Precip'])
+            radiation      = observation.units(self.device_obs['radiation'],              config.units['Other'])
+            uvIndex        = observation.units(self.derive_obs['uvIndex'],                config.units['Other'])
+            peakSun        = observation.units(self.derive_obs['peakSun'],                config.units['Other'])
+            windSpd        = observation.units(self.derive_obs['windSpd'],                config.units['Wind'])
+            windDir        = observation.units(self.derive_obs['windDir'],                config.units['Direction'])
+            windGust       = observation.units(self.device_obs['windGust'],               config.units['Wind'])
+            windAvg        = observation.units(self.derive_obs['windAvg'],                config.units['Wind'])
+            windMax        = observation.units(self.derive_obs['gustMax'],                config.units['Wind'])
 
         # Convert derived variable units from obs_in_air observations
         if device_type in ('obs_in_air',  'obs_all'):
-            inTemp         = observation.units(self.device_obs['inTemp'],    config['Units']['Temp'])
-            inTempMax      = observation.units(self.derive_obs['inTempMax'], config['Units']['Temp'])
-            inTempMin      = observation.units(self.derive_obs['inTempMin'], config['Units']['Temp'])
+            inTemp         = observation.units(self.device_obs['inTemp'],    config.units['Temp'])
+            inTempMax      = observation.units(self.derive_obs['inTempMax'], config.units['Temp'])
+            inTempMin      = observation.units(self.derive_obs['inTempMin'], config.units['Temp'])
 
         # Convert derived variable units from rapid_wind observations
         if device_type in ('rapid_wind', 'obs_all'):
-            rapidWindSpd   = observation.units(self.device_obs['rapidWindSpd'], config['Units']['Wind'])
+            rapidWindSpd   = observation.units(self.device_obs['rapidWindSpd'], config.units['Wind'])
             rapidWindDir   = observation.units(self.derive_obs['rapidWindDir'], 'degrees')
+            windAvg2m      = observation.units(self.derive_obs['windAvg2m'],    config.units['Wind'])
+            windAvg10m     = observation.units(self.derive_obs['windAvg10m'],   config.units['Wind'])
 
         # Convert derived variable units from available evt_strike observations
         if device_type in ('evt_strike', 'obs_all'):
-            strikeDist     = observation.units(self.device_obs['strikeDist'],   config['Units']['Distance'])
-            strikeDeltaT   = observation.units(self.derive_obs['strikeDeltaT'], config['Units']['Other'])
+            strikeDist     = observation.units(self.device_obs['strikeDist'],   config.units['Distance'])
+            strikeDeltaT   = observation.units(self.derive_obs['strikeDeltaT'], config.units['Other'])
 
         # Format derived variables from obs_air and obs_st observations
         if device_type in ('obs_out_air', 'obs_st', 'obs_all'):
@@ -604,6 +791,8 @@ class obs_parser():
         if device_type in ('rapid_wind', 'obs_all'):
             self.display_obs['rapidSpd']      = observation.format(rapidWindSpd, 'Wind')
             self.display_obs['rapidDir']      = observation.format(rapidWindDir, 'Direction')
+            self.display_obs['AvgWind2m']     = observation.format(windAvg2m,    'Wind')
+            self.display_obs['AvgWind10m']    = observation.format(windAvg10m,   'Wind')
 
         # Format derived variables from evt_strike observations
         if device_type in ('evt_strike', 'obs_all'):
@@ -611,7 +800,7 @@ class obs_parser():
             self.display_obs['StrikeDeltaT']  = observation.format(strikeDeltaT, 'TimeDelta')
 
         # Update display with new variables
-        self.update_display(device_type)
+        self.push_display(device_type)
 
     def reformat_display(self):
 
@@ -621,7 +810,7 @@ class obs_parser():
         # Wait for active threads to finish, then reformat display
         while self.app.connection_client.activeThreads():
             pass
-        self.format_derived_variables(self.app.config, 'obs_all')
+        self.format_derived_variables(self.app.config_snapshot, 'obs_all')
 
     def reset_display(self):
 
@@ -632,32 +821,55 @@ class obs_parser():
         while self.app.connection_client.activeThreads():
             pass
         self.display_obs = properties.Obs()
+        with self.push_lock:
+            self.pushed_obs = {}
         self.device_obs  = device_obs.copy()
         self.derive_obs  = derive_obs.copy()
         self.flag_api    = [1, 1, 1, 1]
         self.api_data    = {}
-        self.update_display('obs_reset')
+        self.derived_graph.reset()
+        self.state_saved = time.time()
+        for rolling_wind in self.rolling_wind.values():
+            rolling_wind.clear()
+        self.push_display('obs_reset')
+
+    def push_display(self, ob_type):
+
+        """ Determine which display values have changed since they were last
+        pushed to the display and send only those values to the main thread
+
+        INPUTS:
+            ob_type             Latest Websocket message type
+        """
+
+        # Find display values that have changed since the last push. Don't
+        # update rapidWind display when type is 'all' as the RapidWind rose is
+        # not animated in this case
+        changes = {}
+        with self.push_lock:
+            for key, value in list(self.display_obs.items()):
+                if ob_type == 'obs_all' and 'rapid' in key:
+                    continue
+                if key not in self.pushed_obs or self.pushed_obs[key] != value:
+                    changes[key] = value
+                    self.pushed_obs[key] = value
+
+        # Push changed values to update bus
+        self.app.update_bus.push('obs_parser', 'Obs', changes, (self.update_display, (ob_type,)))
 
-    @mainthread
     def update_display(self, ob_type):
 
-        """ Update display with new variables derived from latest websocket
-        message
+        """ Update display graphics with new variables derived from latest
+        websocket message. Called on the main thread by the update bus once the
+        changed display values have been applied
 
         INPUTS:
             ob_type             Latest Websocket message type
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for key, value in list(self.display_obs.items()):
-            if not (ob_type == 'obs_all' and 'rapid' in key):
-                try:                                                            # Don't update rapidWind display when type is 'all'
-                    self.app.CurrentConditions.Obs[key] = value                 # as the RapidWind rose is not animated in this case
-                except ReferenceError:
-                    if not reference_error:
-                        Logger.warning(f'obs_parser: {system().log_time()} - Reference error {ob_type}')
-                        reference_error = True
+        # Update device status when a new device observation arrives
+        if ob_type not in ['rapid_wind', 'evt_strike'] and hasattr(self.app, 'station'):
+            self.app.station.on_observation(ob_type)
 
         # Update display graphics with new derived observations
         if ob_type == 'rapid_wind':
@@ -0,0 +1,118 @@
+""" Defines the crash-safe file persistence functions required by the Raspberry
+Pi Python console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+from kivy.logger import Logger
+import tempfile
+import json
+import os
+
+# Define directory holding persisted console state
+CACHE_DIR = 'cache'
+
+
+def cache_file(name):
+
+    """ Return the path of a file in the console cache directory, creating the
+    directory if required
+
+    INPUTS:
+        name                Name of cache file
+
+    OUTPUT:
+        path                Path to cache file
+    """
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def write_atomic(path, text):
+
+    """ Atomically replace the contents of a file. The text is written to a
+    temporary file in the same directory, flushed to disk and renamed over the
+    target so that a crash never leaves a partially written file behind
+
+    INPUTS:
+        path                Path to file
+        text                Text to write to file
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w') as temp_file:
+            temp_file.write(text)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Flush directory entry so that the rename survives a power loss
+    try:
+        directory_handle = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(directory_handle)
+        finally:
+            os.close(directory_handle)
+    except OSError:
+        pass
+
+
+def write_json(path, data):
+
+    """ Atomically write data to a JSON file
+
+    INPUTS:
+        path                Path to JSON file
+        data                JSON serialisable data
+
+    OUTPUT:
+        success             True if the file was written successfully
+    """
+
+    try:
+        write_atomic(path, json.dumps(data))
+        return True
+    except Exception as error:
+        Logger.warning(f'persistence: unable to write {path} - {error}')
+        return False
+
+
+def read_json(path):
+
+    """ Read data from a JSON file
+
+    INPUTS:
+        path                Path to JSON file
+
+    OUTPUT:
+        data                Data read from JSON file. None if the file does not
+                            exist or cannot be parsed
+    """
+
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as json_file:
+            return json.load(json_file)
+    except Exception as error:
+        Logger.warning(f'persistence: unable to read {path} - {error}')
+        return None
@@ -32,7 +32,7 @@ def Obs():
             'WindSpd': '-----',    'WindGust': '--',        'AvgWind': '--',
             'MaxGust': '--',       'WindDir': '---',        'inTemp': '--',
             'inTempMax': '---',    'inTempMin': '---',      'rapidSpd': '--',
-            'rapidDir': '----',
+            'rapidDir': '----',    'AvgWind2m': '--',       'AvgWind10m': '--',
             }
 
 
@@ -43,7 +43,9 @@ def Astro():
     return {'Sunrise': ['-', '-', 0], 'Sunset': ['-', '-', 0], 'Dawn': ['-', '-', 0],
             'Dusk': ['-', '-', 0],    'sunEvent': '----',      'sunIcon': ['-', 0, 0],
             'Moonrise': ['-', '-'],   'Moonset': ['-', '-'],   'NewMoon': '--',
-            'FullMoon': '--',         'Phase': ['-', '-', '-', 0]
+            'FullMoon': '--',         'Phase': ['-', '-', '-', 0],
+            'sunPosition': ['-', '-', 0, 0], 'moonPosition': ['-', '-', 0, 0],
+            'sunShadow': ['-', 0]
             }
 
 
@@ -78,8 +80,9 @@ def Status():
             'out_air_status': '-',      'out_air_ob_count': '-',
             'in_air_sample_time': '-',  'in_air_last_sample': ' ',   'in_air_voltage': '-',
             'in_air_status': '-',       'in_air_ob_count': '-',
-            'station_status': '-',
-            'hub_firmware': '-'
+            'tempest_health': '-',      'sky_health': '-',           'out_air_health': '-',
+            'in_air_health': '-',       'station_status': '-',       'hub_firmware': '-',
+            'hub_signal': '-',          'hub_uptime': '-'
             }
 
 
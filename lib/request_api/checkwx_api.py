@@ -75,3 +75,29 @@ def METAR(Config):
 
     # Return closest METAR report to station location
     return Data
+
+
+def METAR_station(Station, Config):
+
+    """ API Request for latest METAR report from the specified reporting
+    station using CheckWX API service
+
+    INPUTS:
+        Station             ICAO identifier of reporting station
+        Config              Station configuration
+
+    OUTPUT:
+        Response            API response containing latest METAR report
+    """
+
+    # Download latest METAR report from reporting station
+    header = {'X-API-Key': Config['Keys']['CheckWX']}
+    Template = 'https://api.checkwx.com/metar/{}/decoded/'
+    URL = Template.format(Station)
+    try:
+        Data = requests.get(URL, headers=header, timeout=int(Config['System']['Timeout']))
+    except Exception:
+        Data = None
+
+    # Return latest METAR report from reporting station
+    return Data
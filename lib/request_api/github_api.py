@@ -15,8 +15,9 @@ You should have received a copy of the GNU General Public License along with
 this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-# Import required modules
-import requests
+# Import required library modules
+from lib.request_api import http_cache
+
 
 
 def verify_response(Response, Field):
@@ -68,7 +69,7 @@ def version(Config):
     Template = 'https://api.github.com/repos/{}/{}/releases/latest'
     URL = Template.format('peted-davis', 'WeatherFlow_PiConsole')
     try:
-        Data = requests.get(URL, headers=header, timeout=int(Config['System']['Timeout']))
+        Data = http_cache.get(URL, headers=header, timeout=int(Config['System']['Timeout']))
     except Exception:
         Data = None
 
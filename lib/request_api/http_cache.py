@@ -0,0 +1,194 @@
+""" Defines the HTTP validator cache required by the Raspberry Pi Python console
+for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib import persistence
+
+# Import required modules
+from kivy.logger import Logger
+import threading
+import requests
+import hashlib
+import json
+
+# Define HTTP validator cache file. Entries are keyed by a hash of the URL so
+# that API tokens are not written to disk
+CACHE_FILE = 'http_cache.json'
+
+# Define shared HTTP validator cache. Saves are numbered so that an older
+# snapshot is never written over a newer one
+entries    = None
+lock       = threading.Lock()
+save_lock  = threading.Lock()
+save_count = {'queued': 0, 'written': 0}
+
+
+class cached_response():
+
+    """ Response returned by get() when the server confirms that the cached
+    response body is still valid
+    """
+
+    ok          = True
+    status_code = 304
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def url_key(url):
+
+    """ Return the cache key for a URL
+    """
+
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def load_entries():
+
+    """ Load the HTTP validator cache from disk if required. Must be called
+    with the lock held
+    """
+
+    global entries
+    if entries is None:
+        entries = persistence.read_json(persistence.cache_file(CACHE_FILE)) or {}
+    return entries
+
+
+def request_headers(url, headers=None):
+
+    """ Return request headers with the validators stored for a URL added, so
+    that the server only returns the response body if it has changed
+
+    INPUTS:
+        url                 Request URL
+        headers             Optional dictionary of request headers
+
+    OUTPUT:
+        headers             Dictionary of request headers
+    """
+
+    headers = dict(headers or {})
+    with lock:
+        entry = load_entries().get(url_key(url))
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def store(url, response_headers, body):
+
+    """ Store the validators and parsed body of a successful response. Nothing
+    is stored if the response has no validators. The cache is saved to disk
+    in a background thread when it changes
+
+    INPUTS:
+        url                 Request URL
+        response_headers    Dictionary of response headers
+        body                Parsed response body
+    """
+
+    response_headers = {key.lower(): value for key, value in (response_headers or {}).items()}
+    entry = {'etag':          response_headers.get('etag'),
+             'last_modified': response_headers.get('last-modified'),
+             'body':          body}
+    with lock:
+        cache = load_entries()
+        key   = url_key(url)
+        if entry['etag'] is None and entry['last_modified'] is None:
+            if cache.pop(key, None) is None:
+                return
+        elif cache.get(key) == entry:
+            return
+        else:
+            cache[key] = entry
+        text = json.dumps(cache)
+        save_count['queued'] += 1
+        number = save_count['queued']
+    threading.Thread(target=save, args=[text, number], daemon=True).start()
+
+
+def save(text, number):
+
+    """ Atomically save the HTTP validator cache to disk
+
+    INPUTS:
+        text                Serialised HTTP validator cache
+        number              Sequence number of snapshot
+    """
+
+    with save_lock:
+        if number < save_count['written']:
+            return
+        try:
+            persistence.write_atomic(persistence.cache_file(CACHE_FILE), text)
+            save_count['written'] = number
+        except Exception as error:
+            Logger.warning(f'http_cache: unable to write {CACHE_FILE} - {error}')
+
+
+def cached_body(url):
+
+    """ Return the parsed body stored for a URL after the server has responded
+    with 304 Not Modified
+
+    INPUTS:
+        url                 Request URL
+
+    OUTPUT:
+        body                Parsed response body, or None if not cached
+    """
+
+    with lock:
+        entry = load_entries().get(url_key(url))
+    return entry['body'] if entry is not None else None
+
+
+def get(url, headers=None, timeout=None):
+
+    """ Send a conditional GET request using the requests module
+
+    INPUTS:
+        url                 Request URL
+        headers             Optional dictionary of request headers
+        timeout             Optional request timeout                        [s]
+
+    OUTPUT:
+        response            requests Response, or cached_response holding the
+                            cached body if the server responds with 304 Not
+                            Modified
+    """
+
+    response = requests.get(url, headers=request_headers(url, headers), timeout=timeout)
+    if response.status_code == 304:
+        body = cached_body(url)
+        if body is not None:
+            return cached_response(body)
+        return requests.get(url, headers=headers, timeout=timeout)
+    if response.ok:
+        try:
+            store(url, response.headers, response.json())
+        except ValueError:
+            pass
+    return response
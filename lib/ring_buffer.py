@@ -0,0 +1,375 @@
+""" Defines the fixed-size ring buffers required by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules
+from array import array
+
+# Define global variables
+NaN = float('NaN')
+
+
+# ==============================================================================
+# ring_buffer CLASS
+# ==============================================================================
+class ring_buffer():
+
+    """ Fixed-size first-in first-out buffer. Memory is allocated once and the
+    oldest item is overwritten when the buffer is full
+    """
+
+    def __init__(self, size):
+        self.size  = size
+        self.data  = [None] * size
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for ii in range(self.count):
+            yield self.data[(self.start + ii) % self.size]
+
+    def append(self, item):
+
+        """ Append item to the buffer
+
+        INPUTS:
+            item                Item to append
+
+        OUTPUT:
+            evicted             Item overwritten to make room for the new item.
+                                None if the buffer was not full
+        """
+
+        evicted = None
+        if self.count == self.size:
+            evicted = self.data[self.start]
+            self.data[self.start] = item
+            self.start = (self.start + 1) % self.size
+        else:
+            self.data[(self.start + self.count) % self.size] = item
+            self.count += 1
+        return evicted
+
+    def oldest(self):
+
+        """ Return the oldest item in the buffer without removing it
+        """
+
+        return self.data[self.start] if self.count else None
+
+    def newest(self):
+
+        """ Return the newest item in the buffer without removing it
+        """
+
+        return self.data[(self.start + self.count - 1) % self.size] if self.count else None
+
+    def pop_oldest(self):
+
+        """ Remove and return the oldest item in the buffer
+        """
+
+        if not self.count:
+            return None
+        item = self.data[self.start]
+        self.data[self.start] = None
+        self.start = (self.start + 1) % self.size
+        self.count -= 1
+        return item
+
+    def clear(self):
+
+        """ Remove all items from the buffer
+        """
+
+        self.data  = [None] * self.size
+        self.start = 0
+        self.count = 0
+
+
+# ==============================================================================
+# rolling_mean CLASS
+# ==============================================================================
+class rolling_mean():
+
+    """ Time-weighted rolling mean over a fixed time window. Each sample is
+    weighted by the time elapsed since the previous sample, capped at
+    max_interval so that gaps in the data do not dominate the mean. Running
+    sums make each update O(1), and samples are held in a ring buffer sized for
+    the window so memory use is fixed
+    """
+
+    def __init__(self, window, interval, max_interval=None):
+
+        """ Initialise the rolling mean
+
+        INPUTS:
+            window              Length of rolling window                     [s]
+            interval            Nominal interval between samples             [s]
+            max_interval        Maximum weight given to a single sample      [s]
+        """
+
+        self.window       = window
+        self.interval     = interval
+        self.max_interval = max_interval or 3 * interval
+        self.samples      = ring_buffer(int(window / interval) * 2 + 1)
+        self.sum_weight   = 0.0
+        self.sum_value    = 0.0
+
+    def append(self, sample_time, value):
+
+        """ Add a sample to the rolling mean
+
+        INPUTS:
+            sample_time         Time of sample                               [s]
+            value               Sample value
+        """
+
+        # Weight sample by time since previous sample
+        previous = self.samples.newest()
+        if previous is None:
+            weight = self.interval
+        else:
+            weight = min(max(sample_time - previous[0], 0), self.max_interval)
+
+        # Add sample to running sums, removing any sample overwritten in the
+        # ring buffer
+        evicted = self.samples.append((sample_time, value, weight))
+        if evicted is not None:
+            self.sum_weight -= evicted[2]
+            self.sum_value  -= evicted[1] * evicted[2]
+        self.sum_weight += weight
+        self.sum_value  += value * weight
+
+        # Remove samples that have fallen outside the rolling window
+        while self.samples.oldest() is not None and self.samples.oldest()[0] <= sample_time - self.window:
+            expired = self.samples.pop_oldest()
+            self.sum_weight -= expired[2]
+            self.sum_value  -= expired[1] * expired[2]
+        if not len(self.samples):
+            self.sum_weight = 0.0
+            self.sum_value  = 0.0
+
+    def mean(self):
+
+        """ Return the time-weighted mean of the samples in the window. None if
+        the window holds no samples
+        """
+
+        if not len(self.samples) or self.sum_weight <= 0:
+            return None
+        return self.sum_value / self.sum_weight
+
+    def clear(self):
+
+        """ Remove all samples from the rolling mean
+        """
+
+        self.samples.clear()
+        self.sum_weight = 0.0
+        self.sum_value  = 0.0
+
+
+# ==============================================================================
+# rolling_count CLASS
+# ==============================================================================
+class rolling_count():
+
+    """ Count of samples received over a fixed time window. Samples expected
+    at a fixed interval but not received are detected from the gap before each
+    sample and counted as dropped. Samples are held in a ring buffer sized for
+    the window so memory use is fixed
+    """
+
+    def __init__(self, window, interval):
+
+        """ Initialise the rolling count
+
+        INPUTS:
+            window              Length of rolling window                     [s]
+            interval            Expected interval between samples            [s]
+        """
+
+        self.window   = window
+        self.interval = interval
+        self.samples  = ring_buffer(int(window / interval) * 2 + 1)
+        self.dropped  = 0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def append(self, sample_time):
+
+        """ Add a sample to the rolling count. Samples that are not newer than
+        the newest sample in the count are ignored
+
+        INPUTS:
+            sample_time         Time of sample                               [s]
+
+        OUTPUT:
+            added               True if the sample was added to the count
+        """
+
+        # Count samples missed since previous sample
+        previous = self.samples.newest()
+        if previous is not None and sample_time <= previous[0]:
+            return False
+        missed = max(round((sample_time - previous[0]) / self.interval) - 1, 0) if previous is not None else 0
+
+        # Add sample, removing any sample overwritten in the ring buffer
+        evicted = self.samples.append((sample_time, missed))
+        if evicted is not None:
+            self.dropped -= evicted[1]
+        self.dropped += missed
+        return True
+
+    def merge(self, sample_times):
+
+        """ Merge samples received out of order, for example from a download of
+        historic samples, into the rolling count
+
+        INPUTS:
+            sample_times        List of sample times                         [s]
+        """
+
+        merged = sorted(set(sample_time for sample_time, _ in self.samples) | set(sample_times))
+        self.clear()
+        for sample_time in merged:
+            self.append(sample_time)
+
+    def expire(self, now):
+
+        """ Remove samples that have fallen outside the rolling window
+
+        INPUTS:
+            now                 Current time                                 [s]
+        """
+
+        while self.samples.oldest() is not None and self.samples.oldest()[0] <= now - self.window:
+            self.dropped -= self.samples.pop_oldest()[1]
+
+    def count(self, now):
+
+        """ Return the number of samples received and dropped in the rolling
+        window ending now
+
+        INPUTS:
+            now                 Current time                                 [s]
+
+        OUTPUT:
+            received            Number of samples received
+            dropped             Number of samples dropped
+        """
+
+        self.expire(now)
+        return len(self.samples), self.dropped
+
+    def clear(self):
+
+        """ Remove all samples from the rolling count
+        """
+
+        self.samples.clear()
+        self.dropped = 0
+
+
+# ==============================================================================
+# series_buffer CLASS
+# ==============================================================================
+class series_buffer():
+
+    """ Fixed-size first-in first-out buffer of numeric samples with named
+    fields. Each field is held in its own array of doubles that is allocated
+    once, so memory use is fixed and compact. Missing values are held as NaN
+    and the oldest sample is overwritten when the buffer is full
+    """
+
+    def __init__(self, size, fields):
+
+        """ Initialise the series buffer
+
+        INPUTS:
+            size                Maximum number of samples
+            fields              List of sample field names
+        """
+
+        self.size    = size
+        self.fields  = fields
+        self.columns = {field: array('d', [NaN]) * size for field in fields}
+        self.start   = 0
+        self.count   = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, sample):
+
+        """ Append a sample to the buffer
+
+        INPUTS:
+            sample              Dictionary of field names and values. Missing
+                                fields and None values are stored as NaN
+        """
+
+        if self.count == self.size:
+            ii = self.start
+            self.start = (self.start + 1) % self.size
+        else:
+            ii = (self.start + self.count) % self.size
+            self.count += 1
+        for field in self.fields:
+            value = sample.get(field)
+            self.columns[field][ii] = NaN if value is None else float(value)
+
+    def column(self, field, count=None):
+
+        """ Return the values of a field from oldest to newest sample
+
+        INPUTS:
+            field               Sample field name
+            count               Return only the newest count samples
+        """
+
+        column = self.columns[field]
+        count  = self.count if count is None else min(count, self.count)
+        start  = (self.start + self.count - count) % self.size
+        end    = start + count
+        if end <= self.size:
+            return column[start:end].tolist()
+        return column[start:].tolist() + column[:end - self.size].tolist()
+
+    def newest(self):
+
+        """ Return the newest sample in the buffer without removing it
+        """
+
+        if not self.count:
+            return None
+        ii = (self.start + self.count - 1) % self.size
+        return {field: self.columns[field][ii] for field in self.fields}
+
+    def clear(self):
+
+        """ Remove all samples from the buffer
+        """
+
+        for field in self.fields:
+            self.columns[field] = array('d', [NaN]) * self.size
+        self.start = 0
+        self.count = 0
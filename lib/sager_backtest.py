@@ -0,0 +1,499 @@
+""" Backtests the Sager Weathercaster forecast used by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations against
+historical observations and archived METAR reports.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+Usage, from the console directory:
+
+    python -m lib.sager_backtest --obs tempest_*.json --metar metar.csv
+
+Observation files hold WeatherFlow REST API device observation responses
+(obs_st, or obs_sky together with obs_air). METAR files are CSV files with
+'valid' (UTC, YYYY-MM-DD HH:MM) and 'metar' columns, as downloaded from the
+Iowa Environmental Mesonet ASOS archive. Station latitude, elevation, device
+IDs, wind speed units and forecast interval are read from wfpiconsole.ini
+"""
+
+# Prevent Kivy from parsing the backtest command line arguments
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+# Import required library modules
+from lib.config_snapshot import config_snapshot
+from lib             import derived_variables as derive
+from lib             import sager_table
+from lib             import sager
+
+# Import required Python modules
+from datetime        import datetime
+import configparser
+import argparse
+import json
+import time
+import math
+import csv
+import numpy         as np
+import pytz
+
+# Define length of window over which the forecast trend is calculated [s],
+# number of observations averaged at each end of the window, and maximum age
+# of METAR report used for a forecast [s]. These match the live forecast
+SPAN       = 6 * 3600
+WINDOW     = 15
+METAR_AGE  = 2 * 3600
+
+# Define Expected Weather entries in sager_table.EXPECTED that forecast
+# precipitation and fair weather. The remaining entries forecast unsettled
+# weather or possible precipitation
+EXPECTED_PRECIP = set(range(8, 19))
+EXPECTED_FAIR   = {0, 1, 2}
+
+
+def load_observations(paths):
+
+    """ Load and decode WeatherFlow REST API observation files. Observations
+    from files of the same observation type are merged and sorted by time
+
+    INPUTS:
+        paths               List of observation file paths
+
+    OUTPUT:
+        observations        Dictionary of NumPy columns for each observation
+                            type
+    """
+
+    # Decode each file into NumPy columns
+    decoded = {}
+    for path in paths:
+        with open(path) as file:
+            data = json.load(file)
+        if data.get('type') not in sager.OB_COLUMNS:
+            raise ValueError(f'{path}: unsupported observation type {data.get("type")}')
+        decoded.setdefault(data['type'], []).append(sager.obs_columns(data.get('obs') or [], data['type']))
+
+    # Merge columns for each observation type and remove duplicate times
+    observations = {}
+    for ob_type, parts in decoded.items():
+        columns = {field: np.concatenate([part[field] for part in parts]) for field in sager.OB_COLUMNS[ob_type]}
+        _, index = np.unique(columns['time'], return_index=True)
+        index = index[~np.isnan(columns['time'][index])]
+        observations[ob_type] = {field: values[index] for field, values in columns.items()}
+    return observations
+
+
+def load_metars(paths):
+
+    """ Load archived METAR reports
+
+    INPUTS:
+        paths               List of METAR CSV file paths
+
+    OUTPUT:
+        times               NumPy array of METAR report times               [s]
+        reports             List of raw METAR reports
+    """
+
+    # Read METAR reports. Comment lines are skipped
+    records = []
+    for path in paths:
+        with open(path, newline='') as file:
+            reader = csv.DictReader(line for line in file if not line.startswith('#'))
+            if not reader.fieldnames or not {'valid', 'metar'} <= set(reader.fieldnames):
+                raise ValueError(f'{path}: expected valid and metar columns')
+            for row in reader:
+                valid = datetime.strptime(row['valid'].strip(), '%Y-%m-%d %H:%M').replace(tzinfo=pytz.utc)
+                records.append((valid.timestamp(), row['metar'].strip()))
+
+    # Return METAR reports sorted by time
+    records.sort()
+    return np.array([record[0] for record in records], dtype=np.float64), [record[1] for record in records]
+
+
+def window_mean(values, start, stop):
+
+    """ Calculate the mean of the non-NaN values in many index windows at once
+    from cumulative sums
+
+    INPUTS:
+        values              NumPy array of values
+        start               NumPy array of first index in each window
+        stop                NumPy array of index after last in each window
+
+    OUTPUT:
+        mean                NumPy array of window means. NaN where a window
+                            holds no valid values
+    """
+
+    valid = ~np.isnan(values)
+    total = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    count = np.concatenate(([0],   np.cumsum(valid)))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (total[stop] - total[start]) / (count[stop] - count[start])
+
+
+def window_circular_mean(angles, start, stop):
+
+    """ Calculate the circular mean of the non-NaN angles in many index
+    windows at once. Matches sager.CircularMean for each window
+
+    INPUTS:
+        angles              NumPy array of angles                         [deg]
+        start               NumPy array of first index in each window
+        stop                NumPy array of index after last in each window
+
+    OUTPUT:
+        mean                NumPy array of circular means                 [deg]
+    """
+
+    radians = np.radians(angles)
+    x = window_mean(np.cos(radians), start, stop)
+    y = window_mean(np.sin(radians), start, stop)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+def trend_windows(times, forecast_times):
+
+    """ Define the index windows averaged at the start and end of the six hour
+    trend window ending at each forecast time. As in the live forecast, these
+    are the first and last WINDOW observations in the trend window
+
+    INPUTS:
+        times               NumPy array of observation times                [s]
+        forecast_times      NumPy array of forecast times                   [s]
+
+    OUTPUT:
+        windows             Tuple of first and last observation index of the
+                            trend window, and start and stop index of the
+                            windows averaged six hours ago and now
+    """
+
+    first = np.searchsorted(times, forecast_times - SPAN, side='left')
+    last  = np.searchsorted(times, forecast_times,        side='right')
+    return first, last, (first, np.minimum(first + WINDOW, last)), (np.maximum(last - WINDOW, first), last)
+
+
+def minutes_since_rain(times, rain, forecast_times, first, last):
+
+    """ Calculate the minutes since rain was last observed within the six
+    hour trend window ending at each forecast time
+
+    INPUTS:
+        times               NumPy array of observation times                [s]
+        rain                NumPy array of rain accumulation               [mm]
+        forecast_times      NumPy array of forecast times                   [s]
+        first               NumPy array of first index in each trend window
+        last                NumPy array of index after last in each window
+
+    OUTPUT:
+        last_rain           NumPy array of minutes since last rain. Infinite
+                            if no rain fell within the trend window
+    """
+
+    # Find index of most recent observation with rain at or before each index
+    latest = np.maximum.accumulate(np.where(rain > 0, np.arange(len(rain)), -1))
+    latest = np.concatenate(([-1], latest))[last]
+
+    # Return minutes since last rain
+    last_rain = np.full(len(forecast_times), math.inf)
+    rained = latest >= first
+    last_rain[rained] = (forecast_times[rained] - times[latest[rained]]) / 60
+    return last_rain
+
+
+def forecast_schedule(start, end, interval, timezone):
+
+    """ Define the forecast times between the specified start and end times.
+    As in the live forecast, a forecast is generated on each hour in the
+    station timezone that is a multiple of the SagerInterval
+
+    INPUTS:
+        start               Earliest forecast time                          [s]
+        end                 Latest forecast time                            [s]
+        interval            Interval between forecasts                    [hrs]
+        timezone            Station timezone
+
+    OUTPUT:
+        forecast_times      NumPy array of forecast times                   [s]
+    """
+
+    # Step through quarter hours so that timezones with non-hourly offsets
+    # are handled
+    forecast_times = []
+    for ts in range(int(-(-start // 900)) * 900, int(end) + 1, 900):
+        local = datetime.fromtimestamp(ts, timezone)
+        if local.minute == 0 and local.hour % interval == 0:
+            forecast_times.append(ts)
+    return np.array(forecast_times, dtype=np.float64)
+
+
+def backtest(observations, metar_times, metars, config, horizon=12):
+
+    """ Generate the Sager Weathercaster forecast at each forecast time in the
+    historical observations and compare it against the observed weather
+
+    INPUTS:
+        observations        Dictionary of NumPy columns for each observation
+                            type
+        metar_times         NumPy array of METAR report times               [s]
+        metars              List of raw METAR reports
+        config              Station configuration
+        horizon             Hours over which observed precipitation is
+                            compared against the forecast
+
+    OUTPUT:
+        results             Dictionary holding the forecast at each forecast
+                            time, verification counts and stage timings
+    """
+
+    timings = {}
+    start   = time.perf_counter()
+
+    # Define wind and rain observations and pressure and temperature
+    # observations, preferring TEMPEST observations over SKY and AIR
+    # observations as the live forecast does
+    wind_obs = observations.get('obs_st') or observations.get('obs_sky')
+    pres_obs = observations.get('obs_st') or observations.get('obs_air')
+    if wind_obs is None or pres_obs is None or not len(wind_obs['time']) or not len(pres_obs['time']):
+        raise ValueError('Backtest requires obs_st, or obs_sky and obs_air observations')
+    pres_device = config.tempest_id if 'obs_st' in observations else config.out_air_id
+    if not pres_device:
+        raise ValueError('Backtest requires the TEMPEST or AIR device ID in wfpiconsole.ini')
+
+    # Define forecast times where a full trend window is available
+    timezone = config.timezone
+    first_ob = max(wind_obs['time'][0], pres_obs['time'][0]) + SPAN
+    last_ob  = min(wind_obs['time'][-1], pres_obs['time'][-1])
+    forecast_times = forecast_schedule(first_ob, last_ob, int(config['System']['SagerInterval']), timezone)
+    timings['schedule'] = time.perf_counter() - start
+
+    # Calculate trend window means for all forecast times at once
+    start = time.perf_counter()
+    first, last, then, now = trend_windows(wind_obs['time'], forecast_times)
+    wind_speed    = wind_obs['wind_speed'] * 2.23694
+    wind_dir_6h   = window_circular_mean(wind_obs['wind_dir'], *then)
+    wind_dir      = window_circular_mean(wind_obs['wind_dir'], *now)
+    wind_speed_6h = window_mean(wind_speed, *then)
+    wind_speed    = window_mean(wind_speed, *now)
+    last_rain     = minutes_since_rain(wind_obs['time'], wind_obs['rain'], forecast_times, first, last)
+    _, _, then, now = trend_windows(pres_obs['time'], forecast_times)
+    pressure_6h   = derive.SLP([window_mean(pres_obs['pressure'], *then), 'mb'], pres_device, config)[0]
+    pressure      = derive.SLP([window_mean(pres_obs['pressure'], *now),  'mb'], pres_device, config)[0]
+    temperature   = window_mean(pres_obs['temperature'], *now)
+
+    # Find most recent METAR report at each forecast time
+    metar_index = np.searchsorted(metar_times, forecast_times, side='right') - 1
+    metar_valid = metar_index >= 0
+    metar_valid[metar_valid] = forecast_times[metar_valid] - metar_times[metar_index[metar_valid]] <= METAR_AGE
+
+    # Calculate observed rain accumulation over the forecast horizon, and
+    # temperature change to the same time the following day so that the
+    # diurnal cycle does not dominate the change
+    rain_total = np.concatenate(([0.0], np.cumsum(np.nan_to_num(wind_obs['rain']))))
+    rain_start = np.searchsorted(wind_obs['time'], forecast_times,                  side='right')
+    rain_stop  = np.searchsorted(wind_obs['time'], forecast_times + horizon * 3600, side='right')
+    rain_known = forecast_times + horizon * 3600 <= wind_obs['time'][-1]
+    rain_later = rain_total[rain_stop] - rain_total[rain_start]
+    _, _, _, tomorrow = trend_windows(pres_obs['time'], forecast_times + 86400)
+    temperature_change = window_mean(pres_obs['temperature'], *tomorrow) - temperature
+    temperature_change[forecast_times + 86400 > pres_obs['time'][-1]] = np.nan
+    timings['windows'] = time.perf_counter() - start
+
+    # Generate the Sager Weathercaster forecast at each forecast time
+    start = time.perf_counter()
+    lat   = config.latitude
+    units = config.units['Wind']
+    forecasts = []
+    missing   = 0
+    for ii, forecast_time in enumerate(forecast_times):
+        inputs = (wind_dir_6h[ii], wind_dir[ii], wind_speed_6h[ii], wind_speed[ii],
+                  pressure_6h[ii], pressure[ii], temperature[ii])
+        if not metar_valid[ii] or any(math.isnan(value) for value in inputs):
+            missing += 1
+            continue
+        sager_data = {'Lat':           lat,
+                      'wind_dir_6h':   wind_dir_6h[ii],
+                      'wind_dir':      wind_dir[ii],
+                      'wind_speed_6h': wind_speed_6h[ii],
+                      'wind_speed':    wind_speed[ii],
+                      'pressure':      pressure[ii],
+                      'pressure_6h':   pressure_6h[ii],
+                      'last_rain':     last_rain[ii],
+                      'temperature':   temperature[ii],
+                      'METAR':         metars[metar_index[ii]]}
+        dial = sager.dial_setting(sager_data)
+        if dial is None:
+            missing += 1
+            continue
+        forecasts.append({'time':               int(forecast_time),
+                          'dial':               dial,
+                          'key':                sager_table.DIAL.get(dial),
+                          'forecast':           sager.dial_forecast(dial, lat, temperature[ii], units),
+                          'rain':               rain_later[ii] if rain_known[ii] else None,
+                          'temperature_change': None if math.isnan(temperature_change[ii]) else temperature_change[ii]})
+    timings['dials'] = time.perf_counter() - start
+
+    # Return backtest results
+    return {'forecasts': forecasts,
+            'missing':   missing,
+            'scheduled': len(forecast_times),
+            'horizon':   horizon,
+            'timings':   timings,
+            'verification': verify(forecasts)}
+
+
+def verify(forecasts):
+
+    """ Compare the Expected Weather in each forecast against the observed
+    weather
+
+    INPUTS:
+        forecasts           List of forecasts generated by backtest()
+
+    OUTPUT:
+        verification        Dictionary holding the precipitation contingency
+                            table, the observed precipitation frequency for
+                            forecasts of unsettled weather, and the number of
+                            correct warmer and cooler forecasts
+    """
+
+    verification = {'hits': 0, 'misses': 0, 'false_alarms': 0, 'correct_negatives': 0,
+                    'unsettled': 0, 'unsettled_rain': 0, 'unavailable': 0,
+                    'warmer': 0, 'warmer_correct': 0, 'cooler': 0, 'cooler_correct': 0}
+    for forecast in forecasts:
+        if forecast['key'] is None:
+            verification['unavailable'] += 1
+            continue
+        expected = sager_table.KEYS[forecast['key']][0]
+
+        # Verify precipitation forecast
+        if forecast['rain'] is not None:
+            rained = forecast['rain'] > 0
+            if expected in EXPECTED_PRECIP:
+                verification['hits' if rained else 'false_alarms'] += 1
+            elif expected in EXPECTED_FAIR:
+                verification['misses' if rained else 'correct_negatives'] += 1
+            else:
+                verification['unsettled']      += 1
+                verification['unsettled_rain'] += rained
+
+        # Verify temperature trend forecast
+        if forecast['temperature_change'] is not None:
+            text = sager_table.EXPECTED[expected]
+            if 'warmer' in text:
+                verification['warmer']         += 1
+                verification['warmer_correct'] += forecast['temperature_change'] > 0
+            elif 'cooler' in text:
+                verification['cooler']         += 1
+                verification['cooler_correct'] += forecast['temperature_change'] < 0
+    return verification
+
+
+def report(results, load_time):
+
+    """ Print a summary of the backtest verification and throughput
+
+    INPUTS:
+        results             Dictionary returned by backtest()
+        load_time           Time taken to load and decode input files       [s]
+    """
+
+    def ratio(numerator, denominator):
+        return f'{numerator / denominator:.2f}' if denominator else '-'
+
+    forecasts    = results['forecasts']
+    verification = results['verification']
+    timings      = results['timings']
+    total_time   = sum(timings.values())
+
+    # Print forecast counts
+    if forecasts:
+        first = datetime.fromtimestamp(forecasts[0]['time'],  pytz.utc).strftime('%Y-%m-%d %H:%M')
+        last  = datetime.fromtimestamp(forecasts[-1]['time'], pytz.utc).strftime('%Y-%m-%d %H:%M')
+        print(f'Forecasts:          {len(forecasts)} from {first} to {last} UTC')
+    print(f'Scheduled:          {results["scheduled"]} ({results["missing"]} missing data, '
+          f'{verification["unavailable"]} forecast unavailable)')
+
+    # Print precipitation verification
+    hits, misses = verification['hits'], verification['misses']
+    false_alarms, negatives = verification['false_alarms'], verification['correct_negatives']
+    print(f'Precipitation ({results["horizon"]} h):  {hits} hits, {misses} misses, '
+          f'{false_alarms} false alarms, {negatives} correct negatives')
+    print(f'                    POD {ratio(hits, hits + misses)}, FAR {ratio(false_alarms, hits + false_alarms)}, '
+          f'accuracy {ratio(hits + negatives, hits + misses + false_alarms + negatives)}')
+    print(f'Unsettled:          {verification["unsettled"]} forecasts, '
+          f'rain observed {ratio(verification["unsettled_rain"], verification["unsettled"])}')
+
+    # Print temperature trend verification
+    print(f'Warmer (24 h):      {verification["warmer_correct"]}/{verification["warmer"]} correct')
+    print(f'Cooler (24 h):      {verification["cooler_correct"]}/{verification["cooler"]} correct')
+
+    # Print throughput
+    print(f'Load:               {load_time * 1000:.1f} ms')
+    for stage, stage_time in timings.items():
+        print(f'{stage.capitalize() + ":":<20}{stage_time * 1000:.1f} ms')
+    if total_time > 0:
+        print(f'Throughput:         {results["scheduled"] / total_time:.0f} forecasts/s')
+
+
+def write_forecasts(path, forecasts):
+
+    """ Write the forecast at each forecast time to a CSV file
+
+    INPUTS:
+        path                Output CSV file path
+        forecasts           List of forecasts generated by backtest()
+    """
+
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=['time', 'dial', 'key', 'forecast', 'rain', 'temperature_change'])
+        writer.writeheader()
+        writer.writerows(forecasts)
+
+
+def main():
+
+    """ Run the Sager Weathercaster backtest from the command line
+    """
+
+    parser = argparse.ArgumentParser(description='Backtest the Sager Weathercaster forecast')
+    parser.add_argument('--obs',     nargs='+', required=True, help='WeatherFlow REST API observation files')
+    parser.add_argument('--metar',   nargs='+', required=True, help='Archived METAR CSV files')
+    parser.add_argument('--config',  default='wfpiconsole.ini', help='Console configuration file')
+    parser.add_argument('--hours',   type=int, default=12, help='Precipitation verification horizon in hours')
+    parser.add_argument('--output',  help='Write each forecast to this CSV file')
+    args = parser.parse_args()
+
+    # Load station configuration
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    if not config.read(args.config):
+        parser.error(f'unable to read {args.config}')
+    config = config_snapshot(config)
+
+    # Load observations and METAR reports
+    start = time.perf_counter()
+    observations = load_observations(args.obs)
+    metar_times, metars = load_metars(args.metar)
+    load_time = time.perf_counter() - start
+
+    # Run backtest and report results
+    results = backtest(observations, metar_times, metars, config, args.hours)
+    report(results, load_time)
+    if args.output:
+        write_forecasts(args.output, results['forecasts'])
+
+
+if __name__ == '__main__':
+    main()
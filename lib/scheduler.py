@@ -0,0 +1,100 @@
+""" Defines the consolidated display scheduler required by the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Kivy modules
+from kivy.clock   import Clock
+
+# Import required Python modules
+import time
+import math
+
+
+# ==============================================================================
+# scheduler CLASS
+# ==============================================================================
+class scheduler():
+
+    """ Runs periodic display tasks from a single Clock event that fires just
+    after each whole second. Each task has its own cadence in seconds and runs
+    once each time the wall clock crosses a multiple of that cadence, so a
+    cadence of 60 runs on each minute boundary
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self.event = None
+        self.stats = {'ticks': 0}
+
+    def add(self, name, function, cadence):
+
+        """ Add a task to the scheduler. The task runs on the next tick and then
+        at the specified cadence
+
+        INPUTS:
+            name                Name of task
+            function            Function to call. Receives the time in seconds
+                                since the task last ran
+            cadence             Interval between task runs                   [s]
+        """
+
+        self.tasks[name] = {'function': function, 'cadence': cadence, 'last': None, 'runs': 0}
+        if self.event is None:
+            self.schedule_tick()
+
+    def remove(self, name):
+
+        """ Remove a task from the scheduler
+        """
+
+        self.tasks.pop(name, None)
+
+    def run(self, name):
+
+        """ Run a task immediately, outside its normal cadence
+        """
+
+        self.run_task(self.tasks[name], time.time())
+
+    def schedule_tick(self):
+
+        """ Schedule the next tick just after the next whole second
+        """
+
+        self.event = Clock.schedule_once(self.tick, 1.005 - time.time() % 1)
+
+    def tick(self, dt):
+
+        """ Run all tasks that are due at the current time and schedule the
+        next tick
+        """
+
+        now = time.time()
+        self.stats['ticks'] += 1
+        self.schedule_tick()
+        for task in list(self.tasks.values()):
+            if task['last'] is None or math.floor(now / task['cadence']) > math.floor(task['last'] / task['cadence']):
+                self.run_task(task, now)
+
+    def run_task(self, task, now):
+
+        """ Run a task and record the time it ran
+        """
+
+        elapsed = now - task['last'] if task['last'] is not None else 0
+        task['last'] = now
+        task['runs'] += 1
+        task['function'](elapsed)
@@ -253,6 +253,8 @@ def JSON(Section):
                   'title': 'Lightning timeout', 'section': 'Display', 'key': 'lightning_timeout'},
                  {'type': 'bool', 'desc': 'Show indoor temperature',
                   'title': 'Indoor temperature', 'section': 'Display', 'key': 'IndoorTemp'},
+                 {'type': 'bool', 'desc': 'Show 2 and 10 minute rolling mean wind speed',
+                  'title': 'Rolling wind speed', 'section': 'Display', 'key': 'RollingWind'},
                  {'type': 'bool', 'desc': 'Show cursor',
                   'title': 'Cursor', 'section': 'Display', 'key': 'Cursor'},
                  {'type': 'bool', 'desc': 'Set console to run fullscreen',
@@ -0,0 +1,55 @@
+""" Records the console startup timing report for the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules. Kivy is deliberately not imported here so
+# that timing can start before the Kivy modules are loaded
+import time
+import os
+
+# Define startup timing flag and stage list
+ENABLED = bool(os.environ.get('WFPICONSOLE_STARTUP_TIMING'))
+START   = time.perf_counter()
+stages  = []
+last    = [START]
+
+
+def mark(stage):
+
+    """ Record the time at which a startup stage completed
+
+    INPUTS:
+        stage               Name of startup stage
+    """
+
+    if ENABLED:
+        stages.append((stage, time.perf_counter()))
+
+
+def report():
+
+    """ Log the duration of each startup stage recorded so far, then clear the
+    recorded stages
+    """
+
+    if not ENABLED or not stages:
+        return
+    from kivy.logger import Logger
+    for stage, stage_time in stages:
+        Logger.info(f'Startup: {stage:<24} {(stage_time - last[0]) * 1000:8.1f} ms  '
+                    f'(total {(stage_time - START) * 1000:8.1f} ms)')
+        last[0] = stage_time
+    stages.clear()
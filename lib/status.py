@@ -16,27 +16,41 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
+from lib.request_api         import http_cache
+from lib.device_health       import device_health
+from lib.ring_buffer         import rolling_count
 from lib.system              import system
 from lib                     import properties
 
 # Import required Kivy modules
 from kivy.network.urlrequest import UrlRequest
-from kivy.uix.boxlayout      import BoxLayout
 from kivy.logger             import Logger
+from kivy.uix.boxlayout      import BoxLayout
 from kivy.uix.widget         import Widget
+from kivy.clock              import Clock
 from kivy.app                import App
 
 # Import required Python modules
 from datetime                import datetime
+from functools               import partial
 import certifi
 import time
 import math
 import pytz
-import re
 
 # Define global variables
 NaN = float('NaN')
 
+# Define device configuration ID key, observation type, battery voltage index
+# and minimum online battery voltage
+DEVICES = {'tempest': ('TempestID', 'obs_st',      16, None),
+           'sky':     ('SkyID',     'obs_sky',     8,  2.0),
+           'out_air': ('OutAirID',  'obs_out_air', 6,  1.9),
+           'in_air':  ('InAirID',   'obs_in_air',  6,  1.9)}
+
+# Define expected interval between device observations [s]
+OB_INTERVAL = 60
+
 
 # ==============================================================================
 # Station STATUS CLASS
@@ -47,12 +61,20 @@ class station(Widget):
         super().__init__(**kwargs)
         self.status_data = properties.Status()
         self.offline_timeout = 600
+        self.stale_events = {}
+        self.ob_counts    = {device: rolling_count(86400, OB_INTERVAL) for device in DEVICES}
+        self.reconciled   = set()
+        self.count_start  = time.time()
+        self.health       = device_health()
         self.app = App.get_running_app()
-        self.set_status_panels()
         self.get_device_firmware()
 
     def set_status_panels(self):
 
+        """ Build the station and device status panels. Called when the main
+            menu is first opened
+        """
+
         self.station_status_panel = station_status()
         self.tempest_status_panel = tempest_status()
         self.sky_status_panel     = sky_status()
@@ -68,7 +90,9 @@ class station(Widget):
         template = 'https://swd.weatherflow.com/swd/rest/stations/{}?token={}'
         URL = template.format(self.app.config['Station']['StationID'], self.app.config['Keys']['WeatherFlow'])
         UrlRequest(URL,
+                   req_headers=http_cache.request_headers(URL),
                    on_success=self.parse_device_firmware,
+                   on_redirect=self.unchanged_device_firmware,
                    on_failure=self.fail_device_firmware,
                    on_error=self.fail_device_firmware,
                    timeout=int(self.app.config['System']['Timeout']),
@@ -78,6 +102,7 @@ class station(Widget):
 
         """ Parse hub firmware_revision from response returned by request.url
         """
+        http_cache.store(request.url, request.resp_headers, response)
         try:
             for station in response['stations']:
                 if station['station_id'] == int(self.app.config['Station']['StationID']):
@@ -88,9 +113,23 @@ class station(Widget):
                                 self.update_display()
                             if device['device_type'] == 'ST' and self.app.config['Station']['TempestID']:
                                 self.status_data['tempest_firmware'] = device['firmware_revision']
+                                self.on_observation('obs_st')
         except Exception:
             pass
 
+    def unchanged_device_firmware(self, request, response):
+
+        """ Station metadata returned by request.url has not changed since it
+            was last downloaded. Parse hub firmware_revision from the cached
+            response
+        """
+
+        response = http_cache.cached_body(request.url)
+        if request.resp_status == 304 and response is not None:
+            self.parse_device_firmware(request, response)
+        else:
+            self.fail_device_firmware(request, response)
+
     def fail_device_firmware(self, request, response):
 
         """ Failed to get hub firmware_revision from response returned by
@@ -99,218 +138,290 @@ class station(Widget):
 
         self.status_data['hub_firmware']     = '[color=d73027ff]Error[/color]'
         self.status_data['tempest_firmware'] = None
+        self.on_observation('obs_st')
 
     def get_observation_count(self):
 
-        """ Get last 24 hour observation count for all devices associated with
-            the Station ID
+        """ Reconcile the local rolling 24 hour observation count for each
+            device associated with the Station ID against the observations
+            held by WeatherFlow. Each device is reconciled once, so that
+            observations received before the console started are counted
         """
 
         # Calculate timestamp 24 hours past
         end_time   = int(time.time())
         start_time = end_time - int(3600 * 24)
 
-        # Get device observation counts
-        url_list  = []
+        # Local observation count covers the full 24 hours once the console
+        # has been running for 24 hours, so no reconciliation is required
+        if self.count_start <= start_time:
+            return
+
+        # Download device observations for devices that have not yet been
+        # reconciled
         template = 'https://swd.weatherflow.com/swd/rest/observations/device/{}?time_start={}&time_end={}&token={}'
-        if self.app.config['Station']['TempestID']:
-            url_list.append(template.format(self.app.config['Station']['TempestID'], start_time, end_time, self.app.config['Keys']['WeatherFlow']))
-        if self.app.config['Station']['SkyID']:
-            url_list.append(template.format(self.app.config['Station']['SkyID'],     start_time, end_time, self.app.config['Keys']['WeatherFlow']))
-        if self.app.config['Station']['OutAirID']:
-            url_list.append(template.format(self.app.config['Station']['OutAirID'],  start_time, end_time, self.app.config['Keys']['WeatherFlow']))
-        if self.app.config['Station']['InAirID']:
-            url_list.append(template.format(self.app.config['Station']['InAirID'],  start_time, end_time, self.app.config['Keys']['WeatherFlow']))
-        for URL in url_list:
-            UrlRequest(URL,
-                       on_success=self.parse_observation_count,
-                       on_failure=self.fail_observation_count,
-                       on_error=self.fail_observation_count,
-                       timeout=int(self.app.config['System']['Timeout']),
-                       ca_file=certifi.where())
+        for device, (id_key, _, _, _) in DEVICES.items():
+            if self.app.config['Station'][id_key] and device not in self.reconciled:
+                URL = template.format(self.app.config['Station'][id_key], start_time, end_time, self.app.config['Keys']['WeatherFlow'])
+                UrlRequest(URL,
+                           on_success=self.parse_observation_count,
+                           on_failure=self.fail_observation_count,
+                           on_error=self.fail_observation_count,
+                           timeout=int(self.app.config['System']['Timeout']),
+                           ca_file=certifi.where())
 
     def parse_observation_count(self, request, response):
 
-        """ Parse observation count from response returned by request.url """
+        """ Merge observations in response returned by request.url into the
+            local rolling observation count
+        """
 
         if 'Station' in self.app.config:
             if 'obs' in response and response['obs'] is not None:
-                if str(response['device_id']) == self.app.config['Station']['TempestID']:
-                    self.status_data['tempest_ob_count'] = str(len(response['obs']))
-                elif str(response['device_id']) == self.app.config['Station']['SkyID']:
-                    self.status_data['sky_ob_count'] = str(len(response['obs']))
-                elif str(response['device_id']) == self.app.config['Station']['OutAirID']:
-                    self.status_data['out_air_ob_count'] = str(len(response['obs']))
-                elif str(response['device_id']) == self.app.config['Station']['InAirID']:
-                    self.status_data['in_air_ob_count'] = str(len(response['obs']))
-                self.update_display()
+                for device, (id_key, _, _, _) in DEVICES.items():
+                    if str(response['device_id']) == self.app.config['Station'][id_key]:
+                        self.ob_counts[device].merge([ob[0] for ob in response['obs']])
+                        self.reconciled.add(device)
+                        self.set_ob_count(device)
+                        self.update_display()
 
     def fail_observation_count(self, request, response):
 
-        """ Failed to get observation count from response returned by
-            request.url
+        """ Failed to get observations from response returned by request.url.
+            Keep the local observation count, marked as partial, and try again
+            the next time the main menu is opened
         """
 
-        device_id = re.search(r'device\/(.*)\?', request.url).group(1)
-        if device_id == self.app.config['Station']['TempestID']:
-            self.status_data['tempest_ob_count'] = '[color=d73027ff]Error[/color]'
-        elif device_id == self.app.config['Station']['SkyID']:
-            self.status_data['sky_ob_count'] = '[color=d73027ff]Error[/color]'
-        elif device_id == self.app.config['Station']['OutAirID']:
-            self.status_data['out_air_ob_count'] = '[color=d73027ff]Error[/color]'
-        elif device_id == self.app.config['Station']['InAirID']:
-            self.status_data['in_air_ob_count'] = '[color=d73027ff]Error[/color]'
+        for device, (id_key, _, _, _) in DEVICES.items():
+            device_id = self.app.config['Station'][id_key]
+            if device_id and f'/observations/device/{device_id}?' in request.url:
+                Logger.warning(f'Status: {system().log_time()} - Unable to reconcile {device} observation count')
+                self.set_ob_count(device)
+                self.update_display()
+
+    def set_ob_count(self, device):
+
+        """ Set the rolling 24 hour observation count and number of dropped
+            observations for the specified device
+
+        INPUTS:
+            device              Device name (tempest, sky, out_air or in_air)
+        """
+
+        # Count is partial until the device has been reconciled or the console
+        # has been running for 24 hours
+        now = time.time()
+        received, dropped = self.ob_counts[device].count(now)
+        if device not in self.reconciled and self.count_start > now - 86400:
+            self.status_data[device + '_ob_count'] = f'{received} (since start)'
+        elif dropped:
+            self.status_data[device + '_ob_count'] = f'{received} [color=f9a825ff]({dropped} missed)[/color]'
+        else:
+            self.status_data[device + '_ob_count'] = str(received)
+
+    def on_observation(self, ob_type):
+
+        """ Update the status of the device that sent the latest observation.
+            Called on the main thread by the observation parser once the
+            observation has been applied to the display
+
+        INPUTS:
+            ob_type             Latest Websocket message type
+        """
+
+        for device, (_, device_ob_type, _, _) in DEVICES.items():
+            if ob_type == 'obs_reset':
+                self.health.clear()
+                self.ob_counts[device].clear()
+                self.reconciled.discard(device)
+                self.count_start = time.time()
+            if ob_type in [device_ob_type, 'obs_all', 'obs_reset']:
+                self.get_device_status(device)
+        self.set_station_status()
         self.update_display()
 
-    def get_device_status(self, dt):
+    def device_stale(self, device, dt):
 
-        """ Gets the current status of the devices and hub associated with the
-            Station ID
+        """ Update the status of a device that has not sent an observation
+            since its staleness timer was set
         """
 
-        # Define current station timezone
+        self.get_device_status(device)
+        self.set_station_status()
+        self.update_display()
+
+    def get_device_status(self, device):
+
+        """ Gets the current status of the specified device from its latest
+            observation and sets a timer to update the status once it next
+            changes without a new observation
+
+        INPUTS:
+            device              Device name (tempest, sky, out_air or in_air)
+        """
+
+        # Cancel existing staleness timer for device
+        if device in self.stale_events:
+            self.stale_events.pop(device).cancel()
+
+        # Get latest device observation
+        id_key, ob_type, voltage_index, min_voltage = DEVICES[device]
+        if not self.app.config['Station'][id_key] or ob_type not in self.app.CurrentConditions.Obs:
+            return
+        latest_ob        = self.app.CurrentConditions.Obs[ob_type]['obs'][0]
+        sample_time_diff = time.time() - latest_ob[0]
+        device_voltage   = float(latest_ob[voltage_index])
+
+        # Define device status based on sample age and battery voltage
+        if device == 'tempest':
+            device_status = self.tempest_mode(latest_ob)
+            online        = sample_time_diff < self.offline_timeout
+        else:
+            device_status = '[color=9aba2fff]Online[/color]'
+            online        = sample_time_diff < self.offline_timeout and device_voltage > min_voltage
+        if online:
+            sample_delay  = ''
+        else:
+            if sample_time_diff < 3600:
+                sample_delay = str(math.floor(sample_time_diff / 60)) + ' mins ago'
+            elif sample_time_diff < 7200:
+                sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hour ago'
+            elif sample_time_diff < 86400:
+                sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hours ago'
+            else:
+                sample_delay = str(math.floor(sample_time_diff / 86400)) + ' days ago'
+            device_status = '[color=d73027ff]Offline[/color]'
+
+        # Add observation to rolling observation count and update device
+        # health
+        self.ob_counts[device].append(latest_ob[0])
+        self.set_ob_count(device)
+        self.health.record_observation(device, latest_ob[0], device_voltage)
+        self.set_device_health(device)
+
+        # Store device status variables
         Tz = pytz.timezone(self.app.config['Station']['Timezone'])
+        self.status_data[device + '_sample_time'] = datetime.fromtimestamp(latest_ob[0], Tz).strftime('%H:%M:%S')
+        self.status_data[device + '_last_sample'] = sample_delay
+        self.status_data[device + '_voltage']     = '{:.2f}'.format(device_voltage)
+        self.status_data[device + '_status']      = device_status
+
+        # Set staleness timer to fire when the device reaches the offline
+        # threshold or, once offline, when the sample delay label next changes
+        if sample_time_diff < self.offline_timeout:
+            delay = self.offline_timeout - sample_time_diff
+        else:
+            unit  = 60 if sample_time_diff < 3600 else 3600 if sample_time_diff < 86400 else 86400
+            delay = unit - sample_time_diff % unit
+        self.stale_events[device] = Clock.schedule_once(partial(self.device_stale, device), delay)
+
+    def tempest_mode(self, latest_ob):
+
+        """ Gets the TEMPEST power mode from the latest observation
 
-        # Get TEMPEST device status
-        if self.app.config['Station']['TempestID'] and 'obs_st' in self.app.CurrentConditions.Obs:
-            latest_ob        = self.app.CurrentConditions.Obs['obs_st']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
-            device_voltage   = float(latest_ob[16])
-            wind_interval    = float(latest_ob[5])
-            if self.status_data['tempest_firmware'] is not None: 
-                if int(self.status_data['tempest_firmware']) < 175:
+        INPUTS:
+            latest_ob           Latest TEMPEST observation
+
+        OUTPUT:
+            device_status       TEMPEST power mode label
+        """
+
+        device_voltage = float(latest_ob[16])
+        wind_interval  = float(latest_ob[5])
+        device_status  = '[color=ef6c00ff]Unknown[/color]'
+        if self.status_data['tempest_firmware'] is not None:
+            if int(self.status_data['tempest_firmware']) < 175:
+                if int(wind_interval) == 3:
+                    device_status = '[color=9aba2fff]Mode 0[/color]'
+                elif int(wind_interval) == 20:
+                    device_status = '[color=9aba2fff]Mode 0*[/color]'
+                elif int(wind_interval) == 6:
+                    device_status = '[color=f9a825ff]Mode 1[/color]'
+                elif int(wind_interval) == 60:
+                    device_status = '[color=ef6c00ff]Mode 2[/color]'
+                elif int(wind_interval) == 300:
+                    device_status = '[color=b71c1cff]Mode 3[/color]'
+            elif int(self.status_data['tempest_firmware']) >= 175:
+                if device_voltage >= 2.65:
+                    device_status = '[color=9aba2fff]Mode 0[/color]'
+                elif device_voltage <= 2.4:
+                    device_status = '[color=b71c1cff]Mode 3[/color]'
+                else:
                     if int(wind_interval) == 3:
-                        device_status = '[color=9aba2fff]Mode 0[/color]'
-                    elif int(wind_interval) == 20:
-                        device_status = '[color=9aba2fff]Mode 0*[/color]'
+                        device_status = '[color=f9a825ff]Dynamic 3s[/color]'
                     elif int(wind_interval) == 6:
-                        device_status = '[color=f9a825ff]Mode 1[/color]'
-                    elif int(wind_interval) == 60:
-                        device_status = '[color=ef6c00ff]Mode 2[/color]'
-                    elif int(wind_interval) == 300:
-                        device_status = '[color=b71c1cff]Mode 3[/color]'
-                    else:
-                        device_status = '[color=ef6c00ff]Unknown[/color]'
-                elif int(self.status_data['tempest_firmware']) >= 175:
-                    if device_voltage >= 2.65:
-                        device_status = '[color=9aba2fff]Mode 0[/color]'
-                    elif device_voltage <= 2.4:
-                        device_status = '[color=b71c1cff]Mode 3[/color]'
-                    else:
-                        if int(wind_interval) == 3:
-                            device_status = '[color=f9a825ff]Dynamic 3s[/color]'
-                        elif int(wind_interval) == 6:
-                            device_status = '[color=f9a825ff]Dynamic 6s[/color]'
-                        elif int(wind_interval) == 15:
-                            device_status = '[color=f9a825ff]Dynamic 15s[/color]'
-                        else:
-                            device_status = '[color=ef6c00ff]Unknown[/color]'
-            else:
-                device_status = '[color=ef6c00ff]Unknown[/color]'
-            if sample_time_diff < self.offline_timeout:
-                sample_delay  = ''
-            else:
-                if sample_time_diff < 3600:
-                    sample_delay = str(math.floor(sample_time_diff / 60)) + ' mins ago'
-                elif sample_time_diff < 7200:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hour ago'
-                elif sample_time_diff < 86400:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hours ago'
-                else:
-                    sample_delay = str(math.floor(sample_time_diff / 86400)) + ' days ago'
-                device_status = '[color=d73027ff]Offline[/color]'
-
-            # Store TEMPEST device status variables
-            self.status_data['tempest_sample_time'] = datetime.fromtimestamp(latest_ob[0], Tz).strftime('%H:%M:%S')
-            self.status_data['tempest_last_sample'] = sample_delay
-            self.status_data['tempest_voltage']     = '{:.2f}'.format(device_voltage)
-            self.status_data['tempest_status']      = device_status
-
-        # Get SKY device status
-        if self.app.config['Station']['SkyID'] and 'obs_sky' in self.app.CurrentConditions.Obs:
-            latest_ob        = self.app.CurrentConditions.Obs['obs_sky']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
-            device_voltage   = float(latest_ob[8])
-            if sample_time_diff < self.offline_timeout and device_voltage > 2.0:
-                device_status = '[color=9aba2fff]Online[/color]'
-                sample_delay  = ''
-            else:
-                if sample_time_diff < 3600:
-                    sample_delay = str(math.floor(sample_time_diff / 60)) + ' mins ago'
-                elif sample_time_diff < 7200:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hour ago'
-                elif sample_time_diff < 86400:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hours ago'
-                else:
-                    sample_delay = str(math.floor(sample_time_diff / 86400)) + ' days ago'
-                device_status = '[color=d73027ff]Offline[/color]'
-
-            # Store SKY device status variables
-            self.status_data['sky_sample_time'] = datetime.fromtimestamp(latest_ob[0], Tz).strftime('%H:%M:%S')
-            self.status_data['sky_last_sample'] = sample_delay
-            self.status_data['sky_voltage']     = '{:.2f}'.format(device_voltage)
-            self.status_data['sky_status']      = device_status
-
-        # Get outdoor AIR device status
-        if self.app.config['Station']['OutAirID'] and 'obs_out_air' in self.app.CurrentConditions.Obs:
-            latest_ob        = self.app.CurrentConditions.Obs['obs_out_air']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
-            device_voltage   = float(latest_ob[6])
-            if sample_time_diff < self.offline_timeout and device_voltage > 1.9:
-                device_status = '[color=9aba2fff]Online[/color]'
-                sample_delay  = ''
-            else:
-                if sample_time_diff < 3600:
-                    sample_delay = str(math.floor(sample_time_diff / 60)) + ' mins ago'
-                elif sample_time_diff < 7200:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hour ago'
-                elif sample_time_diff < 86400:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hours ago'
-                else:
-                    sample_delay = str(math.floor(sample_time_diff / 86400)) + ' days ago'
-                device_status = '[color=d73027ff]Offline[/color]'
-
-            # Store outdoor AIR device status variables
-            self.status_data['out_air_sample_time'] = datetime.fromtimestamp(latest_ob[0], Tz).strftime('%H:%M:%S')
-            self.status_data['out_air_last_sample'] = sample_delay
-            self.status_data['out_air_voltage']     = '{:.2f}'.format(device_voltage)
-            self.status_data['out_air_status']      = device_status
-
-        # Get indoor AIR device status
-        if self.app.config['Station']['InAirID'] and 'obs_in_air' in self.app.CurrentConditions.Obs:
-            latest_ob        = self.app.CurrentConditions.Obs['obs_in_air']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
-            device_voltage   = float(latest_ob[6])
-            if sample_time_diff < self.offline_timeout and device_voltage > 1.9:
-                device_status = '[color=9aba2fff]Online[/color]'
-                sample_delay  = ''
-            else:
-                if sample_time_diff < 3600:
-                    sample_delay = str(math.floor(sample_time_diff / 60)) + ' mins ago'
-                elif sample_time_diff < 7200:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hour ago'
-                elif sample_time_diff < 86400:
-                    sample_delay = str(math.floor(sample_time_diff / 3600)) + ' hours ago'
-                else:
-                    sample_delay = str(math.floor(sample_time_diff / 86400)) + ' days ago'
-                device_status = '[color=d73027ff]Offline[/color]'
+                        device_status = '[color=f9a825ff]Dynamic 6s[/color]'
+                    elif int(wind_interval) == 15:
+                        device_status = '[color=f9a825ff]Dynamic 15s[/color]'
+        return device_status
+
+    def set_device_health(self, device):
 
-            # Store AIR device status variables
-            self.status_data['in_air_sample_time'] = datetime.fromtimestamp(latest_ob[0], Tz).strftime('%H:%M:%S')
-            self.status_data['in_air_last_sample'] = sample_delay
-            self.status_data['in_air_voltage']     = '{:.2f}'.format(device_voltage)
-            self.status_data['in_air_status']      = device_status
+        """ Set the battery voltage trend, signal strength, uptime and sensor
+            status flags for the specified device
+
+        INPUTS:
+            device              Device name (tempest, sky, out_air or in_air)
+        """
+
+        summary = self.health.summary(device)
+        fields  = []
+        if summary is not None:
+            if summary['trend'] is not None:
+                fields.append('Battery {:+.2f} v/day'.format(summary['trend']))
+            if summary['rssi'] is not None:
+                fields.append(f'Signal {summary["rssi"]} dBm')
+            if summary['uptime'] is not None:
+                fields.append('Uptime ' + self.format_uptime(summary['uptime'], summary['resets']))
+            for label, colour in summary['flags']:
+                fields.append(f'[color={colour}]{label}[/color]')
+        self.status_data[device + '_health'] = '  |  '.join(fields) if fields else '-'
+
+    def set_hub_health(self):
+
+        """ Set the hub signal strength and uptime
+        """
+
+        summary = self.health.summary('hub')
+        if summary is not None:
+            if summary['rssi'] is not None:
+                self.status_data['hub_signal'] = f'{summary["rssi"]} dBm'
+            if summary['uptime'] is not None:
+                self.status_data['hub_uptime'] = self.format_uptime(summary['uptime'], summary['resets'])
+
+    def format_uptime(self, uptime, resets):
+
+        """ Format device uptime and number of resets in the last seven days
+
+        INPUTS:
+            uptime              Device uptime                                [s]
+            resets              Number of device resets
+
+        OUTPUT:
+            uptime              Formatted uptime
+        """
+
+        if uptime < 3600:
+            uptime = str(math.floor(uptime / 60)) + ' mins'
+        elif uptime < 86400:
+            uptime = str(math.floor(uptime / 3600)) + ' hours'
+        else:
+            uptime = str(math.floor(uptime / 86400)) + ' days'
+        if resets:
+            uptime += f' [color=ef6c00ff]({resets} resets)[/color]'
+        return uptime
+
+    def set_station_status(self):
+
+        """ Set hub status (i.e. station_status) based on device status
+        """
+
+        self.set_hub_health()
 
-        # Set hub status (i.e. station_status) based on device status
         device_status_list = []
-        if self.app.config['Station']['TempestID'] and 'obs_st' in self.app.CurrentConditions.Obs:
-            device_status_list.append(self.status_data['tempest_status'])
-        if self.app.config['Station']['SkyID'] and 'obs_sky' in self.app.CurrentConditions.Obs:
-            device_status_list.append(self.status_data['sky_status'])
-        if self.app.config['Station']['OutAirID'] and 'obs_out_air' in self.app.CurrentConditions.Obs:
-            device_status_list.append(self.status_data['out_air_status'])
-        if self.app.config['Station']['InAirID'] and 'obs_in_air' in self.app.CurrentConditions.Obs:
-            device_status_list.append(self.status_data['in_air_status'])
+        for device, (id_key, ob_type, _, _) in DEVICES.items():
+            if self.app.config['Station'][id_key] and ob_type in self.app.CurrentConditions.Obs:
+                device_status_list.append(self.status_data[device + '_status'])
         if not device_status_list or all('-' in status for status in device_status_list):
             self.status_data['station_status'] = '[color=c8c8c8ff]-[/color]'
         elif all('Offline' in status for status in device_status_list):
@@ -322,24 +433,13 @@ class station(Widget):
         else:
             self.status_data['station_status'] = '[color=ef6c00ff]Partly Offline[/color]'
 
-        # Update display with new status
-        self.update_display()
-
     def update_display(self):
 
-        """ Update display with new Status variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Update display with new Status variables
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.status_data.items()):
-            try:
-                self.app.CurrentConditions.Status[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'status: {system().log_time()} - Reference error')
-                    reference_error = True
+        # Push changed display values to update bus
+        self.app.update_bus.push('status', 'Status', self.status_data, changed_only=True)
 
 
 # ==============================================================================
@@ -72,8 +72,9 @@ class system():
                 Tz = pytz.timezone(self.app.config['Station']['Timezone'])
 
                 # Format realtime Clock
-                self.system_data['Time'] = datetime.fromtimestamp(time.time(), Tz).strftime(TimeFormat)
-                self.system_data['Date'] = datetime.fromtimestamp(time.time(), Tz).strftime(DateFormat)
+                Now = datetime.fromtimestamp(time.time(), Tz)
+                self.system_data['Time'] = Now.strftime(TimeFormat)
+                self.system_data['Date'] = Now.strftime(DateFormat)
                 self.update_display()
 
     def check_version(self, dt):
@@ -129,16 +130,8 @@ class system():
 
     def update_display(self):
 
-        """ Update display with new System variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Update display with new System variables
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.system_data.items()):
-            try:
-                self.app.CurrentConditions.System[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'System: {self.log_time()} - Reference error')
-                    reference_error = True
+        # Push changed display values to update bus
+        self.app.update_bus.push('system', 'System', self.system_data, changed_only=True)
@@ -0,0 +1,132 @@
+""" Defines the frame-coalesced display update bus required by the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.system   import system
+
+# Import required Kivy modules
+from kivy.logger  import Logger
+from kivy.clock   import Clock
+from kivy.app     import App
+
+# Import required Python modules
+import threading
+import copy
+
+
+# ==============================================================================
+# update_bus CLASS
+# ==============================================================================
+class update_bus():
+
+    """ Collects pending display changes from all data producers and applies
+    them to the CurrentConditions dictionary properties in a single Clock
+    callback per frame. Producers may push from any thread. Values pushed to
+    the same key before the next frame are coalesced so that only the latest
+    value is written to the display. Producers that push their full data
+    dictionary on a timer can ask for unchanged values to be dropped
+    """
+
+    def __init__(self):
+        self.app       = App.get_running_app()
+        self.lock      = threading.Lock()
+        self.pending   = {}
+        self.pushed    = {}
+        self.callbacks = []
+        self.scheduled = False
+        self.stats     = {'frames': 0}
+
+    def push(self, producer, target, changes, callback=None, changed_only=False):
+
+        """ Queue display changes to be applied on the next frame
+
+        INPUTS:
+            producer            Name of data producer pushing the changes
+            target              Name of CurrentConditions dictionary property
+            changes             Dictionary of display keys and values
+            callback            Optional function, args tuple to call on the
+                                main thread once the changes have been applied
+            changed_only        Drop values that are identical to those last
+                                pushed to the target. Producers must use the
+                                flag consistently for a given target
+        """
+
+        with self.lock:
+            counters = self.stats.setdefault(producer, {'pushes': 0, 'values': 0, 'coalesced': 0, 'skipped': 0, 'applied': 0})
+            counters['pushes'] += 1
+
+            # Drop unchanged values. Pushed values are copied as producers
+            # update some values in place
+            if changed_only:
+                pushed  = self.pushed.setdefault(target, {})
+                changed = {}
+                for key, value in changes.items():
+                    if key not in pushed or pushed[key] != value:
+                        changed[key] = value
+                        pushed[key]  = copy.deepcopy(value)
+                counters['skipped'] += len(changes) - len(changed)
+                changes = changed
+                if not changes and callback is None:
+                    return
+
+            # Queue changes and schedule flush on next frame
+            counters['values'] += len(changes)
+            pending = self.pending.setdefault(target, {})
+            for key, value in changes.items():
+                if key in pending:
+                    counters['coalesced'] += 1
+                pending[key] = (producer, value)
+            if callback is not None and callback not in self.callbacks:
+                self.callbacks.append(callback)
+            if not self.scheduled:
+                self.scheduled = True
+                Clock.schedule_once(self.flush, 0)
+
+    def flush(self, dt=None):
+
+        """ Apply all pending display changes and run any queued callbacks.
+        Catch ReferenceErrors to prevent console crashing
+        """
+
+        # Swap out pending changes so that producers can continue pushing
+        # while the display is updated
+        with self.lock:
+            pending, self.pending     = self.pending, {}
+            callbacks, self.callbacks = self.callbacks, []
+            self.scheduled = False
+            self.stats['frames'] += 1
+
+        # Apply pending changes to display
+        applied = {}
+        reference_error = set()
+        for target, changes in pending.items():
+            display = getattr(self.app.CurrentConditions, target)
+            for key, (producer, value) in changes.items():
+                try:
+                    display[key] = value
+                    applied[producer] = applied.get(producer, 0) + 1
+                except ReferenceError:
+                    if producer not in reference_error:
+                        Logger.warning(f'{producer}: {system().log_time()} - Reference error')
+                        reference_error.add(producer)
+        with self.lock:
+            for producer, count in applied.items():
+                self.stats[producer]['applied'] += count
+
+        # Run queued callbacks now that the display has been updated
+        for function, args in callbacks:
+            function(*args)
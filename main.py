@@ -21,6 +21,12 @@
 SHUTDOWN = 0
 REBOOT = 0
 
+# ==============================================================================
+# START STARTUP TIMING REPORT IF WFPICONSOLE_STARTUP_TIMING IS SET
+# ==============================================================================
+# Import required modules
+from lib import startup_timer
+
 # ==============================================================================
 # SET KIVY_LOG_MODE TO MIXED
 # ==============================================================================
@@ -42,12 +48,14 @@ if not Path('wfpiconsole.ini').is_file():
     configFile.create()
 else:
     configFile.update()
+startup_timer.mark('wfpiconsole.ini')
 
 # ==============================================================================
 # INITIALISE KIVY GRAPHICS WINDOW BASED ON CURRENT HARDWARE TYPE
 # ==============================================================================
 # Import required modules
 import configparser
+import io
 
 # Load wfpiconsole.ini config file
 config = configparser.ConfigParser()
@@ -66,43 +74,46 @@ if config['System']['Hardware'] != 'Other':
 from kivy.config import Config as kivyconfig                                    # type: ignore
 
 # Generate default wfpiconsole Kivy config file. Config file is always
-# regenerated to ensure changes to the default file are always copied across
+# regenerated to ensure changes to the default file are always copied across,
+# but is only written to disk when its contents have changed
 defaultconfig = configparser.ConfigParser()
 defaultconfig.read(os.path.expanduser('~/.kivy/') + 'config.ini')
-with open(os.path.expanduser('~/.kivy/') + 'config_wfpiconsole.ini', 'w') as cfg:
-    defaultconfig.write(cfg)
-
-# Load wfpiconsole Kivy configuration file
-kivyconfig.read(os.path.expanduser('~/.kivy/') + 'config_wfpiconsole.ini')
 
 # Set Kivy window properties
 if int(config['Display']['Fullscreen']):
-    kivyconfig.set('graphics', 'fullscreen', 'auto')
+    defaultconfig.set('graphics', 'fullscreen', 'auto')
 else:
-    kivyconfig.set('graphics', 'fullscreen', '0')
-    kivyconfig.set('graphics', 'width',  config['Display']['Width'])
-    kivyconfig.set('graphics', 'height', config['Display']['Height'])
+    defaultconfig.set('graphics', 'fullscreen', '0')
+    defaultconfig.set('graphics', 'width',  config['Display']['Width'])
+    defaultconfig.set('graphics', 'height', config['Display']['Height'])
 if int(config['Display']['Border']):
-    kivyconfig.set('graphics', 'borderless', '0')
+    defaultconfig.set('graphics', 'borderless', '0')
 else:
-    kivyconfig.set('graphics', 'borderless', '1')
+    defaultconfig.set('graphics', 'borderless', '1')
 
 # ==============================================================================
 # INITIALISE MOUSE SUPPORT IF OPTION SET in wfpiconsole.ini
 # ==============================================================================
 # Initialise mouse support if required
 if int(config['Display']['Cursor']):
-    kivyconfig.set('graphics', 'show_cursor', '1')
+    defaultconfig.set('graphics', 'show_cursor', '1')
     if 'Pi' in config['System']['Hardware']:
-        kivyconfig.set('input', 'mouse', 'mouse')
-        kivyconfig.remove_option('input', 'mtdev_%(name)s')
+        defaultconfig.set('input', 'mouse', 'mouse')
+        defaultconfig.remove_option('input', 'mtdev_%(name)s')
 else:
-    kivyconfig.set('graphics', 'show_cursor', '0')
+    defaultconfig.set('graphics', 'show_cursor', '0')
     if 'Pi' in config['System']['Hardware']:
-        kivyconfig.remove_option('input', 'mouse')
+        defaultconfig.remove_option('input', 'mouse')
 
-# Save wfpiconsole Kivy configuration file
-kivyconfig.write()
+# Save wfpiconsole Kivy configuration file if it has changed and load it
+kivy_config_file = os.path.expanduser('~/.kivy/') + 'config_wfpiconsole.ini'
+kivy_config_text = io.StringIO()
+defaultconfig.write(kivy_config_text)
+if not Path(kivy_config_file).is_file() or Path(kivy_config_file).read_text() != kivy_config_text.getvalue():
+    with open(kivy_config_file, 'w') as cfg:
+        cfg.write(kivy_config_text.getvalue())
+kivyconfig.read(kivy_config_file)
+startup_timer.mark('Kivy configuration')
 
 # ==============================================================================
 # IMPORT REQUIRED CORE KIVY MODULES
@@ -123,25 +134,22 @@ from kivy.app                import App
 from lib.system       import system
 from lib.astronomical import astro
 from lib.forecast     import forecast
-from lib.sager        import sager_forecast
 from lib.status       import station
-from lib              import settings     as userSettings
+from lib              import observation_format
+from lib.update_bus   import update_bus
+from lib.scheduler    import scheduler
 from lib              import properties
 from lib              import config
+from lib.config_snapshot import config_snapshot
+from lib.config_writer   import config_writer
 
 # ==============================================================================
 # IMPORT REQUIRED PANELS
 # ==============================================================================
-from panels.temperature import TemperaturePanel,   TemperatureButton            # type: ignore # noqa: F401
-from panels.barometer   import BarometerPanel,     BarometerButton              # type: ignore # noqa: F401
-from panels.lightning   import LightningPanel,     LightningButton              # type: ignore # noqa: F401
-from panels.wind        import WindSpeedPanel,     WindSpeedButton              # type: ignore # noqa: F401
-from panels.forecast    import ForecastPanel,      ForecastButton               # type: ignore # noqa: F401
-from panels.forecast    import SagerPanel,         SagerButton                  # type: ignore # noqa: F401
-from panels.rainfall    import RainfallPanel,      RainfallButton               # type: ignore # noqa: F401
-from panels.astro       import SunriseSunsetPanel, SunriseSunsetButton          # type: ignore # noqa: F401
-from panels.astro       import MoonPhasePanel,     MoonPhaseButton              # type: ignore # noqa: F401
-from panels.menu        import mainMenu
+# Built-in panels are imported by the panel registry when first displayed. The
+# main menu is imported by the Factory when first opened
+from panels             import registry as panel_registry
+Factory.register('mainMenu', module='panels.menu')
 
 # ==============================================================================
 # IMPORT CUSTOM USER PANELS
@@ -149,12 +157,17 @@ from panels.menu        import mainMenu
 if Path('user/customPanels.py').is_file():
     from user.customPanels import *                                              # noqa: F401,F403
 
+# Register custom user panels
+panel_registry.register_namespace(globals())
+
 # ==============================================================================
 # IMPORT REQUIRED SYSTEM MODULES
 # ==============================================================================
+from functools     import partial
 from runpy         import run_path
 import subprocess
 import threading
+import time
 
 # ==============================================================================
 # IMPORT REQUIRED KIVY GRAPHICAL AND SETTINGS MODULES
@@ -162,6 +175,7 @@ import threading
 from kivy.uix.screenmanager  import ScreenManager, Screen, NoTransition
 from kivy.uix.settings       import SettingsWithSidebar, SettingBoolean
 from kivy.uix.switch         import Switch
+startup_timer.mark('Module imports')
 
 
 # ==============================================================================
@@ -188,6 +202,10 @@ class wfpiconsole(App):
         from kivy.modules import inspector
         inspector.create_inspector(Window, self)
 
+        # Initialise display update bus and display task scheduler
+        self.update_bus = update_bus()
+        self.scheduler  = scheduler()
+
         # Load Custom Panel KV file if present
         if Path('user/customPanels.py').is_file():
             Builder.load_file('user/customPanels.kv')
@@ -195,6 +213,10 @@ class wfpiconsole(App):
         # Initialise ScreenManager
         self.screenManager = screenManager(transition=NoTransition())
         self.screenManager.add_widget(CurrentConditions())
+        startup_timer.mark('First screen built')
+
+        # Complete initialisation once the first frame has been drawn
+        self.window.bind(on_flip=self.on_first_frame)
 
         # Start Websocket or UDP service
         self.start_connection_service()
@@ -203,19 +225,74 @@ class wfpiconsole(App):
         self.system = system()
         Clock.schedule_once(self.system.check_version)
 
+        # Verify station details in the background
+        Clock.schedule_once(self.verify_station)
+
         # Set Settings syle class
         self.settings_cls = SettingsWithSidebar
 
         # Initialise realtime clock
-        self.Sched.realtimeClock = Clock.schedule_interval(self.system.realtimeClock, 1.0)
+        self.scheduler.add('realtimeClock', self.system.realtimeClock, 1)
+
+        # Benchmark panel switch latency if requested
+        if os.environ.get('WFPICONSOLE_BENCHMARK_SWITCH'):
+            Clock.schedule_once(partial(self.CurrentConditions.benchmark_switch, os.environ['WFPICONSOLE_BENCHMARK_SWITCH']), 10)
 
         # Return ScreenManager
         return self.screenManager
 
+    # COMPLETE INITIALISATION ONCE FIRST FRAME HAS BEEN DRAWN
+    # --------------------------------------------------------------------------
+    def on_first_frame(self, *args):
+        self.window.unbind(on_flip=self.on_first_frame)
+        startup_timer.mark('First frame')
+        Clock.schedule_once(self.CurrentConditions.deferred_init)
+
     # DISCONNECT connection_client WHEN CLOSING APP
     # --------------------------------------------------------------------------
     def on_stop(self):
+        self.config_writer.flush_now()
         self.stop_connection_service()
+        if hasattr(self, 'obsParser'):
+            self.obsParser.save_state(self.config_snapshot)
+
+    # VERIFY STATION DETAILS AGAINST LATEST STATION METADATA IN A BACKGROUND
+    # THREAD SO THAT STARTUP DOES NOT WAIT FOR THE WEATHERFLOW REST API
+    # --------------------------------------------------------------------------
+    def verify_station(self, *largs):
+        snapshot = self.config_snapshot
+        if not snapshot.rest_api or not snapshot['Keys']['WeatherFlow'] or not snapshot.station_id:
+            return
+        threading.Thread(target=self.fetch_station, args=[snapshot], daemon=True, name='verify_station').start()
+
+    def fetch_station(self, snapshot):
+        Logger.info(f'Config: {self.system.log_time()} - Verifying station details')
+        station = config.fetch_station(snapshot)
+        if station is None:
+            Logger.warning(f'Config: {self.system.log_time()} - Unable to fetch station metadata')
+            return
+        changes = config.station_changes(snapshot, station)
+        if changes:
+            Clock.schedule_once(partial(self.update_station, snapshot.station_id, changes))
+
+    def update_station(self, station_id, changes, *largs):
+        if self.config['Station']['StationID'] != station_id:
+            return
+        for key, value in changes.items():
+            self.config.set('Station', key, value)
+            Logger.info(f'Config: {self.system.log_time()} - Updating station {key.lower()}')
+        self.config.write()
+        self.config_snapshot = config_snapshot(self.config)
+
+        # Recalculate astronomical events and forecasts for the updated station
+        # location or timezone
+        if set(changes) & {'Latitude', 'Longitude', 'Elevation', 'Timezone'}:
+            if hasattr(self, 'forecast'):
+                self.forecast.reset_forecast()
+            if hasattr(self, 'astro'):
+                self.astro.reset_astro()
+            if hasattr(self, 'sager'):
+                self.sager.reset_forecast()
 
     # SET DISPLAY SCALE FACTOR BASED ON SCREEN DIMENSIONS
     # --------------------------------------------------------------------------
@@ -231,11 +308,20 @@ class wfpiconsole(App):
     def build_config(self, config):
         config.optionxform = str
         config.read('wfpiconsole.ini')
+        self.config_snapshot = config_snapshot(config)
+
+        # Batch writes of the configuration file and write them atomically in
+        # a background thread
+        self.config_writer = config_writer(config, 'wfpiconsole.ini')
+        config.write       = self.config_writer.write
 
     # BUILD 'WeatherFlowPiConsole' APP CLASS SETTINGS
     # --------------------------------------------------------------------------
     def build_settings(self, settings):
 
+        # Import settings module when settings screen is first opened
+        from lib import settings as userSettings
+
         # Register setting types
         settings.register_type('ScrollOptions',     userSettings.ScrollOptions)
         settings.register_type('FixedOptions',      userSettings.FixedOptions)
@@ -268,7 +354,7 @@ class wfpiconsole(App):
     # --------------------------------------------------------------------------
     def close_settings(self, *args):
         if self.screenManager.current == 'Settings':
-            mainMenu().open(animation=False)
+            Factory.mainMenu().open(animation=False)
             self.screenManager.current = self.screenManager.previous()
             self.settingsScreen.remove_widget(self.settings)
             return True
@@ -278,11 +364,17 @@ class wfpiconsole(App):
     # --------------------------------------------------------------------------
     def on_config_change(self, config, section, key, value):
 
+        # Clear compiled unit conversion and format plans when units are
+        # changed
+        if section == 'Units':
+            observation_format.clear_cache()
+
         # Update current weather forecast when temperature or wind speed units
         # are changed
         if section == 'Units' and key in ['Temp', 'Wind']:
             self.forecast.parse_forecast()
-            self.sager.get_forecast_text()
+            if hasattr(self, 'sager'):
+                self.sager.get_forecast_text()
 
         # Update current weather forecast, sunrise/sunset and moonrise/moonset
         # times when time format changed
@@ -297,6 +389,12 @@ class wfpiconsole(App):
                 for panel in getattr(self, 'TemperaturePanel'):
                     panel.set_indoor_temp_display()
 
+        # Show or hide rolling mean wind speed when setting is changed
+        if section == 'Display' and key == 'RollingWind':
+            if hasattr(self, 'WindSpeedPanel'):
+                for panel in getattr(self, 'WindSpeedPanel'):
+                    panel.set_rolling_wind_display()
+
         # Update "Feels Like" temperature cutoffs in wfpiconsole.ini and the
         # settings screen when temperature units are changed
         if section == 'Units' and key == 'Temp':
@@ -334,15 +432,9 @@ class wfpiconsole(App):
             panel_list = ['panel_' + Num for Num in ['one', 'two', 'three', 'four', 'five', 'six']]
             for ii, (panel, type) in enumerate(self.config['PrimaryPanels'].items()):
                 if panel == key:
-                    old_panel = self.CurrentConditions.ids[panel_list[ii]].children[0]
-                    self.CurrentConditions.ids[panel_list[ii]].clear_widgets()
-                    self.CurrentConditions.ids[panel_list[ii]].add_widget(eval(type + 'Panel')())
+                    self.CurrentConditions.panel_cache.detach_slot(self.CurrentConditions.ids[panel_list[ii]])
+                    self.CurrentConditions.ids[panel_list[ii]].add_widget(self.CurrentConditions.panel_cache.get(type, panel_list[ii]))
                     break
-            if hasattr(self, old_panel.__class__.__name__):
-                try:
-                    getattr(self,  old_panel.__class__.__name__).remove(old_panel)
-                except ValueError:
-                    Logger.warning('Unable to remove panel reference from wfpiconsole class')
 
         # Update button layout displayed on CurrentConditions screen
         if section == 'SecondaryPanels':
@@ -363,7 +455,7 @@ class wfpiconsole(App):
                 primary_panel   = primary_panel_list[ii][1]
                 secondary_panel = secondary_panel_list[ii][1]
                 if secondary_panel and secondary_panel != 'None':
-                    self.CurrentConditions.ids[button_ids[button_number]].add_widget(eval(secondary_panel + 'Button')())
+                    self.CurrentConditions.ids[button_ids[button_number]].add_widget(panel_registry.button_class(secondary_panel)())
                     self.CurrentConditions.button_list.append([button_ids[button_number], panel_list[ii], primary_panel, secondary_panel, 'primary'])
                     button_number += 1
 
@@ -382,7 +474,7 @@ class wfpiconsole(App):
                                     break
 
         # Update Sager Forecast schedule
-        if section == 'System' and key == 'SagerInterval':
+        if section == 'System' and key == 'SagerInterval' and hasattr(self, 'sager'):
             Clock.schedule_once(self.sager.schedule_forecast)
 
         # Force rest_api services if Websocket connection is selected
@@ -401,6 +493,9 @@ class wfpiconsole(App):
                                         if isinstance(child, Switch):
                                             child.active = True
 
+        # Swap in a new configuration snapshot holding the changed settings
+        self.config_snapshot = config_snapshot(self.config)
+
         # Switch connection type or change between Device/Statistics API endpoint
         if section == 'System' and (key == 'Connection' or key == 'stats_endpoint'):
             self.stop_connection_service()
@@ -479,28 +574,47 @@ class CurrentConditions(Screen):
         self.Obs    = properties.Obs()
 
         # Add display panels
+        self.panel_cache = panel_registry.panel_cache()
         self.add_panels()
 
-        # Schedule Station.getDeviceStatus to be called each second
+        # Initialise station and device status. Device status is updated by
+        # the observation parser as each new observation arrives
         self.app.station = station()
-        self.app.Sched.deviceStatus = Clock.schedule_interval(self.app.station.get_device_status, 1.0)
 
         # Initialise Sunrise, Sunset, Moonrise and Moonset times
         self.app.astro = astro()
         self.app.astro.sunrise_sunset()
         self.app.astro.moonrise_moonset()
 
-        # Schedule sunTransit and moonPhase functions to be called each second
-        self.app.Sched.sun_transit = Clock.schedule_interval(self.app.astro.sun_transit, 1)
-        self.app.Sched.moon_phase  = Clock.schedule_interval(self.app.astro.moon_phase, 1)
+        # Schedule sunTransit and moonPhase functions to be called each minute
+        self.app.scheduler.add('sun_transit', self.app.astro.sun_transit, 60)
+        self.app.scheduler.add('moon_phase',  self.app.astro.moon_phase,  60)
 
         # Schedule WeatherFlow weather forecast download
         self.app.forecast = forecast()
+        self.app.forecast.load_forecast()
         self.app.Sched.metDownload = Clock.schedule_once(self.app.forecast.fetch_forecast)
 
+    # INITIALISE SERVICES AND PANELS NOT REQUIRED FOR THE FIRST FRAME
+    # --------------------------------------------------------------------------
+    def deferred_init(self, *args):
+
         # Generate Sager Weathercaster forecast
+        from lib.sager import sager_forecast
         self.app.sager = sager_forecast()
         self.app.Sched.sager = Clock.schedule_once(self.app.sager.fetch_forecast)
+        startup_timer.mark('Sager forecast')
+
+        # Load remaining built-in panels, one per frame
+        self.app.Sched.panel_preload = Clock.schedule_interval(self.preload_panels, 0)
+
+    # LOAD NEXT UNUSED BUILT-IN PANEL
+    # --------------------------------------------------------------------------
+    def preload_panels(self, *args):
+        if not panel_registry.preload():
+            startup_timer.mark('Panel preload')
+            startup_timer.report()
+            return False
 
     # ADD USER SELECTED PANELS TO CURRENT CONDITIONS SCREEN
     # --------------------------------------------------------------------------
@@ -511,6 +625,7 @@ class CurrentConditions(Screen):
             button_list = ['button_' + Num for Num in ['one', 'two', 'three', 'four', 'five', 'six']]
             for button in button_list:
                 self.ids[button].clear_widgets()
+            self.panel_cache.detach_all()
             self.ids['row_layout'].clear_widgets()
 
         # Define required variables
@@ -540,10 +655,10 @@ class CurrentConditions(Screen):
                 primary_panel     = primary_panels[panel_count][1]
                 secondary_panel   = secondary_panels[panel_count][1]
                 self.ids[panel_id] = BoxLayout()
-                self.ids[panel_id].add_widget(eval(primary_panel + 'Panel')())
+                self.ids[panel_id].add_widget(self.panel_cache.get(primary_panel, panel_id))
                 row_box_layout.add_widget(self.ids[panel_id])
                 if secondary_panel:
-                    self.ids[button_id].add_widget(eval(secondary_panel + 'Button')())
+                    self.ids[button_id].add_widget(panel_registry.button_class(secondary_panel)())
                     self.button_list.append([button_id, panel_id, primary_panel, secondary_panel, 'primary'])
                     button_count += 1
                 panel_count += 1
@@ -552,6 +667,9 @@ class CurrentConditions(Screen):
     # --------------------------------------------------------------------------
     def switchPanel(self, button_pressed, button_overide=None, *args):
 
+        # Record start time of panel switch
+        start = time.perf_counter()
+
         # Determine ID of button that has been pressed and extract corresponding
         # entry in buttonList
         if button_pressed:
@@ -569,9 +687,7 @@ class CurrentConditions(Screen):
         if 'Lightning' in button_data and hasattr(self.app.Sched, 'lightning_panel_timeout'):
             self.app.Sched.lightning_panel_timeout.cancel()
 
-        # Extract panel object that corresponds to the button that has been
-        # pressed and determine new button type required
-        panel_object = self.ids[button_data[1]].children
+        # Determine new panel and button type required
         panel_number = 'Panel' + button_data[1].split('_')[1].title()
         panel_type   = button_data[4].title() + 'Panels'
         new_button   = self.app.config[panel_type][panel_number]
@@ -580,30 +696,40 @@ class CurrentConditions(Screen):
         elif panel_type == 'SecondaryPanels':
             new_panel = self.app.config['PrimaryPanels'][panel_number]
 
-        # Destroy reference to old panel class attribute
-        if hasattr(self.app, new_button + 'Panel'):
-            try:
-                getattr(self.app, new_button + 'Panel').remove(panel_object[0])
-            except ValueError:
-                Logger.warning('Unable to remove panel reference from wfpiconsole class')
-
         if button_overide:
             mode = 'auto'
         else:
             mode = 'manual'
 
-        # Switch panel
-        self.ids[button_data[1]].clear_widgets()
-        self.ids[button_data[1]].add_widget(eval(new_panel + 'Panel')(mode))
+        # Switch panel, detaching outgoing panel from the display and
+        # reattaching cached panel instance if available
+        self.panel_cache.detach_slot(self.ids[button_data[1]])
+        self.ids[button_data[1]].add_widget(self.panel_cache.get(new_panel, button_data[1], mode))
         self.ids[button_data[0]].clear_widgets()
-        self.ids[button_data[0]].add_widget(eval(new_button + 'Button')())
+        self.ids[button_data[0]].add_widget(panel_registry.button_class(new_button)())
 
         # Update button list
         if button_data[4] == 'primary':
-            self.button_list[ii][4] = 'secondary' 
+            self.button_list[ii][4] = 'secondary'
         elif button_data[4] == 'secondary':
             self.button_list[ii][4] = 'primary'
 
+        # Record panel switch latency
+        self.panel_cache.record_switch(start)
+
+    # BENCHMARK PANEL SWITCH LATENCY
+    # --------------------------------------------------------------------------
+    def benchmark_switch(self, cycles, *args):
+        self.panel_cache.stats.update({'switches': 0, 'switch_total': 0.0, 'switch_max': 0.0})
+        for cycle in range(int(cycles) * 2):
+            for button in list(self.button_list):
+                self.switchPanel([], button)
+        try:
+            self.app.Sched.lightning_timeout.cancel()
+        except AttributeError:
+            pass
+        Logger.info(f'Benchmark: panel switch latency - {self.panel_cache.switch_summary()}')
+
 # ==============================================================================
 # RUN APP
 # ==============================================================================
@@ -34,6 +34,10 @@ class SunriseSunsetPanel(panelTemplate):
     # Initialise SunriseSunsetPanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
+        self.refresh()
+
+    # Refresh SunriseSunsetPanel state
+    def refresh(self):
         self.setUVBackground()
 
     # Set current UV index backgroud
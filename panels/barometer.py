@@ -36,6 +36,10 @@ class BarometerPanel(panelTemplate):
     # Initialise BarometerPanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
+        self.refresh()
+
+    # Refresh BarometerPanel state
+    def refresh(self):
         self.setBarometerArrow()
         self.set_barometer_max_min()
 
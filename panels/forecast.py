@@ -34,6 +34,10 @@ class ForecastPanel(panelTemplate):
     # Initialise ForecastPanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
+        self.refresh()
+
+    # Refresh ForecastPanel state
+    def refresh(self):
         self.setForecastIcon()
 
     # Set Forecast icon
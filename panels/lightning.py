@@ -40,10 +40,20 @@ class LightningPanel(panelTemplate):
     # Initialise LightningPanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
-        self.setLightningBoltIcon()
+        self.refresh()
+        if mode == 'auto':
+            self.auto_close_lightning_panel()
+
+    # Reattach cached LightningPanel to display
+    def reattach(self, mode=None):
+        super().reattach(mode)
         if mode == 'auto':
             self.auto_close_lightning_panel()
 
+    # Refresh LightningPanel state
+    def refresh(self):
+        self.setLightningBoltIcon()
+
     # Set lightning bolt icon
     def setLightningBoltIcon(self):
         if self.app.CurrentConditions.Obs['StrikeDeltaT'][0] != '-':
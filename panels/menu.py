@@ -16,6 +16,7 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Load required library modules
+from lib.config_snapshot      import config_snapshot
 from lib                      import config
 
 # Load required Kivy modules
@@ -62,12 +63,15 @@ class mainMenu(ModalView):
         # Get list of stations associated with WeatherFlow Key
         self.get_station_list()
 
-        # Populate status fields
+        # Populate status fields. Observation counts are kept locally and only
+        # reconciled against the WeatherFlow API when the console starts
         if int(self.app.config['System']['rest_api']):
             self.app.station.get_observation_count()
             self.app.station.get_device_firmware()
 
-        # Add station status panels to main menu
+        # Add station status panels to main menu, building them if required
+        if not hasattr(self.app.station, 'station_status_panel'):
+            self.app.station.set_status_panels()
         self.ids.station_panel.add_widget(self.app.station.station_status_panel)
 
         # Add device status panels to main menu
@@ -446,6 +450,7 @@ class mainMenu(ModalView):
         self.dismiss(animation=False)
         current_station  = self.app.config['Station']['StationID']
         config.switch(self.station_meta_data, self.device_list, self.app.config)
+        self.app.config_snapshot = config_snapshot(self.app.config)
         self.app.obsParser.reset_display()
         if hasattr(self.app.connection_client, '_switch_device'):
             self.app.connection_client._switch_device = True
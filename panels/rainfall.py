@@ -39,6 +39,10 @@ class RainfallPanel(panelTemplate):
     # Initialise RainfallPanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
+        self.refresh()
+
+    # Refresh RainfallPanel state
+    def refresh(self):
         self.animate_rain_rate()
 
     # Animate RainRate level
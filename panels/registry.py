@@ -0,0 +1,272 @@
+""" Defines the panel registry and panel instance cache for the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load required Kivy modules
+from kivy.lang               import Builder
+from kivy.app                import App
+
+# Load required panel modules
+from panels.template         import panelTemplate
+
+# Load required Python modules
+from collections             import OrderedDict
+import importlib
+import time
+
+# Define panel and button class registries
+panel_classes  = {}
+button_classes = {}
+
+# Define modules and kv files holding the built-in panel types. Modules are
+# only imported, and kv files only loaded, when a panel type is first used
+builtin_panels = {'Temperature':   ('panels.temperature', 'kvlang/temperature.kv'),
+                  'Barometer':     ('panels.barometer',   'kvlang/barometer.kv'),
+                  'Lightning':     ('panels.lightning',   'kvlang/lightning.kv'),
+                  'WindSpeed':     ('panels.wind',        'kvlang/wind.kv'),
+                  'Forecast':      ('panels.forecast',    'kvlang/forecast.kv'),
+                  'Sager':         ('panels.forecast',    'kvlang/forecast.kv'),
+                  'Rainfall':      ('panels.rainfall',    'kvlang/rainfall.kv'),
+                  'SunriseSunset': ('panels.astro',       'kvlang/astro.kv'),
+                  'MoonPhase':     ('panels.astro',       'kvlang/astro.kv')}
+loaded_kv = set()
+
+
+def register(name, panel_class, button_class):
+
+    """ Register the panel and button classes for a named panel type
+
+    INPUTS:
+        name                Panel type name used in wfpiconsole.ini
+        panel_class         Panel class
+        button_class        Button class
+    """
+
+    panel_classes[name]  = panel_class
+    button_classes[name] = button_class
+
+
+def register_namespace(namespace):
+
+    """ Register every panel type defined in a namespace. A panel type is
+    registered when the namespace holds both a [name]Panel class derived from
+    panelTemplate and a matching [name]Button class. This picks up any custom
+    user panels
+
+    INPUTS:
+        namespace           Dictionary of names and objects, e.g. globals()
+    """
+
+    for key, value in list(namespace.items()):
+        if key.endswith('Panel') and isinstance(value, type) and issubclass(value, panelTemplate):
+            name = key[:-len('Panel')]
+            if name + 'Button' in namespace:
+                register(name, value, namespace[name + 'Button'])
+
+
+def load(name):
+
+    """ Import the module and load the kv file holding a built-in panel type if
+    it has not already been loaded
+
+    INPUTS:
+        name                Panel type name
+    """
+
+    if name in panel_classes or name not in builtin_panels:
+        return
+    module_name, kv_file = builtin_panels[name]
+    module = importlib.import_module(module_name)
+    if kv_file not in loaded_kv:
+        Builder.load_file(kv_file)
+        loaded_kv.add(kv_file)
+    for panel_name, (panel_module, _) in builtin_panels.items():
+        if panel_module == module_name:
+            register(panel_name, getattr(module, panel_name + 'Panel'), getattr(module, panel_name + 'Button'))
+
+
+def preload():
+
+    """ Load the next built-in panel type that has not yet been used
+
+    OUTPUT:
+        pending             False once all built-in panel types are loaded
+    """
+
+    for name in builtin_panels:
+        if name not in panel_classes:
+            load(name)
+            return True
+    return False
+
+
+def panel_class(name):
+
+    """ Return the panel class registered for a named panel type
+    """
+
+    load(name)
+    return panel_classes[name]
+
+
+def button_class(name):
+
+    """ Return the button class registered for a named panel type
+    """
+
+    load(name)
+    return button_classes[name]
+
+
+# ==============================================================================
+# panel_cache CLASS
+# ==============================================================================
+class panel_cache():
+
+    """ Bounded least-recently-used cache of built panel instances. Each
+    display slot keeps its own instances so that a cached panel is never
+    attached to two slots at once. Panels that are detached from the display
+    are removed from the wfpiconsole class panel lists so that they stop
+    receiving updates while off screen, and are added back when reattached.
+    Panels evicted from the cache can then be garbage collected
+    """
+
+    def __init__(self, size=12):
+        self.app     = App.get_running_app()
+        self.size    = size
+        self.panels  = OrderedDict()
+        self.stats   = {'hits': 0, 'misses': 0, 'evictions': 0,
+                        'switches': 0, 'switch_total': 0.0, 'switch_max': 0.0, 'switch_last': 0.0}
+
+    def get(self, name, slot, mode=None):
+
+        """ Return a panel instance for the specified panel type and display
+        slot, building a new instance only if none is cached
+
+        INPUTS:
+            name                Panel type name
+            slot                Display slot ID the panel will be attached to
+            mode                Panel mode ('auto' or 'manual')
+
+        OUTPUT:
+            panel               Panel instance detached from any parent
+        """
+
+        key = (name, slot)
+        panel = self.panels.get(key)
+        if panel is not None:
+            self.panels.move_to_end(key)
+            self.detach(panel)
+            panel.reattach(mode)
+            self.stats['hits'] += 1
+        else:
+            panel = panel_class(name)(mode)
+            self.panels[key] = panel
+            self.stats['misses'] += 1
+            self.evict()
+        return panel
+
+    def detach(self, panel):
+
+        """ Detach panel from the display and remove it from the wfpiconsole
+        class panel list
+
+        INPUTS:
+            panel               Panel instance
+        """
+
+        if panel.parent is not None:
+            panel.parent.remove_widget(panel)
+        self.release(panel)
+
+    def detach_slot(self, slot):
+
+        """ Detach all panels displayed in the specified display slot
+
+        INPUTS:
+            slot                Display slot widget
+        """
+
+        for panel in list(slot.children):
+            self.detach(panel)
+
+    def detach_all(self):
+
+        """ Detach all cached panels from the display
+        """
+
+        for panel in self.panels.values():
+            self.detach(panel)
+
+    def evict(self):
+
+        """ Evict least-recently-used panels that are not currently displayed
+        until the cache is within its size limit
+        """
+
+        for key in list(self.panels):
+            if len(self.panels) <= self.size:
+                break
+            panel = self.panels[key]
+            if panel.parent is not None:
+                continue
+            del self.panels[key]
+            self.release(panel)
+            self.stats['evictions'] += 1
+
+    def release(self, panel):
+
+        """ Remove reference to panel from wfpiconsole class panel list
+        """
+
+        panel_list = getattr(self.app, panel.__class__.__name__, [])
+        if panel in panel_list:
+            panel_list.remove(panel)
+
+    def clear(self):
+
+        """ Remove all cached panels that are not currently displayed
+        """
+
+        for key in list(self.panels):
+            if self.panels[key].parent is None:
+                self.release(self.panels.pop(key))
+
+    def record_switch(self, start):
+
+        """ Record the latency of a panel switch
+
+        INPUTS:
+            start               time.perf_counter() value when switch started
+        """
+
+        latency = time.perf_counter() - start
+        self.stats['switches']     += 1
+        self.stats['switch_total'] += latency
+        self.stats['switch_last']   = latency
+        self.stats['switch_max']    = max(self.stats['switch_max'], latency)
+
+    def switch_summary(self):
+
+        """ Return a summary of panel switch latency and cache performance
+        """
+
+        switches = self.stats['switches']
+        mean = self.stats['switch_total'] / switches if switches else 0
+        return (f'{switches} switches, mean {mean * 1000:.1f} ms, '
+                f'max {self.stats["switch_max"] * 1000:.1f} ms, '
+                f'{self.stats["hits"]} hits, {self.stats["misses"]} misses, '
+                f'{self.stats["evictions"]} evictions')
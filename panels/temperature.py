@@ -35,6 +35,10 @@ class TemperaturePanel(panelTemplate):
     # Initialise TemperaturePanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
+        self.refresh()
+
+    # Refresh TemperaturePanel state
+    def refresh(self):
         self.set_feels_like_icon()
         self.set_indoor_temp_display()
 
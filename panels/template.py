@@ -35,3 +35,18 @@ class panelTemplate(RelativeLayout):
             panelList = getattr(self.app, self.__class__.__name__, 'panelList')
         panelList.append(self)
         setattr(self.app, self.__class__.__name__, panelList)
+
+    # Reattach cached panel to display with new mode
+    def reattach(self, mode=None):
+        self.mode = mode
+        panelList = getattr(self.app, self.__class__.__name__, [])
+        if self not in panelList:
+            panelList.append(self)
+        setattr(self.app, self.__class__.__name__, panelList)
+        self.refresh()
+
+    # Refresh panel state that is not updated while the panel is cached off
+    # screen. Overridden by panels that set state from the current conditions
+    # or configuration
+    def refresh(self):
+        pass
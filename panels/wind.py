@@ -33,13 +33,19 @@ class WindSpeedPanel(panelTemplate):
     rapidWindDir = NumericProperty(0)
     windDirIcon  = StringProperty('-')
     windSpdIcon  = StringProperty('-')
+    rolling_wind = StringProperty('-')
 
     # Initialise WindSpeedPanel
     def __init__(self, mode=None, **kwargs):
         super().__init__(mode, **kwargs)
+        self.refresh()
+
+    # Refresh WindSpeedPanel state
+    def refresh(self):
         if self.app.CurrentConditions.Obs['rapidDir'][0] != '-':
             self.rapidWindDir = self.app.CurrentConditions.Obs['rapidDir'][0]
         self.setWindIcons()
+        self.set_rolling_wind_display()
 
     # Animate rapid wind rose
     def animateWindRose(self):
@@ -75,6 +81,10 @@ class WindSpeedPanel(panelTemplate):
         self.windDirIcon = self.app.CurrentConditions.Obs['WindDir'][2]
         self.windSpdIcon = self.app.CurrentConditions.Obs['WindSpd'][3]
 
+    # Set whether to display rolling mean wind speed
+    def set_rolling_wind_display(self):
+        self.rolling_wind = self.app.config['Display'].get('RollingWind', '1')
+
 
 class WindSpeedButton(RelativeLayout):
     pass
@@ -136,54 +136,59 @@ class udp_client():
             Logger.info(f'Websocket: {self.system.log_time()} - Unable to close socket')
 
     async def __async__decode_message(self):
+        config = self.app.config_snapshot
         try:
             if self.message:
                 if 'type' in self.message:
-                    if self.message['type'] in ['hub_status', 'device_status', 'evt_precip']:
+                    if self.message['type'] in ['evt_precip']:
                         pass
+                    elif self.message['type'] == 'device_status':
+                        self.app.station.health.parse_device_status(self.message, config)
+                    elif self.message['type'] == 'hub_status':
+                        self.app.station.health.parse_hub_status(self.message, config)
                     else:
                         if 'serial_number' in self.message:
                             if self.message['type'] == 'obs_st':
-                                if self.message['serial_number'] == self.config['Station']['TempestSN']:
+                                if self.message['serial_number'] == config['Station']['TempestSN']:
                                     if 'obs_st' in self.thread_list:
                                         while self.thread_list['obs_st'].is_alive():
                                             await asyncio.sleep(0.1)
                                     self.thread_list['obs_st'] = threading.Thread(target=self.app.obsParser.parse_obs_st,
-                                                                                  args=(self.message, self.config, ),
+                                                                                  args=(self.message, config, ),
                                                                                   name="obs_st")
                                     self.thread_list['obs_st'].start()
                             elif self.message['type'] == 'obs_sky':
-                                if self.message['serial_number'] == self.config['Station']['SkySN']:
+                                if self.message['serial_number'] == config['Station']['SkySN']:
                                     if 'obs_sky' in self.thread_list:
                                         while self.thread_list['obs_sky'].is_alive():
                                             await asyncio.sleep(0.1)
                                     self.thread_list['obs_sky'] = threading.Thread(target=self.app.obsParser.parse_obs_sky,
-                                                                                   args=(self.message, self.config, ),
+                                                                                   args=(self.message, config, ),
                                                                                    name='obs_sky')
                                     self.thread_list['obs_sky'].start()
                             elif self.message['type'] == 'obs_air':
-                                if self.message['serial_number'] == self.config['Station']['OutAirSN']:
+                                if self.message['serial_number'] == config['Station']['OutAirSN']:
                                     if 'obs_out_air' in self.thread_list:
                                         while self.thread_list['obs_out_air'].is_alive():
                                             await asyncio.sleep(0.1)
                                     self.thread_list['obs_out_air'] = threading.Thread(target=self.app.obsParser.parse_obs_out_air,
-                                                                                       args=(self.message, self.config, ),
+                                                                                       args=(self.message, config, ),
                                                                                        name='obs_out_air')
                                     self.thread_list['obs_out_air'].start()
-                                elif self.message['serial_number'] == self.config['Station']['InAirSN']:
+                                elif self.message['serial_number'] == config['Station']['InAirSN']:
                                     if 'obs_in_air' in self.thread_list:
                                         while self.thread_list['obs_in_air'].is_alive():
                                             await asyncio.sleep(0.1)
                                     self.thread_list['obs_in_air'] = threading.Thread(target=self.app.obsParser.parse_obs_in_air,
-                                                                                      args=(self.message, self.config, ),
+                                                                                      args=(self.message, config, ),
                                                                                       name='obs_in_air')
                                     self.thread_list['obs_in_air'].start()
                             elif self.message['type'] == 'rapid_wind':
-                                if self.message['serial_number'] in [self.config['Station']['TempestSN'], self.config['Station']['SkySN']]:
-                                    self.app.obsParser.parse_rapid_wind(self.message, self.config)
+                                if self.message['serial_number'] in [config['Station']['TempestSN'], config['Station']['SkySN']]:
+                                    self.app.obsParser.parse_rapid_wind(self.message, config)
                             elif self.message['type'] == 'evt_strike':
-                                if self.message['serial_number'] in [self.config['Station']['TempestSN'], self.config['Station']['OutAirSN']]:
-                                    self.app.obsParser.parse_evt_strike(self.message, self.config)
+                                if self.message['serial_number'] in [config['Station']['TempestSN'], config['Station']['OutAirSN']]:
+                                    self.app.obsParser.parse_evt_strike(self.message, config)
                             else:
                                 Logger.warning(f'Websocket: {self.system.log_time()} - Unknown message type: {json.dumps(self.message)}')
                         else:
@@ -197,6 +197,7 @@ class websocketClient():
             await self.__async__connect()
 
     async def __async__decodeMessage(self):
+        config = self.app.config_snapshot
         try:
             if self.message:
                 if 'type' in self.message:
@@ -210,7 +211,7 @@ class websocketClient():
                                         await asyncio.sleep(0.1)
                                 self.watchdog_list['obs_st'] = time.time()
                                 self.thread_list['obs_st'] = threading.Thread(target=self.app.obsParser.parse_obs_st,
-                                                                              args=(self.message, self.config, ),
+                                                                              args=(self.message, config, ),
                                                                               name="obs_st")
                                 self.thread_list['obs_st'].start()
                             elif self.message['type'] == 'obs_sky':
@@ -219,33 +220,33 @@ class websocketClient():
                                         await asyncio.sleep(0.1)
                                 self.watchdog_list['obs_sky'] = time.time()
                                 self.thread_list['obs_sky'] = threading.Thread(target=self.app.obsParser.parse_obs_sky,
-                                                                               args=(self.message, self.config, ),
+                                                                               args=(self.message, config, ),
                                                                                name='obs_sky')
                                 self.thread_list['obs_sky'].start()
                             elif self.message['type'] == 'obs_air':
-                                if str(self.message['device_id']) == self.config['Station']['OutAirID']:
+                                if str(self.message['device_id']) == config['Station']['OutAirID']:
                                     if 'obs_out_air' in self.thread_list:
                                         while self.thread_list['obs_out_air'].is_alive():
                                             await asyncio.sleep(0.1)
                                     self.watchdog_list['obs_out_air'] = time.time()
                                     self.thread_list['obs_out_air'] = threading.Thread(target=self.app.obsParser.parse_obs_out_air,
-                                                                                       args=(self.message, self.config, ),
+                                                                                       args=(self.message, config, ),
                                                                                        name='obs_out_air')
                                     self.thread_list['obs_out_air'].start()
-                                elif str(self.message['device_id']) == self.config['Station']['InAirID']:
+                                elif str(self.message['device_id']) == config['Station']['InAirID']:
                                     if 'obs_in_air' in self.thread_list:
                                         while self.thread_list['obs_in_air'].is_alive():
                                             await asyncio.sleep(0.1)
                                     self.watchdog_list['obs_in_air'] = time.time()
                                     self.thread_list['obs_in_air'] = threading.Thread(target=self.app.obsParser.parse_obs_in_air,
-                                                                                      args=(self.message, self.config, ),
+                                                                                      args=(self.message, config, ),
                                                                                       name='obs_in_air')
                                     self.thread_list['obs_in_air'].start()
                             elif self.message['type'] == 'rapid_wind':
                                 self.watchdog_list['rapid_wind'] = time.time()
-                                self.app.obsParser.parse_rapid_wind(self.message, self.config)
+                                self.app.obsParser.parse_rapid_wind(self.message, config)
                             elif self.message['type'] == 'evt_strike':
-                                self.app.obsParser.parse_evt_strike(self.message, self.config)
+                                self.app.obsParser.parse_evt_strike(self.message, config)
                             else:
                                 Logger.warning(f'Websocket: {self.system.log_time()} - Unknown message type: {json.dumps(self.message)}')
                         else:
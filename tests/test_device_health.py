@@ -0,0 +1,36 @@
+""" Tests the device health time-series used by the Raspberry Pi Python console
+for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+from lib.device_health import device_health, HEALTH_INTERVAL
+
+
+def hub_status(timestamp, uptime):
+    return {'type': 'hub_status', 'serial_number': 'HB-00000001', 'timestamp': timestamp,
+            'uptime': uptime, 'rssi': -60}
+
+
+def test_hub_status_downsampled_to_health_interval():
+    health = device_health()
+    health.hub_sn = 'HB-00000001'
+
+    # hub_status messages arrive every 10 seconds, but are stored once per
+    # HEALTH_INTERVAL so that the buffer covers the full retention period
+    for ii in range(0, 600, 10):
+        health.parse_hub_status(hub_status(1700000000 + ii, 1000 + ii), None)
+    assert len(health.buffers['hub']) == 600 // HEALTH_INTERVAL
+    assert health.buffers['hub'].newest()['time'] == 1700000000 + 600 - HEALTH_INTERVAL
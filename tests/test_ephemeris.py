@@ -0,0 +1,75 @@
+""" Tests the shared ephemeris cache used by the Raspberry Pi Python console for
+WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+import pytest
+
+pytest.importorskip('kivy')
+
+from lib      import ephemeris
+from kivy.app import App
+import ephem
+
+# Define station inside the Arctic Circle
+CONFIG = {'Station': {'Latitude': '78.2', 'Longitude': '15.6', 'Timezone': 'Arctic/Longyearbyen'}}
+
+
+class console():
+    config = CONFIG
+
+
+class worker():
+
+    def __init__(self, *args, **kwargs):
+        self.started = False
+
+    def start(self):
+        self.started = True
+
+    def is_alive(self):
+        return self.started
+
+
+@pytest.fixture
+def table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(App, 'get_running_app', staticmethod(console))
+    monkeypatch.setattr(ephemeris, 'table', {'data': None, 'worker': None, 'failed': None})
+    return ephemeris.table
+
+
+def test_failed_table_build_is_cached(table, monkeypatch):
+
+    def never_up(config, date):
+        raise ephem.NeverUpError('Sun never rises')
+
+    monkeypatch.setattr(ephemeris, 'calculate_sun_events', never_up)
+    ephemeris.build_table(dict(CONFIG['Station']))
+    assert table['data'] is None
+    assert table['failed']['location'] == ['78.2', '15.6', 'Arctic/Longyearbyen']
+
+    # No new worker is started while the failure is cached, and callers fall
+    # back to calculating events directly
+    monkeypatch.setattr(ephemeris.threading, 'Thread', worker)
+    assert ephemeris.get_table(CONFIG) is None
+    assert table['worker'] is None
+
+    # A new worker is started when the station location changes
+    moved = {'Station': dict(CONFIG['Station'], Latitude='51.5')}
+    assert ephemeris.get_table(moved) is None
+    assert table['worker'].started
+    assert table['failed'] is None
@@ -0,0 +1,172 @@
+""" Tests the derived variables dependency graph used by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+import configparser
+import pytest
+import pytz
+import time
+
+pytest.importorskip('kivy')
+
+from lib.config_snapshot import config_snapshot
+from lib                 import derived_variables as derive
+from kivy.app            import App
+
+# Define console configuration with REST API services disabled
+CONFIG = {'Keys':      {'WeatherFlow': '', 'CheckWX': ''},
+          'Station':   {'StationID': '1', 'TempestID': '100', 'TempestSN': 'ST-00000100', 'SkyID': '', 'SkySN': '',
+                        'OutAirID': '', 'OutAirSN': '', 'InAirID': '', 'InAirSN': '', 'TempestHeight': '2',
+                        'SkyHeight': '', 'OutAirHeight': '', 'Elevation': '30', 'Latitude': '51.5',
+                        'Longitude': '-0.1', 'Timezone': 'Europe/London', 'Name': 'Test'},
+          'Units':     {'Temp': 'c', 'Pressure': 'mb', 'Wind': 'mps', 'Direction': 'degrees', 'Precip': 'mm',
+                        'Distance': 'km', 'Other': 'metric'},
+          'Display':   {'TimeFormat': '24 hr', 'DateFormat': 'Mon, 01 Jan 0000', 'LightningPanel': '0'},
+          'FeelsLike': {'ExtremelyCold': '-5', 'FreezingCold': '0', 'VeryCold': '5', 'Cold': '10', 'Mild': '15',
+                        'Warm': '20', 'Hot': '25', 'VeryHot': '30'},
+          'System':    {'Connection': 'Websocket', 'rest_api': '0', 'stats_endpoint': '0', 'Timeout': '20',
+                        'Hardware': 'Other'}}
+
+
+class update_bus():
+
+    def __init__(self):
+        self.pushes = []
+
+    def push(self, producer, target, changes, callback=None, changed_only=False):
+        self.pushes.append(changes)
+
+
+class console():
+
+    def __init__(self):
+        self.config = configparser.ConfigParser()
+        self.config.optionxform = str
+        self.config.read_dict(CONFIG)
+        self.config_snapshot = config_snapshot(self.config)
+        self.update_bus      = update_bus()
+
+
+def obs_st(ob_time, wind_spd=3.5, wind_dir=225):
+    return {'type': 'obs_st', 'device_id': 100,
+            'obs': [[ob_time, 1.2, wind_spd, 5.1, wind_dir, 3, 1010.0, 12.5, 75, 10000, 1.5, 120,
+                     0.0, 0, 0, 0, 2.6, 1, 0.0, None, None, 0]],
+            'summary': {}}
+
+
+@pytest.fixture
+def parser(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = console()
+    monkeypatch.setattr(App, 'get_running_app', staticmethod(lambda: app))
+    from lib.observation_parser import obs_parser
+    return obs_parser()
+
+
+def test_obs_st_message_runs_through_graph(parser):
+    config = parser.app.config_snapshot
+    parser.parse_obs_st(obs_st(1700000000), config)
+
+    # Derived wind variables are calculated from the raw device observations,
+    # not from derived variables that share the same name
+    wind_spd = [3.5, 'mps']
+    assert parser.derive_obs['windSpd']   == derive.beaufort_scale(wind_spd)
+    assert parser.derive_obs['windDir']   == derive.cardinal_wind_dir([225, 'degrees'], wind_spd)
+    assert parser.derive_obs['feelsLike'] == derive.feels_like([12.5, 'c'], [75, '%'], wind_spd, config)
+    assert parser.derive_obs['uvIndex']   == derive.uv_index([1.5, 'index'])
+    assert parser.derive_obs['SLP']       == derive.SLP([1010.0, 'mb'], 100, config)
+    assert parser.app.update_bus.pushes
+
+
+def test_unchanged_inputs_are_skipped(parser):
+    config = parser.app.config_snapshot
+    parser.parse_obs_st(obs_st(1700000000), config)
+    evaluated = parser.derived_graph.stats['evaluated']
+    parser.parse_obs_st(obs_st(1700000060), config)
+
+    # Only nodes that take the latest message as an input are re-evaluated
+    message_nodes = [output for output, node in parser.derived_graph.nodes.items()
+                     if 'message' in node['inputs'] and 'obs_st' in node['device_types']]
+    assert parser.derived_graph.stats['evaluated'] - evaluated == len(message_nodes)
+
+
+def test_api_input_keyed_on_last_observation(parser):
+
+    class response():
+        ok = True
+
+        def __init__(self, obs):
+            self.obs = obs
+
+        def json(self):
+            return {'status': {'status_message': 'SUCCESS'}, 'obs': self.obs}
+
+    # Separate responses holding the same observations share the same key
+    assert parser.api_key(response([[1700000000], [1700000060]])) == 1700000060
+    assert parser.api_key(response([[1700000000], [1700000060]])) == 1700000060
+    assert parser.api_key(response([])) is None
+
+
+def test_daily_wind_average_weighted_by_observation_time(parser):
+    config  = parser.app.config_snapshot
+    ob_time = int(time.time())
+    parser.parse_obs_st(obs_st(ob_time, wind_spd=2.0), config)
+    parser.parse_obs_st(obs_st(ob_time + 120, wind_spd=5.0), config)
+
+    # The average is weighted by the time between observations, not by the
+    # time the messages are processed
+    avg_wind = parser.derive_obs['windAvg']
+    assert avg_wind[2] == pytest.approx((60 * 2.0 + 120 * 5.0) / 180)
+    assert avg_wind[3:] == [180, ob_time + 120]
+
+
+def test_rapid_wind_rolling_means(parser):
+    config = parser.app.config_snapshot
+    for ii, wind_spd in enumerate([2.0, 4.0, 6.0]):
+        parser.parse_rapid_wind({'type': 'rapid_wind', 'device_id': 100, 'ob': [1700000000 + 3 * ii, wind_spd, 225]}, config)
+    assert parser.derive_obs['windAvg2m']  == [4.0, 'mps']
+    assert parser.derive_obs['windAvg10m'] == [4.0, 'mps']
+    assert parser.display_obs['AvgWind2m'][0] != '-'
+
+    # Rolling means are not calculated when disabled in the display settings
+    parser.app.config['Display']['RollingWind'] = '0'
+    config = config_snapshot(parser.app.config)
+    parser.parse_rapid_wind({'type': 'rapid_wind', 'device_id': 100, 'ob': [1700000009, 8.0, 225]}, config)
+    assert parser.derive_obs['windAvg2m'] == [None, 'mps']
+
+
+def test_saved_state_restored_only_without_missed_observations(parser):
+    from lib.observation_parser import obs_parser
+    parser.app.config['System']['rest_api'] = '1'
+    parser.app.config_snapshot = config_snapshot(parser.app.config)
+    parser.derive_obs['peakSun'] = [1.5, 'hrs', '-']
+
+    # State saved within one reporting interval of the last observation is
+    # restored
+    parser.device_obs['obTime'] = [int(time.time()) - 30, 's']
+    parser.save_state(parser.app.config_snapshot)
+    assert obs_parser().derive_obs['peakSun'] == [1.5, 'hrs', '-']
+
+    # Older state is discarded so that the gap is backfilled from the REST API
+    parser.device_obs['obTime'] = [int(time.time()) - 120, 's']
+    parser.save_state(parser.app.config_snapshot)
+    assert obs_parser().derive_obs['peakSun'][0] is None
+
+
+def test_unknown_timezone_falls_back_to_utc(parser):
+    parser.app.config['Station']['Timezone'] = 'Not/AZone'
+    assert config_snapshot(parser.app.config).timezone is pytz.utc
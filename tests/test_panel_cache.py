@@ -0,0 +1,116 @@
+""" Tests the panel cache used by the Raspberry Pi Python console for
+WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy.app import App
+
+
+class current_conditions():
+
+    def __init__(self):
+        self.Met = {'Icon': 'clear-day'}
+        self.Obs = {'FeelsLike': ['-', '-', '-', 'Mild']}
+
+
+class console():
+
+    def __init__(self):
+        self.config = {'Display': {'IndoorTemp': '0'}}
+        self.CurrentConditions = current_conditions()
+
+
+class slot():
+
+    def __init__(self):
+        self.children = []
+
+    def add_widget(self, panel):
+        panel.parent = self
+        self.children.append(panel)
+
+    def remove_widget(self, panel):
+        panel.parent = None
+        self.children.remove(panel)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    app = console()
+    monkeypatch.setattr(App, 'get_running_app', staticmethod(lambda: app))
+    from panels import registry
+
+    class TestPanel():
+
+        def __init__(self, mode=None):
+            self.parent = None
+            self.app = app
+            self.mode = mode
+            app.TestPanel = getattr(app, 'TestPanel', []) + [self]
+
+        reattach = registry.panelTemplate.reattach
+        refresh  = registry.panelTemplate.refresh
+
+    from panels.forecast    import ForecastPanel
+    from panels.temperature import TemperaturePanel
+    panels = {'Test': TestPanel, 'Forecast': ForecastPanel, 'Temperature': TemperaturePanel}
+    monkeypatch.setattr(registry, 'panel_class', lambda name: panels[name])
+    return registry.panel_cache(size=4)
+
+
+def test_detached_panel_is_removed_from_panel_list(cache):
+    panel_slot = slot()
+    panel = cache.get('Test', 'panel_one')
+    panel_slot.add_widget(panel)
+    assert cache.app.TestPanel == [panel]
+
+    # Detached panels stop receiving updates while off screen
+    cache.detach_slot(panel_slot)
+    assert panel.parent is None
+    assert cache.app.TestPanel == []
+
+    # Reattached panels receive updates again
+    assert cache.get('Test', 'panel_one', 'auto') is panel
+    assert cache.app.TestPanel == [panel]
+    assert panel.mode == 'auto'
+
+
+def test_reattached_panel_is_refreshed(cache):
+    panel_slot = slot()
+    forecast    = cache.get('Forecast',    'panel_one')
+    temperature = cache.get('Temperature', 'panel_two')
+    assert forecast.forecastIcon == 'clear-day'
+    assert temperature.feelsLikeIcon == 'Mild'
+
+    # Conditions and configuration change while the panels are cached off
+    # screen
+    panel_slot.add_widget(forecast)
+    cache.detach_slot(panel_slot)
+    cache.detach(temperature)
+    cache.app.CurrentConditions.Met['Icon'] = 'rain'
+    cache.app.CurrentConditions.Obs['FeelsLike'][3] = 'Cold'
+    cache.app.config['Display']['IndoorTemp'] = '1'
+
+    # Reattached panels show the current state
+    assert cache.get('Forecast', 'panel_one') is forecast
+    assert forecast.forecastIcon == 'rain'
+    assert cache.get('Temperature', 'panel_two') is temperature
+    assert temperature.feelsLikeIcon == 'Cold'
+    assert temperature.indoor_temperature == '1'
@@ -0,0 +1,60 @@
+""" Tests the fixed-size ring buffers used by the Raspberry Pi Python console
+for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+from lib.ring_buffer import rolling_mean
+import pytest
+
+
+def window_mean(samples, sample_time, window):
+
+    """ Calculate the time-weighted mean of the samples inside the window from
+    scratch
+    """
+
+    inside = [(value, weight) for ob_time, value, weight in samples if ob_time > sample_time - window]
+    return sum(value * weight for value, weight in inside) / sum(weight for value, weight in inside)
+
+
+def test_rolling_mean_window_update():
+    mean    = rolling_mean(120, 3)
+    size    = mean.samples.size
+    samples = []
+
+    # Feed 3 second rapid_wind samples, including a gap in the data, and check
+    # the running sums against a mean recalculated over the window
+    times = list(range(0, 300, 3)) + list(range(330, 600, 3))
+    for ii, sample_time in enumerate(times):
+        value  = ii % 7
+        weight = 3 if not samples else min(sample_time - samples[-1][0], 9)
+        samples.append((sample_time, value, weight))
+        mean.append(sample_time, value)
+        assert mean.mean() == pytest.approx(window_mean(samples, sample_time, 120))
+
+        # Samples outside the window are dropped and the buffer never grows
+        assert mean.samples.oldest()[0] > sample_time - 120
+        assert len(mean.samples) <= 40
+        assert mean.samples.size == size
+
+
+def test_rolling_mean_clear():
+    mean = rolling_mean(120, 3)
+    mean.append(0, 5.0)
+    mean.clear()
+    assert mean.mean() is None
+    mean.append(3, 2.0)
+    assert mean.mean() == 2.0
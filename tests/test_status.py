@@ -0,0 +1,52 @@
+""" Tests the station status observation counts used by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required modules
+from lib.ring_buffer import rolling_count
+from lib             import status
+from types           import SimpleNamespace
+import time
+
+
+def station():
+    config = {'Station': {'TempestID': '12345', 'SkyID': '', 'OutAirID': '', 'InAirID': ''},
+              'System':  {'Timezone': 'UTC'}}
+    station = status.station.__new__(status.station)
+    station.app = SimpleNamespace(config=config)
+    station.status_data = {}
+    station.ob_counts = {device: rolling_count(86400, status.OB_INTERVAL) for device in status.DEVICES}
+    station.reconciled = set()
+    station.count_start = time.time() - 600
+    station.update_display = lambda: None
+    return station
+
+
+def test_unreconciled_count_is_partial(monkeypatch):
+    monkeypatch.setattr(status, 'system', lambda: SimpleNamespace(log_time=lambda: ''))
+    console = station()
+    now = time.time()
+    console.ob_counts['tempest'].merge([now - 120, now - 60])
+
+    # Failed reconciliation keeps the local count, marked as partial
+    url = 'https://swd.weatherflow.com/swd/rest/observations/device/12345?time_start=0'
+    console.fail_observation_count(SimpleNamespace(url=url), None)
+    assert console.status_data['tempest_ob_count'] == '2 (since start)'
+
+    # Once reconciled the count covers the full 24 hours
+    console.reconciled.add('tempest')
+    console.set_ob_count('tempest')
+    assert 'since start' not in console.status_data['tempest_ob_count']